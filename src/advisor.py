@@ -0,0 +1,114 @@
+from typing import Iterable, Sequence
+
+from card import Card
+from dealer import SLOT_VALUES, composition
+from ev import EVCalculator, HIT, STAND
+from strategy import StrategyTable
+
+
+class Advice:
+    """Represents the advice for a hand: the chance to bust on a hit and the best decision."""
+
+    def __init__(
+        self,
+        bust_probability: float,
+        action: int | None = None,
+        stand_ev: float | None = None,
+        hit_ev: float | None = None,
+        exact: bool = False,
+    ) -> None:
+        """
+        Initializes the advice.
+
+        :param bust_probability: Probability that the next card busts the hand
+        :param action: Recommended decision (STAND or HIT), None if unknown
+        :param stand_ev: Expected value of standing per unit bet, None if unknown
+        :param hit_ev: Expected value of hitting per unit bet, None if unknown
+        :param exact: Whether the decision was computed for the exact cards left, rather than
+            looked up in a strategy table built for a full shoe
+        """
+        self.bust_probability = bust_probability
+        self.action = action
+        self.stand_ev = stand_ev
+        self.hit_ev = hit_ev
+        self.exact = exact
+
+    def __str__(self) -> str:
+        """Returns a one line summary of the advice."""
+        text = f"Bust if you hit: {self.bust_probability:.0%}"
+        if self.action is not None:
+            text += f", {'hit' if self.action == HIT else 'stand'} recommended"
+            if not self.exact:
+                text += " (table)"
+        return text
+
+
+def unseen_composition(
+    shoe_cards: Iterable[Card], hidden: Iterable[Card]
+) -> tuple[int, ...]:
+    """
+    Returns the composition of the cards a player can't see: those left in the shoe and the
+    hidden cards already dealt (the bank's hole card).
+    """
+    return composition([*shoe_cards, *hidden])
+
+
+def bust_probability(value: int, soft: bool, counts: Sequence[int]) -> float:
+    """Returns the probability that the next card drawn from counts busts a hand of value."""
+    total = sum(counts)
+    if soft or not total:
+        return 0.0
+    busting = sum(
+        count
+        for count, card_value in zip(counts, SLOT_VALUES)
+        if value + card_value > 21
+    )
+    return busting / total
+
+
+class Advisor:
+    """
+    Advises players on their hand. The exact advice accounts for the cards left, but can take
+    a second for a new composition, while the quick advice only computes the bust probability
+    and looks the decision up in a strategy table, if one is given.
+    An Advisor is not thread safe: its EVCalculator must only be used by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        table: StrategyTable | None = None,
+        calculator: EVCalculator | None = None,
+    ) -> None:
+        """Initializes the advisor, with its own calculator unless one is given."""
+        self.table = table
+        self.calculator = calculator if calculator is not None else EVCalculator()
+
+    def quick(
+        self, value: int, soft: bool, upcard: Card, counts: Sequence[int]
+    ) -> Advice:
+        """Returns the advice computed in constant time, see Advisor."""
+        advice = Advice(bust_probability(value, soft, counts))
+        if self.table is not None and value <= 21:
+            advice.action = self.table.action(value, soft, upcard)
+            advice.stand_ev, advice.hit_ev = self.table.evs(value, soft, upcard)
+        return advice
+
+    def exact(
+        self, value: int, soft: bool, upcard: Card, counts: Sequence[int]
+    ) -> Advice:
+        """
+        Returns the advice for the exact cards left.
+
+        :param value: Value of the player's hand, as given by Hand.calculate_value
+        :param soft: Whether an ace is counted as 11 in that value
+        :param upcard: The bank's face-up card
+        :param counts: Composition of the unseen cards, see unseen_composition
+        """
+        stand, hit = self.calculator.evaluate(value, soft, upcard, counts)
+        return Advice(
+            bust_probability(value, soft, counts),
+            HIT if hit > stand else STAND,
+            stand,
+            hit,
+            exact=True,
+        )
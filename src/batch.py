@@ -0,0 +1,242 @@
+import time
+from typing import Callable
+
+import numpy as np
+
+import ledger
+from game import LOSS, PUSH, WIN
+from player import Player
+from simulation import SimulationResult
+
+# A batch policy receives the hand values, soft flags and bank up card values (ace as 11)
+# of many hands at once and returns a boolean array telling which hands hit.
+# Rule-based and compiled policies (see the policy module) are also accepted.
+BatchPolicy = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+# Card values by rank (2-10, J, Q, K, A), the ace counting as 1 until soft totals are applied.
+RANK_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1], dtype=np.int8)
+
+# Ledger transaction kind of every outcome, as recorded by the Player settlement methods.
+LEDGER_KINDS = {WIN: ledger.WIN, LOSS: ledger.LOSS, PUSH: ledger.PUSH}
+
+# Tables played together by simulate_batch.
+BATCH_TABLES = 10_000
+
+
+def dealer_policy(
+    values: np.ndarray, soft: np.ndarray, upcards: np.ndarray
+) -> np.ndarray:
+    """Hits below 17, exactly like the bank does."""
+    return values < 17
+
+
+def stand_policy(
+    values: np.ndarray, soft: np.ndarray, upcards: np.ndarray
+) -> np.ndarray:
+    """Never hits."""
+    return np.zeros(values.shape, dtype=bool)
+
+
+def hand_values(hard: np.ndarray, aces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the values and soft flags of hands given their hard totals (aces as 1) and
+    whether they hold an ace, with the same ace adjustment as Hand.calculate_value.
+    """
+    soft = aces & (hard <= 11)
+    return np.where(soft, hard + 10, hard), soft
+
+
+def settle(
+    values: np.ndarray,
+    busted: np.ndarray,
+    bank_value: np.ndarray,
+    bank_busted: np.ndarray,
+) -> np.ndarray:
+    """
+    Settles hands against the bank with the rules of BlackJackGame.determine_winner and
+    returns the outcome (WIN, LOSS or PUSH) of every hand.
+    Bank arrays are broadcast against the hand arrays, e.g. shape (tables, 1) for (tables, seats).
+    """
+    outcomes = np.where(
+        values > bank_value, WIN, np.where(values < bank_value, LOSS, PUSH)
+    )
+    outcomes = np.where(bank_busted, WIN, outcomes)
+    return np.where(busted, LOSS, outcomes).astype(np.int8)
+
+
+def settle_seats(
+    players: list[Player],
+    values: np.ndarray,
+    busted: np.ndarray,
+    bets: np.ndarray,
+    bank_value: int,
+    bank_busted: bool,
+) -> np.ndarray:
+    """
+    Settles seats held in arrays against one bank hand in a single vectorized pass, then
+    writes the money won or lost back to their players in bulk and resets their bets, as
+    BlackJackGame.determine_winner does one player at a time, but without going through the
+    Player bet methods. The settlements of players with a ledger are recorded in one batch
+    per ledger, then each ledger is committed once.
+    Returns the outcome of every seat. Raises ValueError unless there is one player per seat.
+
+    :param players: Player of every seat, in the order of the arrays
+    :param values: Hand value of every seat
+    :param busted: Whether the hand of every seat is busted
+    :param bets: Bet of every seat
+    """
+    if not len(players) == len(values) == len(busted) == len(bets):
+        raise ValueError("Every seat needs a player, a value, a bust flag and a bet")
+    outcomes = settle(values, busted, bank_value, bank_busted)
+    amounts = (outcomes * bets).tolist()
+    books: dict[ledger.Ledger, list[tuple[str, str, int, int]]] = {}
+    for player, amount, outcome in zip(players, amounts, outcomes.tolist()):
+        player.money += amount
+        player.bet = 0
+        if player.ledger is not None:
+            books.setdefault(player.ledger, []).append(
+                (player.name, LEDGER_KINDS[outcome], amount, player.money)
+            )
+    for book, transactions in books.items():
+        book.record_many(transactions)
+        book.commit()
+    return outcomes
+
+
+class BatchEngine:
+    """
+    Plays one round at many independent tables at once, with every shoe and hand held in
+    integer NumPy arrays.
+
+    Each round is dealt from freshly shuffled shoes, in the same order as
+    BlackJackGame.start_round: two cards to every seat, then two cards to the bank.
+    """
+
+    def __init__(
+        self,
+        tables: int,
+        seats: int = 1,
+        decks: int = 1,
+        policy: BatchPolicy = dealer_policy,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initializes the engine.
+
+        :param tables: Number of tables played together
+        :param seats: Number of players at every table
+        :param decks: Number of 52 card decks in every shoe
+        :param policy: Decides which player hands hit, see BatchPolicy
+        :param seed: Seed of the shoe shuffles
+        """
+        self.tables = tables
+        self.seats = seats
+        if hasattr(policy, "compile"):
+            policy = policy.compile()
+        self.policy = getattr(policy, "batch", policy)
+        self.rng = np.random.default_rng(seed)
+        self.template = np.broadcast_to(
+            np.tile(RANK_VALUES, 4 * decks), (tables, 52 * decks)
+        )
+        self.rows = np.arange(tables)
+
+    def _draw(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Draws the next card of the shoes of the given tables.
+        A shoe that runs out wraps around, which only happens with many seats on a single deck.
+        """
+        cards = self.shoes[rows, self.positions[rows] % self.shoes.shape[1]]
+        self.positions[rows] += 1
+        return cards
+
+    def deal(self) -> None:
+        """Shuffles every shoe and deals the initial two cards to every seat and the bank."""
+        self.shoes = self.rng.permuted(self.template, axis=1)
+        seats = self.seats
+        first, second = (
+            self.shoes[:, 0 : 2 * seats : 2],
+            self.shoes[:, 1 : 2 * seats : 2],
+        )
+        self.hard = (first + second).astype(np.int16)
+        self.aces = (first == 1) | (second == 1)
+        bank = self.shoes[:, 2 * seats : 2 * seats + 2]
+        self.bank_hard = bank.sum(axis=1, dtype=np.int16)
+        self.bank_aces = (bank == 1).any(axis=1)
+        self.positions = np.full(self.tables, 2 * seats + 2)
+
+    def play_players(self) -> None:
+        """Plays every seat in turn, each hit being one vectorized step over all tables."""
+        upcards = self.shoes[:, 2 * self.seats].astype(np.int16)
+        upcards = np.where(upcards == 1, 11, upcards)
+        for seat in range(self.seats):
+            rows = self.rows
+            while rows.size:
+                values, soft = hand_values(self.hard[rows, seat], self.aces[rows, seat])
+                rows = rows[(values <= 21) & self.policy(values, soft, upcards[rows])]
+                cards = self._draw(rows)
+                self.hard[rows, seat] += cards
+                self.aces[rows, seat] |= cards == 1
+
+    def play_bank(self) -> None:
+        """Draws to 17 for the bank of every table where at least one player is not busted."""
+        values, _ = hand_values(self.hard, self.aces)
+        rows = self.rows[(values <= 21).any(axis=1)]
+        while rows.size:
+            bank_values, _ = hand_values(self.bank_hard[rows], self.bank_aces[rows])
+            rows = rows[bank_values < 17]
+            cards = self._draw(rows)
+            self.bank_hard[rows] += cards
+            self.bank_aces[rows] |= cards == 1
+
+    def settle(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the outcome of every hand and the bust flags of the players and banks."""
+        values, _ = hand_values(self.hard, self.aces)
+        bank_values, _ = hand_values(self.bank_hard, self.bank_aces)
+        busted = values > 21
+        bank_busted = bank_values > 21
+        outcomes = settle(values, busted, bank_values[:, None], bank_busted[:, None])
+        return outcomes, busted, bank_busted
+
+    def play_round(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Plays a full round at every table and returns the result of settle."""
+        self.deal()
+        self.play_players()
+        self.play_bank()
+        return self.settle()
+
+
+def simulate_batch(
+    rounds: int,
+    players: int = 1,
+    policy: BatchPolicy = dealer_policy,
+    bet: int = 1,
+    seed: int | None = None,
+    decks: int = 1,
+    tables: int = BATCH_TABLES,
+) -> SimulationResult:
+    """
+    Plays the given number of rounds with a BatchEngine and returns the aggregated result,
+    comparable to the one of simulation.simulate.
+    """
+    result = SimulationResult(players)
+    engine = BatchEngine(min(tables, rounds), players, decks, policy, seed)
+    start = time.perf_counter()
+    remaining = rounds
+    while remaining > 0:
+        outcomes, busted, bank_busted = engine.play_round()
+        if remaining < engine.tables:
+            outcomes, busted = outcomes[:remaining], busted[:remaining]
+            bank_busted = bank_busted[:remaining]
+        result.wins += int(np.count_nonzero(outcomes == WIN))
+        result.losses += int(np.count_nonzero(outcomes == LOSS))
+        result.pushes += int(np.count_nonzero(outcomes == PUSH))
+        result.busts += int(np.count_nonzero(busted))
+        result.bank_busts += int(np.count_nonzero(bank_busted))
+        result.net += int(outcomes.sum(dtype=np.int64)) * bet
+        remaining -= engine.tables
+    result.elapsed = time.perf_counter() - start
+
+    result.rounds = rounds
+    result.hands = rounds * players
+    result.wagered = result.hands * bet
+    return result
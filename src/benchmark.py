@@ -0,0 +1,342 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+
+from card import CARDS, Deck, Shoe
+from game import BlackJackGame
+from hand import Hand
+from player import Player
+
+# Version of the results file format.
+FORMAT_VERSION = 1
+
+# Default allowed slowdown before a benchmark is reported as a regression.
+THRESHOLD = 0.15
+
+# Qt application of the UI benchmarks, which must outlive their widgets.
+_application = None
+
+
+class Benchmark:
+    """Represents a named workload, timed as a number of operations per second."""
+
+    def __init__(
+        self, name: str, setup: Callable[[], Callable[[], None]], ops: int, unit: str
+    ) -> None:
+        """
+        Initializes the benchmark.
+
+        :param name: Unique name, used as key in the results
+        :param setup: Builds the seeded state and returns the function to time
+        :param ops: Number of operations performed by one call of that function
+        :param unit: What an operation is (calls, rounds...)
+        """
+        self.name = name
+        self.setup = setup
+        self.ops = ops
+        self.unit = unit
+
+    def run(self, repeats: int) -> dict:
+        """
+        Times the workload repeats times and returns its best and median throughput.
+        The best run is the one compared against baselines, being the least sensitive to noise.
+        """
+        workload = self.setup()
+        workload()  # warm up
+        rates = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            workload()
+            rates.append(self.ops / (time.perf_counter() - start))
+        return {
+            "unit": self.unit,
+            "ops_per_second": max(rates),
+            "median_ops_per_second": statistics.median(rates),
+        }
+
+
+def _deck_construction(count: int) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        rng = random.Random(1)
+
+        def workload() -> None:
+            for _ in range(count):
+                Deck(rng)
+
+        return workload
+
+    return setup
+
+
+def _deck_shuffle(decks: int, count: int) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        shoe = Shoe(decks, rng=random.Random(1))
+
+        def workload() -> None:
+            for _ in range(count):
+                shoe.shuffle()
+
+        return workload
+
+    return setup
+
+
+def _hand_value(size: int, count: int) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        hand = Hand()
+        for card in random.Random(size).sample(CARDS, size):
+            hand.add_card(card)
+
+        def workload() -> None:
+            for _ in range(count):
+                hand.calculate_value()
+
+        return workload
+
+    return setup
+
+
+def _game_rounds(seats: int, rounds: int) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        players = [Player(f"Player {i + 1}", 10**9) for i in range(seats)]
+        game = BlackJackGame(
+            players, random.Random(seats), decks=max(1, seats * 6 // 7)
+        )
+
+        def workload() -> None:
+            for _ in range(rounds):
+                for player in players:
+                    player.place_bet(10)
+                game.start_round()
+                for index, player in enumerate(players):
+                    while player.hand.calculate_value() < 17:
+                        game.hit(index)
+                game.bank_turn()
+                game.determine_winner()
+
+        return workload
+
+    return setup
+
+
+def _settlement(
+    seats: int, count: int, vectorized: bool
+) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        players = [Player(f"Player {i + 1}", 10**9) for i in range(seats)]
+        game = BlackJackGame(players, random.Random(seats), decks=seats // 4)
+        for player in players:
+            player.place_bet(10)
+        game.start_round()
+        game.bank_turn()
+        if not vectorized:
+
+            def workload() -> None:
+                for _ in range(count):
+                    for player in players:
+                        player.bet = 10
+                    game.determine_winner()
+
+            return workload
+
+        # Imported here so that the other benchmarks run without NumPy installed.
+        import numpy as np
+        from batch import settle_seats
+
+        values = np.array([player.hand.calculate_value() for player in players])
+        busted = values > 21
+        bets = np.full(seats, 10)
+        bank_value = game.bank.hand.calculate_value()
+
+        def workload() -> None:
+            for _ in range(count):
+                settle_seats(players, values, busted, bets, bank_value, bank_value > 21)
+
+        return workload
+
+    return setup
+
+
+def _simulated_rounds(rounds: int, compiled: bool) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        from states import HIT
+        from policy import BasicStrategy
+        from simulation import simulate
+
+        rules = BasicStrategy()
+        if compiled:
+            policy = rules.compile()
+        else:
+
+            def policy(hand: Hand, upcard) -> bool:
+                return (
+                    rules.decide(
+                        hand.calculate_value(), hand.is_soft(), upcard.hard_value
+                    )
+                    == HIT
+                )
+
+        def workload() -> None:
+            simulate(rounds, policy=policy, seed=rounds)
+
+        return workload
+
+    return setup
+
+
+def _window(seats: int) -> tuple:
+    global _application
+    # Imported here so that the other benchmarks run without Qt installed.
+    import os
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from ui import BlackJackUI
+
+    _application = QApplication.instance() or QApplication([])
+    players = [Player(f"Player {i + 1}", 1000) for i in range(seats)]
+    game = BlackJackGame(players, random.Random(seats), decks=6)
+    game.start_round()
+    window = BlackJackUI()
+    window.players = players
+    window.game = game
+    window.current_player_index = 0
+    window.update_info()
+    return game, window
+
+
+def _update_info(seats: int, count: int) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        _, window = _window(seats)
+
+        def workload() -> None:
+            for _ in range(count):
+                window.update_info()
+
+        return workload
+
+    return setup
+
+
+def _turn_change(seats: int, count: int) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        _, window = _window(seats)
+
+        def workload() -> None:
+            for index in range(count):
+                window.current_player_index = index % seats
+                window.update_info()
+
+        return workload
+
+    return setup
+
+
+# Every workload is sized to run for a few tens of milliseconds, except the turn changes.
+# With PySide6 6.12.0 on CPython 3.11, every call to a Qt setter returning void (e.g.
+# QLabel.setText) releases one reference to None too many: sys.getrefcount(None) drops by
+# 1000 over 1000 setText calls, and the interpreter then aborts in none_dealloc at exit.
+# A turn change re-renders two seats, so that benchmark stays at a few dozen turns. The
+# update_info calls render nothing once the table is up to date, and call no setter.
+BENCHMARKS = [
+    Benchmark("deck_construction", _deck_construction(5000), 5000, "decks"),
+    Benchmark("deck_shuffle", _deck_shuffle(1, 2000), 2000, "shuffles"),
+    Benchmark("shoe_shuffle_6_decks", _deck_shuffle(6, 500), 500, "shuffles"),
+    Benchmark("hand_value_2_cards", _hand_value(2, 500_000), 500_000, "calls"),
+    Benchmark("hand_value_5_cards", _hand_value(5, 500_000), 500_000, "calls"),
+    Benchmark("hand_value_10_cards", _hand_value(10, 500_000), 500_000, "calls"),
+    Benchmark("game_round_1_seat", _game_rounds(1, 10_000), 10_000, "rounds"),
+    Benchmark("game_round_7_seats", _game_rounds(7, 2000), 2000, "rounds"),
+    Benchmark("game_round_100_seats", _game_rounds(100, 100), 100, "rounds"),
+    Benchmark("settle_5000_seats", _settlement(5000, 20, False), 100_000, "seats"),
+    Benchmark("batch_settle_5000_seats", _settlement(5000, 20, True), 100_000, "seats"),
+    Benchmark("simulate_basic_rules", _simulated_rounds(5000, False), 5000, "rounds"),
+    Benchmark("simulate_basic_compiled", _simulated_rounds(5000, True), 5000, "rounds"),
+    Benchmark("ui_update_info_7_seats", _update_info(7, 5000), 5000, "calls"),
+    Benchmark("ui_turn_change_100_seats", _turn_change(100, 30), 30, "turns"),
+]
+
+
+def run_benchmarks(names: str | None = None, repeats: int = 5) -> dict:
+    """
+    Runs the benchmarks whose name contains names (all of them by default) and returns the
+    results document. Benchmarks needing a missing module (e.g. PySide6) are skipped.
+    """
+    results = {}
+    for benchmark in BENCHMARKS:
+        if names and names not in benchmark.name:
+            continue
+        try:
+            results[benchmark.name] = benchmark.run(repeats)
+        except ImportError as error:
+            print(f"Skipping {benchmark.name}: {error}", file=sys.stderr)
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list[dict]:
+    """
+    Compares two results documents and returns one row per benchmark found in both, with the
+    throughput ratio and whether it is a regression (slower than baseline by more than threshold).
+    """
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["ops_per_second"] / baseline["results"][name]["ops_per_second"]
+        rows.append(
+            {
+                "name": name,
+                "baseline": baseline["results"][name]["ops_per_second"],
+                "current": result["ops_per_second"],
+                "ratio": ratio,
+                "regression": ratio < 1 - threshold,
+            }
+        )
+    return rows
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """Runs the benchmarks from the command line, returns 1 if a regression is found."""
+    parser = argparse.ArgumentParser(description="Benchmarks the Black Jack game.")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="timed runs per benchmark"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=THRESHOLD, help="allowed slowdown ratio"
+    )
+    options = parser.parse_args(arguments)
+
+    current = run_benchmarks(options.filter, options.repeats)
+    for name, result in current["results"].items():
+        print(f"{name:<28} {result['ops_per_second']:>14,.0f} {result['unit']}/s")
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if not options.compare:
+        return 0
+    with open(options.compare) as file:
+        baseline = json.load(file)
+    rows = compare(current, baseline, options.threshold)
+    print()
+    for row in rows:
+        status = "REGRESSION" if row["regression"] else "ok"
+        print(f"{row['name']:<28} {row['ratio']:>7.2f}x  {status}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Returned by LRUCache.get for missing keys, so that None can be cached.
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Represents a bounded cache that evicts the least recently used entry once full,
+    keeping hit, miss and eviction counts.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        """Initializes an empty cache holding at most maxsize entries."""
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the value cached for key, or MISSING, and marks it as recently used."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Caches value for key, evicting the least recently used entry if the cache is full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every entry and resets the statistics."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Returns the size and the hit, miss and eviction counts of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        """Returns the number of cached entries."""
+        return len(self._entries)
@@ -1,21 +1,72 @@
 import random
 from typing import List
 
+SUITS = ("Hearts", "Diamonds", "Clubs", "Spades")
+RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+
+# Value of each rank, in the order of RANKS. The ace is initially considered as 11.
+RANK_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+
 
 class Card:
     """
     Represents a single playing card.
+    There is exactly one immutable instance per suit and rank, built once when the module is
+    loaded, so cards compare and hash by identity and never need to re-derive their value.
     """
 
-    def __init__(self, suit: str, rank: str) -> None:
+    __slots__ = (
+        "suit",
+        "rank",
+        "index",
+        "rank_index",
+        "hard_value",
+        "_value",
+        "_label",
+    )
+    _instances: dict = {}
+
+    def __new__(cls, suit: str, rank: str) -> "Card":
         """
-        Initializes the card with a suit and a rank.
+        Returns the card with a suit and a rank.
 
         :param suit: Type of the card (Hearts, Diamonds, Clubs, Spades)
         :param rank: Which card name is (2-10, J, Q, K or A)
         """
-        self.suit = suit
-        self.rank = rank
+        try:
+            return cls._instances[(suit, rank)]
+        except KeyError:
+            raise ValueError(f"Invalid card: {rank} of {suit}") from None
+
+    @classmethod
+    def _create(cls, suit_index: int, rank_index: int) -> "Card":
+        """Builds the unique instance of a card, only used while loading the module."""
+        card = object.__new__(cls)
+        fields = {
+            "suit": SUITS[suit_index],
+            "rank": RANKS[rank_index],
+            "index": suit_index * len(RANKS) + rank_index,
+            "rank_index": rank_index,
+            "hard_value": 1 if RANKS[rank_index] == "A" else RANK_VALUES[rank_index],
+            "_value": RANK_VALUES[rank_index],
+            "_label": f"{RANKS[rank_index]} of {SUITS[suit_index]}",
+        }
+        for name, field in fields.items():
+            object.__setattr__(card, name, field)
+        cls._instances[(card.suit, card.rank)] = card
+        return card
+
+    def __setattr__(self, name: str, value) -> None:
+        """Cards are immutable."""
+        raise AttributeError("Card objects are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Cards are immutable."""
+        raise AttributeError("Card objects are immutable")
+
+    def __reduce__(self) -> tuple:
+        """Unpickles to the unique instance of the card."""
+        return Card, (self.suit, self.rank)
 
     def value(self) -> int:
         """
@@ -23,18 +74,21 @@ class Card:
         Number cards have their face value, face cards have a value of 10,
         and the ace can have a value of 11.
         """
-        if self.rank in ["J", "Q", "K"]:
-            return 10
-        elif self.rank == "A":
-            return 11  # Initially consider Ace as 11
-        else:
-            return int(self.rank)
+        return self._value
 
     def __str__(self) -> str:
         """
         Returns a string representation of the card.
         """
-        return f"{self.rank} of {self.suit}"
+        return self._label
+
+
+# The 52 cards, in the order of a new deck. Card.index is the position in this tuple.
+CARDS = tuple(
+    Card._create(suit_index, rank_index)
+    for suit_index in range(len(SUITS))
+    for rank_index in range(len(RANKS))
+)
 
 
 class Deck:
@@ -42,26 +96,152 @@ class Deck:
     Represents a deck of 52 playing cards.
     """
 
-    suits = ["Hearts", "Diamonds", "Clubs", "Spades"]
-    ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+    suits = list(SUITS)
+    ranks = list(RANKS)
 
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
         """
         Initializes the deck with 52 shuffled cards.
+
+        :param rng: Random generator used to shuffle, defaults to the global one of the random module
         """
-        self.cards: List[Card] = [
-            Card(suit, rank) for suit in self.suits for rank in self.ranks
-        ]
+        self.rng = rng
+        self.cards: List[Card] = list(CARDS)
         self.shuffle()
 
     def shuffle(self) -> None:
         """
         Shuffles the deck.
         """
-        random.shuffle(self.cards)
+        if self.rng is None:
+            random.shuffle(self.cards)
+        else:
+            self.rng.shuffle(self.cards)
 
     def deal(self) -> Card:
         """
         Deals a card from the deck.
         """
         return self.cards.pop()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cards left in the deck.
+        """
+        return len(self.cards)
+
+
+class Shoe:
+    """
+    Represents a shoe of one or more decks with a cut card.
+    The cards live in a list allocated once, dealing moves an index over it and shuffling
+    reorders it in place, so the shoe is never rebuilt however long it is played.
+    Once a round has begun (see begin_round), running out only shuffles back the cards of the
+    previous rounds, so that a card still in play is never dealt twice.
+    """
+
+    def __init__(
+        self,
+        decks: int = 1,
+        penetration: float = 0.75,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initializes the shoe with shuffled cards.
+
+        :param decks: Number of 52 card decks in the shoe
+        :param penetration: Share of the shoe dealt before the cut card is reached
+        :param rng: Random generator used to shuffle, defaults to the global one of the random module
+        """
+        if decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be between 0 and 1")
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng
+        self._cards: List[Card] = list(CARDS) * decks
+        self._position = 0
+        # Position of the first card of the round being dealt, None outside of rounds.
+        self._round: int | None = None
+        self.cut = int(len(self._cards) * penetration)
+        self.shuffle()
+
+    @property
+    def cards(self) -> List[Card]:
+        """
+        Returns a copy of the cards left in the shoe, the next card to be dealt first.
+        """
+        return self._cards[self._position :]
+
+    @property
+    def needs_shuffle(self) -> bool:
+        """
+        Returns True once the cut card has been reached.
+        """
+        return self._position >= self.cut
+
+    def shuffle(self) -> None:
+        """
+        Puts every card back in the shoe and shuffles it in place.
+        """
+        if self.rng is None:
+            random.shuffle(self._cards)
+        else:
+            self.rng.shuffle(self._cards)
+        self._position = 0
+        self._round = None
+
+    def begin_round(self) -> None:
+        """Marks the cards dealt from now on as in play, until the next round begins."""
+        self._round = self._position
+
+    def deal(self) -> Card:
+        """
+        Deals a card from the shoe.
+        If the shoe runs out, it is reshuffled first, see refill.
+        """
+        if self._position >= len(self._cards):
+            self.refill()
+        card = self._cards[self._position]
+        self._position += 1
+        return card
+
+    def refill(self) -> None:
+        """
+        Reshuffles an empty shoe. During a round, the cards in play are kept out: the shoe is
+        reordered with them first, already dealt, and the discards shuffled after them.
+        Raises ValueError if every card of the shoe is in play.
+        """
+        if self._round is None:
+            self.shuffle()
+            return
+        in_play = self._cards[self._round :]
+        discards = self._cards[: self._round]
+        if not discards:
+            raise ValueError("The shoe ran out of cards during a round")
+        if self.rng is None:
+            random.shuffle(discards)
+        else:
+            self.rng.shuffle(discards)
+        self._cards[:] = in_play + discards
+        self._position = len(in_play)
+        self._round = 0
+
+    def skip(self, count: int) -> None:
+        """
+        Moves past count cards as if they were dealt, refilling like deal when the shoe runs out.
+        """
+        remaining = len(self._cards) - self._position
+        while count > remaining:
+            count -= remaining
+            self._position = len(self._cards)
+            self.refill()
+            remaining = len(self._cards) - self._position
+        self._position += count
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cards left in the shoe.
+        """
+        return len(self._cards) - self._position
@@ -0,0 +1,294 @@
+import argparse
+import sys
+
+# Every command imports what it needs when it runs, so that starting the CLI only costs the
+# interpreter and argparse, and Qt is never imported.
+
+# Seat policies of the simulate and compare commands.
+POLICIES = ["dealer", "stand", "basic", "mimic", "never-bust"]
+
+
+def _policy(name: str):
+    """Returns the simulation policy of the given name, see POLICIES."""
+    import policy as policies
+    import simulation
+
+    if name in policies.POLICIES:
+        return policies.compiled(name)
+    return {"dealer": simulation.dealer_policy, "stand": simulation.stand_policy}[name]
+
+
+def _play(arguments: argparse.Namespace) -> int:
+    """Plays rounds in the terminal until a bet is left empty or nobody has money left."""
+    import random
+
+    from game import BlackJackGame, LOSS, WIN
+    from player import Player
+
+    players = []
+    for entry in arguments.players:
+        name, _, money = entry.rpartition(":")
+        if not name or not money.isdigit() or int(money) <= 0:
+            raise ValueError(f"Invalid player {entry!r}, expected NAME:MONEY")
+        players.append(Player(name, int(money)))
+    rng = random.Random(arguments.seed) if arguments.seed is not None else None
+    game = BlackJackGame(players, rng, arguments.decks)
+
+    while any(player.money > 0 for player in players):
+        game.players = [player for player in players if player.money > 0]
+        for player in game.players:
+            amount = input(f"{player.name} (${player.money}), bet: ").strip()
+            if not amount:
+                return 0
+            while not amount.isdigit() or not 0 < int(amount) <= player.money:
+                amount = input(f"Invalid bet, {player.name}'s bet: ").strip()
+            player.place_bet(int(amount))
+
+        game.start_round()
+        print(f"Bank: {game.bank.hand.cards[0]}, [Hidden]")
+        for index, player in enumerate(game.players):
+            print(f"{player.name}: {player.hand}")
+            while not player.hand.is_busted():
+                if input(f"{player.name}, hit or stand? [h/s] ").strip() != "h":
+                    game.stand(index)
+                    break
+                print(f"{player.name} draws {game.hit(index)}: {player.hand}")
+        if not all(player.hand.is_busted() for player in game.players):
+            game.bank_turn()
+        print(f"Bank: {game.bank.hand}")
+
+        for player, outcome in zip(game.players, game.determine_winner()):
+            result = {WIN: "wins", LOSS: "loses"}.get(outcome, "pushes")
+            print(f"{player.name} {result}, ${player.money} left.")
+    return 0
+
+
+def _simulate(arguments: argparse.Namespace) -> int:
+    """Simulates rounds headlessly and prints the result."""
+    import simulation
+
+    policy = _policy(arguments.policy)
+    stats = None
+    if arguments.stats or arguments.snapshot_every:
+        import json
+
+        from stats import Statistics
+
+        stats = Statistics(
+            arguments.players,
+            arguments.snapshot_every,
+            lambda snapshot: print(json.dumps(snapshot), file=sys.stderr),
+        )
+    if arguments.workers > 1:
+        result = simulation.simulate_parallel(
+            arguments.rounds,
+            arguments.players,
+            policy,
+            arguments.bet,
+            arguments.seed if arguments.seed is not None else 0,
+            arguments.decks,
+            arguments.workers,
+            stats=stats,
+        )
+    elif arguments.history:
+        from history import HistoryWriter
+
+        with HistoryWriter(arguments.history) as writer:
+            result = simulation.simulate(
+                arguments.rounds,
+                arguments.players,
+                policy,
+                arguments.bet,
+                arguments.seed,
+                arguments.decks,
+                writer,
+                stats,
+            )
+    else:
+        result = simulation.simulate(
+            arguments.rounds,
+            arguments.players,
+            policy,
+            arguments.bet,
+            arguments.seed,
+            arguments.decks,
+            stats=stats,
+        )
+    print(result)
+    if stats is not None:
+        print(stats)
+    return 0
+
+
+def _compare(arguments: argparse.Namespace) -> int:
+    """Compares the returns of two policies and prints their confidence intervals."""
+    from variance import compare
+
+    comparison = compare(
+        arguments.rounds,
+        _policy(arguments.first),
+        _policy(arguments.second),
+        arguments.players,
+        arguments.seed,
+        arguments.decks,
+        common=not arguments.independent,
+        antithetic=arguments.antithetic,
+        control=arguments.control,
+    )
+    print(f"{arguments.first} vs {arguments.second}, returns per unit bet:")
+    print(comparison)
+    return 0
+
+
+def _strategy(arguments: argparse.Namespace) -> int:
+    """Builds a strategy table."""
+    from strategy import build_table
+
+    table = build_table(arguments.decks, arguments.path)
+    print(f"Strategy table for {table.decks} decks written to {arguments.path}")
+    table.close()
+    return 0
+
+
+def _replay(arguments: argparse.Namespace) -> int:
+    """Replays a logged session, checking it against the log, and prints the final money."""
+    from replay import Replay
+
+    replay = Replay(arguments.log, arguments.money, arguments.seed, arguments.decks)
+    first = arguments.start
+    last = replay.last_round if arguments.end is None else arguments.end
+    replay.seek(first)
+    for _ in range(first, last + 1):
+        replay.play_round()
+    money = ", ".join(
+        f"{player.name}: ${player.money}" for player in replay.game.players
+    )
+    print(f"Rounds {first} to {last} match the log. {money}")
+    return 0
+
+
+def _serve(arguments: argparse.Namespace) -> int:
+    """Serves tables until interrupted."""
+    import asyncio
+
+    options = {
+        name: value
+        for name, value in vars(arguments).items()
+        if name in ("host", "port", "decks", "seed", "turn_timeout")
+        and value is not None
+    }
+    if arguments.workers is None:
+        from server import Server
+
+        server = Server(**options)
+    else:
+        from scheduler import ShardedServer
+
+        server = ShardedServer(workers=arguments.workers, **options)
+    print(f"Serving Black Jack tables on {server.host}:{server.port}")
+    asyncio.run(server.serve_forever())
+    return 0
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """Runs a command of the Black Jack CLI and returns the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Plays, simulates and analyses Black Jack without the UI."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("play", help="play rounds in the terminal")
+    play.add_argument("players", nargs="+", help="players, as NAME:MONEY")
+    play.add_argument("--decks", type=int, default=6, help="number of decks")
+    play.add_argument("--seed", type=int, help="seed of the shoe shuffles")
+    play.set_defaults(run=_play)
+
+    simulate = commands.add_parser("simulate", help="simulate rounds headlessly")
+    simulate.add_argument("--rounds", type=int, default=100_000, help="rounds to play")
+    simulate.add_argument("--players", type=int, default=1, help="number of seats")
+    simulate.add_argument(
+        "--policy", choices=POLICIES, default="dealer", help="seats' policy"
+    )
+    simulate.add_argument("--bet", type=int, default=1, help="bet of every seat")
+    simulate.add_argument("--seed", type=int, help="seed of the shoe shuffles")
+    simulate.add_argument("--decks", type=int, default=6, help="number of decks")
+    simulate.add_argument(
+        "--workers", type=int, default=1, help="processes to spread the rounds over"
+    )
+    simulate.add_argument("--history", help="history log to write, with one worker")
+    simulate.add_argument(
+        "--stats", action="store_true", help="print per seat and per up card statistics"
+    )
+    simulate.add_argument(
+        "--snapshot-every",
+        type=int,
+        default=0,
+        help="rounds between statistics snapshots, written to stderr as JSON lines",
+    )
+    simulate.set_defaults(run=_simulate)
+
+    compare = commands.add_parser(
+        "compare", help="compare two policies with variance reduction"
+    )
+    compare.add_argument("first", choices=POLICIES, help="first policy")
+    compare.add_argument("second", choices=POLICIES, help="second policy")
+    compare.add_argument(
+        "--rounds", type=int, default=100_000, help="rounds per policy"
+    )
+    compare.add_argument("--players", type=int, default=1, help="number of seats")
+    compare.add_argument("--seed", type=int, help="seed of the shoe shuffles")
+    compare.add_argument("--decks", type=int, default=6, help="number of decks")
+    compare.add_argument(
+        "--independent",
+        action="store_true",
+        help="deal independent shoes to the policies instead of the same ones",
+    )
+    compare.add_argument(
+        "--antithetic", action="store_true", help="play rounds in antithetic pairs"
+    )
+    compare.add_argument(
+        "--control", action="store_true", help="adjust with the Hi-Lo control variate"
+    )
+    compare.set_defaults(run=_compare)
+
+    strategy = commands.add_parser("strategy", help="build a strategy table")
+    strategy.add_argument("path", help="file to write the table to")
+    strategy.add_argument("--decks", type=int, default=6, help="number of decks")
+    strategy.set_defaults(run=_strategy)
+
+    replay = commands.add_parser("replay", help="replay a history log")
+    replay.add_argument("log", help="history log of the session")
+    replay.add_argument(
+        "--money",
+        type=int,
+        nargs="+",
+        required=True,
+        help="starting money of each seat",
+    )
+    replay.add_argument("--seed", type=int, help="seed of the original shoe")
+    replay.add_argument(
+        "--decks", type=int, default=6, help="decks of the original shoe"
+    )
+    replay.add_argument("--start", type=int, default=1, help="first round to replay")
+    replay.add_argument("--end", type=int, help="last round to replay")
+    replay.set_defaults(run=_replay)
+
+    serve = commands.add_parser("serve", help="serve tables over TCP")
+    serve.add_argument("--host", help="address to listen on")
+    serve.add_argument("--port", type=int, help="port to listen on")
+    serve.add_argument("--decks", type=int, help="number of decks in each shoe")
+    serve.add_argument("--seed", type=int, help="seed of the tables' shoes")
+    serve.add_argument("--turn-timeout", type=float, help="seconds per turn")
+    serve.add_argument("--workers", type=int, help="run the tables in worker processes")
+    serve.set_defaults(run=_serve)
+
+    parsed = parser.parse_args(arguments)
+    try:
+        return parsed.run(parsed)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
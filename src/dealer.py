@@ -0,0 +1,114 @@
+from typing import Iterable, Sequence
+
+from cache import LRUCache, MISSING
+from card import Card
+from game import BANK_STANDS_ON
+
+# A composition counts the cards left in a shoe by hard value: aces, 2 to 9, then every
+# ten-valued card. SLOT_VALUES gives the hard value of each slot.
+SLOT_VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+# Final totals the bank can stand on, in the order of a distribution. A distribution has one
+# more entry after them, the probability that the bank busts.
+BANK_TOTALS = tuple(range(BANK_STANDS_ON, 22))
+BUST = len(BANK_TOTALS)
+
+# Compositions are packed one byte per slot in cache keys, which bounds the count of a slot.
+# Ten-valued cards reach it first, with 16 per deck: a shoe can hold at most 15 decks.
+MAX_COUNT = 255
+
+
+def composition(cards: Iterable[Card]) -> tuple[int, ...]:
+    """Returns the composition of the given cards."""
+    counts = [0] * len(SLOT_VALUES)
+    for card in cards:
+        counts[card.hard_value - 1] += 1
+    return tuple(counts)
+
+
+def full_composition(decks: int = 1) -> tuple[int, ...]:
+    """Returns the composition of a full shoe of the given number of decks."""
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+def remove_card(counts: Sequence[int], card: Card) -> tuple[int, ...]:
+    """Returns the composition left once card is taken out of counts."""
+    slot = card.hard_value - 1
+    if not counts[slot]:
+        raise ValueError(f"No {card.rank} left in the composition")
+    return tuple(count - (index == slot) for index, count in enumerate(counts))
+
+
+def pack(counts: Sequence[int]) -> bytes:
+    """
+    Returns a composition packed one byte per slot, as used in cache keys.
+    Raises ValueError if a slot holds more than MAX_COUNT cards.
+    """
+    if isinstance(counts, bytes):
+        return counts
+    if max(counts) > MAX_COUNT:
+        raise ValueError(
+            f"Compositions hold at most {MAX_COUNT} cards of a value (15 decks)"
+        )
+    return bytes(counts)
+
+
+class DealerOdds:
+    """
+    Computes the exact distribution of the bank's final total for an up card and the
+    composition of the cards left, the hole card included.
+
+    Sub-results of the recursion are memoized in a bounded LRU cache keyed by the bank's
+    hard total, its ace flag and the packed composition (one byte per slot), so queries
+    on the same shoe mostly reuse the states computed by earlier ones.
+    """
+
+    def __init__(self, cache_size: int = 200_000) -> None:
+        """Initializes the analyzer with an empty cache of at most cache_size states."""
+        self.cache = LRUCache(cache_size)
+
+    def distribution(self, upcard: Card, counts: Sequence[int]) -> tuple[float, ...]:
+        """
+        Returns the probabilities of the bank ending on each of BANK_TOTALS, followed by the
+        probability that it busts.
+
+        :param upcard: The bank's face-up card
+        :param counts: Composition of the cards left, the up card already removed, with at
+            most MAX_COUNT cards of a value
+        """
+        return self._distribution(
+            upcard.hard_value, upcard.hard_value == 1, pack(counts)
+        )
+
+    def bust_probability(self, upcard: Card, counts: Sequence[int]) -> float:
+        """Returns the probability that the bank busts, see distribution."""
+        return self.distribution(upcard, counts)[BUST]
+
+    def _distribution(self, hard: int, ace: bool, counts: bytes) -> tuple[float, ...]:
+        """Returns the distribution of a bank hand given its hard total and ace flag."""
+        value = hard + 10 if ace and hard <= 11 else hard
+        if value >= BANK_STANDS_ON:
+            result = [0.0] * (BUST + 1)
+            result[BUST if value > 21 else value - BANK_STANDS_ON] = 1.0
+            return tuple(result)
+
+        key = bytes((hard, ace)) + counts
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        total = sum(counts)
+        if not total:
+            raise ValueError("Not enough cards left to finish the bank's hand")
+        result = [0.0] * (BUST + 1)
+        for slot, count in enumerate(counts):
+            if not count:
+                continue
+            rest = counts[:slot] + bytes((count - 1,)) + counts[slot + 1 :]
+            sub = self._distribution(hard + SLOT_VALUES[slot], ace or slot == 0, rest)
+            weight = count / total
+            for index, probability in enumerate(sub):
+                result[index] += weight * probability
+        distribution = tuple(result)
+        self.cache.put(key, distribution)
+        return distribution
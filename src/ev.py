@@ -0,0 +1,97 @@
+from typing import Sequence
+
+from cache import LRUCache, MISSING
+from card import Card
+from dealer import BANK_TOTALS, BUST, SLOT_VALUES, DealerOdds, pack
+from hand import Hand
+from states import HIT, STAND
+
+
+class EVCalculator:
+    """
+    Computes the exact expected value of standing and of hitting for a player hand, the bank's
+    up card and the composition of the cards left, with the rules of BlackJackGame: a busted
+    player always loses, a busted bank pays every other player, and equal totals push.
+    The value of hitting assumes the best decision is taken after every card.
+
+    Results are memoized over (hand state, up card, composition) in a bounded LRU cache, and
+    the bank's distributions in the cache of a DealerOdds, which can be shared.
+    """
+
+    def __init__(
+        self, cache_size: int = 500_000, dealer: DealerOdds | None = None
+    ) -> None:
+        """Initializes the calculator with an empty cache of at most cache_size states."""
+        self.cache = LRUCache(cache_size)
+        self.dealer = dealer if dealer is not None else DealerOdds()
+
+    def evaluate(
+        self, value: int, soft: bool, upcard: Card, counts: Sequence[int]
+    ) -> tuple[float, float]:
+        """
+        Returns the expected values of standing and of hitting, per unit bet.
+
+        :param value: Value of the player's hand, as given by Hand.calculate_value
+        :param soft: Whether an ace is counted as 11 in that value
+        :param upcard: The bank's face-up card
+        :param counts: Composition of the cards left, without the player's cards and the up card,
+            with at most dealer.MAX_COUNT cards of a value
+        """
+        if value > 21:
+            return -1.0, -1.0
+        hard = value - 10 if soft else value
+        return self._evaluate(hard, soft, upcard, pack(counts))
+
+    def evaluate_hand(
+        self, hand: Hand, upcard: Card, counts: Sequence[int]
+    ) -> tuple[float, float]:
+        """Returns the expected values of standing and of hitting for a hand, see evaluate."""
+        return self.evaluate(hand.calculate_value(), hand.is_soft(), upcard, counts)
+
+    def best_action(
+        self, hand: Hand, upcard: Card, counts: Sequence[int]
+    ) -> tuple[int, float]:
+        """Returns the best decision (STAND or HIT) for a hand and its expected value."""
+        stand, hit = self.evaluate_hand(hand, upcard, counts)
+        return (HIT, hit) if hit > stand else (STAND, stand)
+
+    def _stand(self, value: int, upcard: Card, counts: bytes) -> float:
+        """Returns the expected value of standing on value."""
+        distribution = self.dealer.distribution(upcard, counts)
+        result = distribution[BUST]
+        for total, probability in zip(BANK_TOTALS, distribution):
+            if value > total:
+                result += probability
+            elif value < total:
+                result -= probability
+        return result
+
+    def _evaluate(
+        self, hard: int, ace: bool, upcard: Card, counts: bytes
+    ) -> tuple[float, float]:
+        """Returns the (stand, hit) expected values of a hand given its hard total and ace flag."""
+        key = bytes((hard, ace, upcard.hard_value)) + counts
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        value = hard + 10 if ace and hard <= 11 else hard
+        stand = self._stand(value, upcard, counts)
+        total = sum(counts)
+        hit = 0.0
+        for slot, count in enumerate(counts):
+            if not count:
+                continue
+            weight = count / total
+            next_hard = hard + SLOT_VALUES[slot]
+            if next_hard > 21:
+                hit -= weight
+                continue
+            rest = counts[:slot] + bytes((count - 1,)) + counts[slot + 1 :]
+            next_stand, next_hit = self._evaluate(
+                next_hard, ace or slot == 0, upcard, rest
+            )
+            hit += weight * max(next_stand, next_hit)
+        result = (stand, hit)
+        self.cache.put(key, result)
+        return result
@@ -1,45 +1,151 @@
+import random
+
 from player import Player, Bank
-from card import Deck
+from card import Card, Shoe
 from hand import Hand
+from history import (
+    BANK_DRAW,
+    BANK_SEAT,
+    BET,
+    DEAL,
+    HIT,
+    SETTLE,
+    SHUFFLE,
+    STAND,
+    HistoryWriter,
+)
+import ledger
+from instrumentation import Instrumentation, timed
+
+# Outcomes of a player's hand against the bank, as returned by determine_winner.
+LOSS = -1
+PUSH = 0
+WIN = 1
+
+# The bank draws until its hand is worth at least this much (a soft 17 stands).
+BANK_STANDS_ON = 17
 
 
 class BlackJackGame:
     """Represents the Black Jack game."""
 
-    def __init__(self, players: list[Player]) -> None:
-        """Initializes the game with a list of players and a shared deck."""
+    def __init__(
+        self,
+        players: list[Player],
+        rng: random.Random | None = None,
+        decks: int = 1,
+        penetration: float = 0.75,
+    ) -> None:
+        """
+        Initializes the game with a list of players and a shared shoe.
+        The shoe is shuffled with rng when given, which makes the game reproducible.
+        """
         self.players = players
         self.bank = Bank()
-        self.deck = Deck()
-        self.deck.shuffle()
+        self.deck = Shoe(decks, penetration, rng)
+        # Set to an Instrumentation to record phase timings and cards dealt.
+        self.instrumentation: Instrumentation | None = None
+        # Set to a HistoryWriter to log the deals, decisions and settlements of every round.
+        self.history: HistoryWriter | None = None
+        # Set to a Ledger to commit the transactions of the players once per round.
+        self.ledger: ledger.Ledger | None = None
+        # Number of the current round, counted from 1 by start_round.
+        self.round = 0
 
+    @timed("start_round")
     def start_round(self) -> None:
-        """Starts a new round, dealing initial cards to players and the bank."""
+        """
+        Starts a new round, dealing initial cards to players and the bank.
+        The shoe is reshuffled first once the cut card is reached or if it could not deal every hand.
+        The bets, all validated by then, are recorded in the ledger of their player.
+        """
+        self.round += 1
+        log = self.history
+        if self.deck.needs_shuffle or len(self.deck) < 2 * (len(self.players) + 1):
+            self.deck.shuffle()
+            if log is not None:
+                log.record(self.round, SHUFFLE, BANK_SEAT)
+        self.deck.begin_round()
         for player in self.players:
             player.hand = Hand()
             player.hand.add_card(self.deck.deal())
             player.hand.add_card(self.deck.deal())
+            if player.ledger is not None:
+                player.ledger.record(player.name, ledger.BET, player.bet, player.money)
 
         self.bank.hand = Hand()
         self.bank.hand.add_card(self.deck.deal())
         self.bank.hand.add_card(self.deck.deal())
+        if self.instrumentation is not None:
+            self.instrumentation.count_cards(2 * (len(self.players) + 1))
+        if log is not None:
+            for seat, player in enumerate(self.players):
+                log.record(self.round, BET, seat, amount=player.bet)
+                for card in player.hand.cards:
+                    log.record(self.round, DEAL, seat, card)
+            for card in self.bank.hand.cards:
+                log.record(self.round, DEAL, BANK_SEAT, card)
+
+    def hit(self, index: int) -> Card:
+        """Deals one card to the player at the given seat and returns it."""
+        card = self.deck.deal()
+        self.players[index].hand.add_card(card)
+        if self.instrumentation is not None:
+            self.instrumentation.count_cards(1)
+        if self.history is not None:
+            self.history.record(self.round, HIT, index, card)
+        return card
+
+    def stand(self, index: int) -> None:
+        """Records that the player at the given seat stands, the game state is unchanged."""
+        if self.history is not None:
+            self.history.record(self.round, STAND, index)
 
+    @timed("bank_turn")
     def bank_turn(self) -> None:
         """Performs the bank's turn."""
-        while self.bank.hand.calculate_value() < 17:
+        dealt = len(self.bank.hand.cards)
+        while self.bank.hand.calculate_value() < BANK_STANDS_ON:
             self.bank.hand.add_card(self.deck.deal())
+        if self.instrumentation is not None:
+            self.instrumentation.count_cards(len(self.bank.hand.cards) - dealt)
+        if self.history is not None:
+            for card in self.bank.hand.cards[dealt:]:
+                self.history.record(self.round, BANK_DRAW, BANK_SEAT, card)
 
-    def determine_winner(self) -> None:
-        """Determines the winner after the bank's turn."""
+    @timed("determine_winner")
+    def determine_winner(self) -> list[int]:
+        """
+        Determines the winner after the bank's turn.
+        Returns the outcome (WIN, LOSS or PUSH) of each player, in seat order.
+        To settle thousands of seats held in arrays, see batch.settle_seats.
+        """
+        outcomes = []
         bank_value = self.bank.hand.calculate_value()
+        bank_busted = bank_value > 21
         for player in self.players:
             player_value = player.hand.calculate_value()
-            if player.hand.is_busted():
+            if player_value > 21:
                 player.lose_bet()
-            elif self.bank.hand.is_busted() or player_value > bank_value:
+                outcomes.append(LOSS)
+            elif bank_busted or player_value > bank_value:
                 player.win_bet()
+                outcomes.append(WIN)
             elif player_value < bank_value:
                 player.lose_bet()
+                outcomes.append(LOSS)
             else:
                 player.push_bet()
+                outcomes.append(PUSH)
+            if self.history is not None:
+                self.history.record(
+                    self.round,
+                    SETTLE,
+                    len(outcomes) - 1,
+                    code=outcomes[-1],
+                    amount=outcomes[-1] * player.bet,
+                )
             player.reset_bet()
+        if self.ledger is not None:
+            self.ledger.commit()
+        return outcomes
@@ -3,32 +3,52 @@ from card import Card
 
 
 class Hand:
-    """Represents a hand of playing cards."""
+    """
+    Represents a hand of playing cards.
+    The hard total (aces counted as 1) and the number of aces are kept up to date as cards
+    are added, so that value queries never rescan the cards.
+    """
+
+    __slots__ = ("cards", "_hard_total", "_aces")
 
     def __init__(self) -> None:
         """Initializes an empty hand."""
         self.cards: List[Card] = []
+        self._hard_total = 0
+        self._aces = 0
 
     def add_card(self, card: Card) -> None:
         """Adds a card to the hand."""
         self.cards.append(card)
+        self._hard_total += card.hard_value
+        if card.hard_value == 1:
+            self._aces += 1
 
     def calculate_value(self) -> int:
         """Calculates the value of the hand. Adjusts for aces if the total value exceeds 21."""
-        total = sum(card.value() for card in self.cards)
-        num_aces = sum(1 for card in self.cards if card.rank == "A")
-        while total > 21 and num_aces:
-            total -= 10
-            num_aces -= 1
-        return total
+        if self._aces and self._hard_total <= 11:
+            return self._hard_total + 10
+        return self._hard_total
+
+    def is_soft(self) -> bool:
+        """Returns True if an ace is counted as 11 in the hand's value."""
+        return self._aces > 0 and self._hard_total <= 11
 
     def is_busted(self) -> bool:
         """Returns True if the hand's value exceeds 21."""
-        return self.calculate_value() > 21
+        return self._hard_total > 21
+
+    def is_blackjack(self) -> bool:
+        """Returns True if the hand is made of two cards worth 21."""
+        return len(self.cards) == 2 and self.calculate_value() == 21
 
     def start_hand(self, deck) -> None:
         """Starts the hand by dealing two cards from the given deck."""
-        self.cards = [deck.deal(), deck.deal()]
+        self.cards = []
+        self._hard_total = 0
+        self._aces = 0
+        self.add_card(deck.deal())
+        self.add_card(deck.deal())
 
     def __str__(self) -> str:
         """Returns a string representation of the hand."""
@@ -0,0 +1,179 @@
+import mmap
+import os
+import struct
+from typing import Iterator
+
+from card import CARDS, Card
+
+# Event types. Every event of a round carries the round number, see BlackJackGame.round.
+SHUFFLE = 0  # the shoe was reshuffled before dealing the round
+BET = 1  # amount: the seat's bet
+DEAL = 2  # card dealt to a seat (or the bank) at the start of the round
+HIT = 3  # the seat decided to hit and received card
+STAND = 4  # the seat decided to stand
+BANK_DRAW = 5  # card drawn by the bank during its turn
+SETTLE = 6  # code: outcome (WIN, LOSS or PUSH), amount: money won or lost by the seat
+
+# Seat of the events concerning the bank, and card of the events without a card.
+BANK_SEAT = 255
+NO_CARD = 255
+
+# A log starts with a header (magic, format version, event size), followed by fixed-width
+# events: round (uint32), type, seat, card index (uint8), code (int8) and amount (int64).
+MAGIC = b"BJHL"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+EVENT = struct.Struct("<IBBBbq")
+
+# NumPy layout of an event, used by HistoryReader.as_array.
+EVENT_FIELDS = [
+    ("round", "<u4"),
+    ("type", "u1"),
+    ("seat", "u1"),
+    ("card", "u1"),
+    ("code", "i1"),
+    ("amount", "<i8"),
+]
+
+
+class HistoryWriter:
+    """
+    Appends events to a history log file.
+    Events are packed into an in-memory buffer and written in bulk once it holds buffer_size
+    bytes, so recording costs no system call per event. Use it as a context manager, or call
+    close, so that the last events are written.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16) -> None:
+        """Opens the log at path for appending, writing its header if the file is new."""
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, EVENT.size))
+        else:
+            with open(path, "rb") as file:
+                _check_header(file.read(HEADER.size))
+
+    def record(
+        self,
+        round_number: int,
+        event_type: int,
+        seat: int,
+        card: Card | None = None,
+        code: int = 0,
+        amount: int = 0,
+    ) -> None:
+        """Records one event, see the event types for the meaning of code and amount."""
+        self._buffer += EVENT.pack(
+            round_number,
+            event_type,
+            seat,
+            NO_CARD if card is None else card.index,
+            code,
+            amount,
+        )
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered events to the file."""
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Writes the buffered events and closes the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _check_header(header: bytes) -> None:
+    """Raises ValueError if header is not the one of a history log."""
+    if len(header) < HEADER.size:
+        raise ValueError("Not a history log file")
+    magic, version, event_size = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or event_size != EVENT.size:
+        raise ValueError("Not a history log file")
+
+
+class HistoryReader:
+    """
+    Reads a history log, memory-mapped read-only: events are decoded from the mapping as they
+    are iterated, and as_array exposes the whole log as a NumPy record array without copying,
+    so logs of tens of millions of rounds are scanned without building an object per event.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Maps the log at path. A trailing partial event (interrupted write) is ignored."""
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            _check_header(file.read(HEADER.size))
+            self._buffer = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if size > HEADER.size
+                else None
+            )
+        self._count = (size - HEADER.size) // EVENT.size
+
+    def __len__(self) -> int:
+        """Returns the number of events in the log."""
+        return self._count
+
+    def _events(self) -> memoryview:
+        """Returns a view over the complete events."""
+        start = HEADER.size
+        return memoryview(self._buffer)[start : start + self._count * EVENT.size]
+
+    def __iter__(self) -> Iterator[tuple[int, int, int, int, int, int]]:
+        """Yields every event as a (round, type, seat, card, code, amount) tuple."""
+        if self._count:
+            yield from EVENT.iter_unpack(self._events())
+
+    def event(self, index: int) -> tuple[int, int, int, int, int, int]:
+        """Returns the event at index, see __iter__."""
+        if not 0 <= index < self._count:
+            raise IndexError("Event index out of range")
+        return EVENT.unpack_from(self._buffer, HEADER.size + index * EVENT.size)
+
+    @staticmethod
+    def card(index: int) -> Card | None:
+        """Returns the card of an event card index, None for events without a card."""
+        return None if index == NO_CARD else CARDS[index]
+
+    def as_array(self):
+        """Returns the events as a read-only NumPy record array sharing the mapping."""
+        # Imported here so that writing and iterating logs does not need NumPy.
+        import numpy as np
+
+        dtype = np.dtype(EVENT_FIELDS)
+        if not self._count:
+            return np.empty(0, dtype)
+        return np.frombuffer(self._buffer, dtype, count=self._count, offset=HEADER.size)
+
+    def close(self) -> None:
+        """
+        Releases the mapping. Arrays returned by as_array and unfinished iterations keep
+        working after close: the mapping is then unmapped once the last of them is dropped.
+        """
+        if self._buffer is not None:
+            try:
+                self._buffer.close()
+            except BufferError:
+                # Views of the mapping are still exported, the last one unmaps it.
+                pass
+            self._buffer = None
+
+    def __enter__(self) -> "HistoryReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,137 @@
+import functools
+import time
+from typing import Callable
+
+# Latencies are counted in a histogram of nanoseconds with SUB_BUCKETS buckets per power of
+# two, which bounds the error of the reported percentiles to about 12% at a constant cost.
+SUB_BITS = 2
+SUB_BUCKETS = 1 << SUB_BITS
+PERCENTILES = (50, 90, 99)
+
+
+def _bucket(nanoseconds: int) -> int:
+    """Returns the histogram bucket of a latency."""
+    shift = nanoseconds.bit_length() - SUB_BITS - 1
+    if shift <= 0:
+        return nanoseconds
+    return ((shift + 1) << SUB_BITS) | ((nanoseconds >> shift) & (SUB_BUCKETS - 1))
+
+
+def _bucket_value(bucket: int) -> float:
+    """Returns the middle of the latencies counted in a bucket, in nanoseconds."""
+    shift = (bucket >> SUB_BITS) - 1
+    if shift <= 0:
+        return float(bucket)
+    low = (SUB_BUCKETS | (bucket & (SUB_BUCKETS - 1))) << shift
+    return low + (1 << shift) / 2
+
+
+class PhaseStats:
+    """Represents the call count and latency histogram of one phase."""
+
+    def __init__(self) -> None:
+        """Initializes empty statistics."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: dict[int, int] = {}
+
+    def record(self, elapsed: float) -> None:
+        """Records one call that took elapsed seconds."""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        bucket = _bucket(int(elapsed * 1e9))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, percent: float) -> float:
+        """Returns an estimate of the given latency percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(_bucket_value(bucket) / 1e9, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        """Returns the statistics as a dictionary, latencies in seconds."""
+        result = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+        for percent in PERCENTILES:
+            result[f"p{percent}"] = self.percentile(percent)
+        return result
+
+
+class Instrumentation:
+    """
+    Collects call counts, latencies and cards dealt for the phases of a game.
+    Objects with an instrumentation attribute (BlackJackGame, the UI) record into it when it
+    is set, and skip all measurements when it is None.
+    """
+
+    def __init__(self) -> None:
+        """Initializes empty statistics."""
+        self.phases: dict[str, PhaseStats] = {}
+        self.cards_dealt = 0
+
+    def record(self, phase: str, elapsed: float) -> None:
+        """Records one call of a phase that took elapsed seconds."""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.record(elapsed)
+
+    def count_cards(self, count: int) -> None:
+        """Adds count cards to the number of cards dealt."""
+        self.cards_dealt += count
+
+    def reset(self) -> None:
+        """Clears every statistic."""
+        self.phases.clear()
+        self.cards_dealt = 0
+
+    def snapshot(self) -> dict:
+        """Returns every statistic as a dictionary."""
+        return {
+            "cards_dealt": self.cards_dealt,
+            "phases": {name: stats.snapshot() for name, stats in self.phases.items()},
+        }
+
+    def dump(self, path: str) -> None:
+        """Writes a snapshot of the statistics to path as JSON."""
+        # Imported here, as the game imports this module even when nothing is instrumented.
+        import json
+
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+
+def timed(phase: str) -> Callable:
+    """
+    Decorates a method so that its calls are recorded under phase in self.instrumentation.
+    When self.instrumentation is None the method is called directly, without timing.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                instrumentation.record(phase, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
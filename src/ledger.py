@@ -0,0 +1,124 @@
+import time
+
+# Kinds of ledger transactions: the bet of a dealt round, then one per Player settlement method.
+BET = "bet"
+WIN = "win"
+LOSS = "loss"
+PUSH = "push"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    money INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_player ON transactions (player, id);
+"""
+
+
+class Ledger:
+    """
+    Persists the bankroll of players in an SQLite database: their balance, and every bet and
+    settlement as a transaction.
+
+    Transactions are kept in memory until commit writes them, with the new balances, in a
+    single database transaction, once per round (see BlackJackGame.ledger). The database is in
+    WAL mode with synchronous=NORMAL, so a commit appends to the write-ahead log without an
+    fsync, the log being synced at checkpoints: a crash can lose the last rounds, but never
+    leaves the balances and transactions inconsistent.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Opens the ledger at path, creating it if needed."""
+        # Imported here, as the player module imports this one even without a ledger.
+        import sqlite3
+
+        self.path = path
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._transactions: list[tuple] = []
+        self._balances: dict[str, int] = {}
+
+    def balance(self, name: str) -> int | None:
+        """Returns the balance of a player, None if the ledger doesn't know them."""
+        if name in self._balances:
+            return self._balances[name]
+        row = self._connection.execute(
+            "SELECT money FROM players WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def open_account(self, name: str, money: int) -> int:
+        """
+        Returns the balance of a player, opening their account with money if the ledger
+        doesn't know them yet.
+        """
+        balance = self.balance(name)
+        if balance is None:
+            self._balances[name] = balance = money
+        return balance
+
+    def record(self, name: str, kind: str, amount: int, balance: int) -> None:
+        """
+        Records a transaction of a player, written at the next commit.
+
+        :param kind: BET, WIN, LOSS or PUSH
+        :param amount: Amount bet for a bet, won (negative when lost) for a settlement
+        :param balance: Money of the player after the transaction
+        """
+        self._transactions.append((name, kind, amount, balance, time.time()))
+        self._balances[name] = balance
+
+    def record_many(self, transactions: list[tuple[str, str, int, int]]) -> None:
+        """Records the (name, kind, amount, balance) transactions of players at once, see record."""
+        now = time.time()
+        append = self._transactions.append
+        for name, kind, amount, balance in transactions:
+            append((name, kind, amount, balance, now))
+            self._balances[name] = balance
+
+    def commit(self) -> None:
+        """Writes the recorded transactions and the new balances in one database transaction."""
+        if not self._transactions and not self._balances:
+            return
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT INTO transactions (player, kind, amount, balance, time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._transactions,
+            )
+            self._connection.executemany(
+                "INSERT INTO players (name, money) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET money = excluded.money",
+                self._balances.items(),
+            )
+        self._transactions.clear()
+        self._balances.clear()
+
+    def transactions(self, name: str) -> list[tuple[str, int, int]]:
+        """Returns the committed (kind, amount, balance) transactions of a player, in order."""
+        return self._connection.execute(
+            "SELECT kind, amount, balance FROM transactions WHERE player = ? ORDER BY id",
+            (name,),
+        ).fetchall()
+
+    def close(self) -> None:
+        """Commits the recorded transactions and closes the database."""
+        self.commit()
+        self._connection.close()
+
+    def __enter__(self) -> "Ledger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,9 +1,29 @@
+import os
+
 from PySide6.QtWidgets import QApplication
+from advisor import Advisor
+from instrumentation import Instrumentation
+from ledger import Ledger
+from strategy import StrategyTable
 from ui import BlackJackUI
 
 if __name__ == "__main__":
     app = QApplication([])
 
-    ui = BlackJackUI()
+    # Set BLACKJACK_INSTRUMENTATION to a file path to dump the game timings there on exit.
+    instrumentation_path = os.environ.get("BLACKJACK_INSTRUMENTATION")
+    instrumentation = Instrumentation() if instrumentation_path else None
+    # Set BLACKJACK_STRATEGY to a strategy table file (see strategy.py) to advise the players
+    # from it while the exact advice is being computed.
+    strategy_path = os.environ.get("BLACKJACK_STRATEGY")
+    table = StrategyTable.load(strategy_path) if strategy_path else None
+    # Set BLACKJACK_LEDGER to a database path to keep the players' bankrolls across sessions.
+    ledger_path = os.environ.get("BLACKJACK_LEDGER")
+    ledger = Ledger(ledger_path) if ledger_path else None
+    ui = BlackJackUI(instrumentation, Advisor(table), ledger)
     ui.show()
     app.exec()
+    if ledger is not None:
+        ledger.close()
+    if instrumentation is not None:
+        instrumentation.dump(instrumentation_path)
@@ -1,4 +1,5 @@
 from hand import Hand
+import ledger
 
 
 class Player:
@@ -10,11 +11,15 @@ class Player:
         self.money = money
         self.hand = Hand()
         self.bet = 0
+        # Set to a Ledger to persist every bet and settlement of the player.
+        self.ledger: ledger.Ledger | None = None
 
     def place_bet(self, amount: int) -> None:
         """
         Places a bet for the player.
         Raises ValueError if the bet amount exceeds the player's money.
+        The bet reaches the ledger once BlackJackGame.start_round deals the round, so that a
+        bet placed again after another seat's bet was refused is only recorded once.
         """
         if amount > self.money:
             raise ValueError("Bet amount exceeds available money")
@@ -23,14 +28,19 @@ class Player:
     def win_bet(self) -> None:
         """Increases the player's money by the bet amount (original bet)."""
         self.money += self.bet
+        if self.ledger is not None:
+            self.ledger.record(self.name, ledger.WIN, self.bet, self.money)
 
     def lose_bet(self) -> None:
         """The player's money is already reduced by the bet amount when the bet is placed, so nothing to do here."""
         self.money -= self.bet
+        if self.ledger is not None:
+            self.ledger.record(self.name, ledger.LOSS, -self.bet, self.money)
 
     def push_bet(self) -> None:
         """Player neither wins nor loses money (returns the bet amount)."""
-        pass
+        if self.ledger is not None:
+            self.ledger.record(self.name, ledger.PUSH, 0, self.money)
 
     def reset_bet(self) -> None:
         """Resets the player's bet to zero."""
@@ -0,0 +1,165 @@
+from abc import ABC, abstractmethod
+
+from card import Card
+from game import BANK_STANDS_ON
+from hand import Hand
+from states import HIT, STAND, STATES, UPCARDS, VALUES, state_index
+
+
+class CompiledPolicy:
+    """
+    A player policy compiled to a decision table: one byte (HIT or STAND) per hand state, in
+    the order of states.state_index, so that every decision is a single lookup.
+
+    A CompiledPolicy is a simulation.Policy, and simulate looks its table up directly. Its
+    batch method is a batch.BatchPolicy. It only holds bytes, so it can be sent to the workers
+    of simulate_parallel.
+    """
+
+    def __init__(self, actions: bytes, name: str = "compiled") -> None:
+        """
+        Initializes the policy.
+
+        :param actions: Decision of every hand state, see states.state_index
+        :param name: Name of the policy, for display
+        """
+        if len(actions) != STATES:
+            raise ValueError(f"A compiled policy needs {STATES} decisions")
+        self.actions = bytes(actions)
+        self.name = name
+        self._array = None
+
+    @classmethod
+    def from_table(cls, table, name: str = "table") -> "CompiledPolicy":
+        """
+        Returns the policy playing the decisions of a strategy.StrategyTable. The table is
+        not annotated, so that policies don't import the strategy module and its EV code.
+        """
+        return cls(table.actions, name)
+
+    def action(self, value: int, soft: bool, upcard_value: int) -> int:
+        """Returns the decision (HIT or STAND) of a hand state, the up card by its hard value."""
+        return self.actions[state_index(value, soft, upcard_value)]
+
+    def __call__(self, hand: Hand, upcard: Card) -> bool:
+        """Tells whether to hit, see simulation.Policy."""
+        if hand.is_busted():
+            return False
+        index = state_index(hand.calculate_value(), hand.is_soft(), upcard.hard_value)
+        return self.actions[index] == HIT
+
+    def batch(self, values, soft, upcards):
+        """
+        Tells which hands hit, see batch.BatchPolicy. Busted values are clipped to 21, as the
+        engine masks busted hands itself.
+        """
+        # Imported here, so that the policy doesn't need NumPy outside of the batch engine.
+        import numpy as np
+
+        if self._array is None:
+            self._array = np.frombuffer(self.actions, dtype=np.uint8) == HIT
+        upcards = np.where(upcards == 11, 1, upcards)
+        values = np.minimum(values, VALUES - 1)
+        return self._array[state_index(values, soft, upcards)]
+
+    def __reduce__(self):
+        """Pickles the decisions only, without the cached NumPy table."""
+        return CompiledPolicy, (self.actions, self.name)
+
+    def __repr__(self) -> str:
+        return f"CompiledPolicy({self.name!r})"
+
+
+class PlayerPolicy(ABC):
+    """
+    A player policy described by rules: decide is called once per hand state by compile, never
+    while playing. Subclasses implement decide.
+    """
+
+    # Name of the policy, for display.
+    name = "policy"
+
+    @abstractmethod
+    def decide(self, value: int, soft: bool, upcard_value: int) -> int:
+        """
+        Returns the decision (HIT or STAND) of a hand state.
+
+        :param value: Value of the player's hand, at most 21
+        :param soft: Whether an ace is counted as 11 in that value
+        :param upcard_value: Hard value of the bank's up card (1 for an ace)
+        """
+
+    def compile(self) -> CompiledPolicy:
+        """Returns the decision table of the policy."""
+        actions = bytearray(STATES)
+        for value in range(VALUES):
+            for soft in (False, True):
+                for upcard_value in range(1, UPCARDS + 1):
+                    actions[state_index(value, soft, upcard_value)] = self.decide(
+                        value, soft, upcard_value
+                    )
+        return CompiledPolicy(actions, self.name)
+
+
+class BasicStrategy(PlayerPolicy):
+    """
+    The textbook hit or stand chart: hard 12 stands against 4 to 6, hard 13 to 16 against 2
+    to 6, hard 17 and more always stand; soft 18 stands against 2 to 8, soft 19 and more
+    always stand.
+    """
+
+    name = "basic"
+
+    def decide(self, value: int, soft: bool, upcard_value: int) -> int:
+        """Returns the decision of the chart, see PlayerPolicy.decide."""
+        if soft:
+            if value >= 19 or value == 18 and 2 <= upcard_value <= 8:
+                return STAND
+            return HIT
+        if value >= 17:
+            return STAND
+        if value >= 13:
+            return STAND if 2 <= upcard_value <= 6 else HIT
+        if value == 12:
+            return STAND if 4 <= upcard_value <= 6 else HIT
+        return HIT
+
+
+class MimicDealer(PlayerPolicy):
+    """Plays like the bank: hits below its stand total, whatever its up card."""
+
+    name = "mimic"
+
+    def decide(self, value: int, soft: bool, upcard_value: int) -> int:
+        """Hits below BANK_STANDS_ON, see PlayerPolicy.decide."""
+        return HIT if value < BANK_STANDS_ON else STAND
+
+
+class NeverBust(PlayerPolicy):
+    """
+    Only hits when no card can bust the hand: hard totals up to 11, and soft totals below the
+    bank's stand total.
+    """
+
+    name = "never-bust"
+
+    def decide(self, value: int, soft: bool, upcard_value: int) -> int:
+        """Hits when the next card can't bust the hand, see PlayerPolicy.decide."""
+        if soft:
+            return HIT if value < BANK_STANDS_ON else STAND
+        return HIT if value <= 11 else STAND
+
+
+# Built-in policies, by name.
+POLICIES = {
+    BasicStrategy.name: BasicStrategy,
+    MimicDealer.name: MimicDealer,
+    NeverBust.name: NeverBust,
+}
+
+
+def compiled(name: str) -> CompiledPolicy:
+    """Returns the compiled built-in policy of the given name, see POLICIES."""
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy: {name}")
+    return POLICIES[name]().compile()
@@ -0,0 +1,193 @@
+import random
+from typing import List
+
+import numpy as np
+
+import history
+from card import CARDS, Card
+from game import BlackJackGame
+from history import HistoryReader
+from player import Player
+
+# Events dealing a card, in the order the cards left the shoe.
+CARD_EVENTS = (history.DEAL, history.HIT, history.BANK_DRAW)
+
+
+class RecordedShoe:
+    """
+    Represents a shoe dealing a recorded card order instead of shuffled cards.
+    Shuffling keeps the order, since the recording already holds the cards dealt after every
+    reshuffle of the original shoe.
+    """
+
+    def __init__(self, cards: List[Card], position: int = 0) -> None:
+        """Initializes the shoe over the recorded cards, the next card at position."""
+        self._cards = cards
+        self._position = position
+
+    @property
+    def needs_shuffle(self) -> bool:
+        """A recorded shoe never reaches a cut card."""
+        return False
+
+    def shuffle(self) -> None:
+        """Keeps the recorded order."""
+
+    def begin_round(self) -> None:
+        """Keeps the recorded order, see shuffle."""
+
+    def deal(self) -> Card:
+        """
+        Deals the next recorded card.
+        Raises ValueError once every recorded card has been dealt.
+        """
+        if self._position >= len(self._cards):
+            raise ValueError("Every recorded card has been dealt")
+        card = self._cards[self._position]
+        self._position += 1
+        return card
+
+    def __len__(self) -> int:
+        """Returns the number of recorded cards left."""
+        return len(self._cards) - self._position
+
+
+class Replay:
+    """
+    Re-executes a session recorded in a history log (see BlackJackGame.history) with the
+    recorded bets and decisions, checking that every card and settlement matches the log.
+
+    Cards come from the seed of the original shoe when it is given, and from the recorded
+    card order otherwise. seek reaches any round without playing the rounds before it: the
+    money of every seat is the sum of the settlements logged so far, and the shoe is moved past
+    the number of cards logged, reshuffled wherever the log records a shuffle.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        money: list[int],
+        seed: int | None = None,
+        decks: int = 1,
+        penetration: float = 0.75,
+    ) -> None:
+        """
+        Loads the log of a session.
+
+        :param path: History log of the session, holding its rounds only
+        :param money: Money of each seat when the session started
+        :param seed: Seed of the random.Random that shuffled the original shoe, if known
+        :param decks: Number of decks of the original shoe, when replaying from its seed
+        :param penetration: Penetration of the original shoe, when replaying from its seed
+        """
+        with HistoryReader(path) as reader:
+            events = reader.as_array()
+            self.events = events.copy()
+            del events
+        rounds = self.events["round"]
+        if len(rounds) and (rounds[0] != 1 or np.any(np.diff(rounds) < 0)):
+            raise ValueError("The log does not hold a single session")
+        self.money = list(money)
+        self.seed = seed
+        self.decks = decks
+        self.penetration = penetration
+        self.last_round = int(rounds[-1]) if len(rounds) else 0
+        # Events of round r are the ones from _starts[r] to _starts[r + 1].
+        self._starts = np.searchsorted(rounds, np.arange(self.last_round + 2))
+
+        types = self.events["type"]
+        dealt = np.isin(types, CARD_EVENTS)
+        self._cards = [CARDS[index] for index in self.events["card"][dealt].tolist()]
+        self._card_rounds = rounds[dealt]
+        self._cards_per_round = np.bincount(
+            self._card_rounds, minlength=self.last_round + 1
+        )
+        self._shuffled = np.zeros(self.last_round + 1, bool)
+        self._shuffled[rounds[types == history.SHUFFLE]] = True
+        settled = types == history.SETTLE
+        self._settle_rounds = rounds[settled]
+        self._settle_seats = self.events["seat"][settled]
+        self._settle_amounts = self.events["amount"][settled]
+        self.game: BlackJackGame | None = None
+
+    def seek(self, round_number: int) -> BlackJackGame:
+        """
+        Restores the state of the table just before the given round is dealt and returns the
+        game, which play_round then plays.
+        """
+        if not 1 <= round_number <= self.last_round:
+            raise ValueError(f"Round {round_number} is not in the log")
+        players = []
+        before = self._settle_rounds < round_number
+        for seat, money in enumerate(self.money):
+            won = self._settle_amounts[before & (self._settle_seats == seat)].sum()
+            players.append(Player(f"Seat {seat + 1}", money + int(won)))
+
+        if self.seed is None:
+            game = BlackJackGame(players)
+            position = int(np.searchsorted(self._card_rounds, round_number))
+            game.deck = RecordedShoe(self._cards, position)
+        else:
+            game = BlackJackGame(
+                players, random.Random(self.seed), self.decks, self.penetration
+            )
+            shuffled = self._shuffled[:round_number].tolist()
+            counts = self._cards_per_round[:round_number].tolist()
+            for was_shuffled, count in zip(shuffled, counts):
+                if was_shuffled:
+                    game.deck.shuffle()
+                game.deck.begin_round()
+                game.deck.skip(count)
+        game.round = round_number - 1
+        self.game = game
+        return game
+
+    def play_round(self) -> list[int]:
+        """
+        Plays the next round of the game with the recorded bets and decisions and returns its
+        outcomes. Raises ValueError if a card or a settlement differs from the log.
+        """
+        game = self.game
+        if game is None:
+            game = self.seek(1)
+        round_number = game.round + 1
+        if round_number > self.last_round:
+            raise ValueError(f"Round {round_number} is not in the log")
+        start, end = self._starts[round_number], self._starts[round_number + 1]
+        events = self.events[start:end].tolist()
+
+        for _, event_type, seat, _, _, amount in events:
+            if event_type == history.BET:
+                game.players[seat].place_bet(amount)
+        game.start_round()
+        for _, event_type, seat, _, _, _ in events:
+            if event_type == history.HIT:
+                game.hit(seat)
+            elif event_type == history.STAND:
+                game.stand(seat)
+        if not all(player.hand.is_busted() for player in game.players):
+            game.bank_turn()
+        hands = [player.hand.cards for player in game.players]
+        bank_cards = game.bank.hand.cards
+        bets = [player.bet for player in game.players]
+        outcomes = game.determine_winner()
+
+        recorded = [[] for _ in game.players]
+        recorded_bank = []
+        for _, event_type, seat, card, code, amount in events:
+            if event_type in CARD_EVENTS:
+                cards = recorded_bank if seat == history.BANK_SEAT else recorded[seat]
+                cards.append(CARDS[card])
+            elif event_type == history.SETTLE:
+                if code != outcomes[seat] or amount != code * bets[seat]:
+                    raise ValueError(
+                        f"Round {round_number}: seat {seat} settled differently"
+                    )
+        if recorded != hands or recorded_bank != bank_cards:
+            raise ValueError(f"Round {round_number}: the cards differ from the log")
+        return outcomes
+
+    def replay(self, round_number: int) -> list[int]:
+        """Seeks to the given round, plays it and returns its outcomes."""
+        self.seek(round_number)
+        return self.play_round()
@@ -0,0 +1,456 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import pickle
+import random
+import socket
+import struct
+from typing import Callable
+
+from server import (
+    BET_TIMEOUT,
+    HOST,
+    PORT,
+    TURN_TIMEOUT,
+    Server,
+    Table,
+    check_join,
+)
+
+# Seconds between two rebalancing passes, and how much busier than the average the busiest
+# worker has to be (as a share of the average load) before a table is moved off it.
+REBALANCE_INTERVAL = 5.0
+REBALANCE_MARGIN = 0.25
+
+# Writes an encoded message to a player of a table, or to all of them when the name is None.
+Write = Callable[[str, str | None, bytes], None]
+
+# Error event sent to the players of a table lost with its worker, before they are disconnected.
+TABLE_LOST = {
+    "event": "error",
+    "message": "The table was lost, please join another one",
+}
+
+# Commands and replies between the scheduler and its workers are pickled tuples, each
+# preceded by its size.
+FRAME = struct.Struct("<I")
+
+
+def _frame(item: tuple) -> bytes:
+    """Returns a command or reply ready to be written."""
+    data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+    return FRAME.pack(len(data)) + data
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple:
+    """Reads a command or reply, raising asyncio.IncompleteReadError once disconnected."""
+    (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def plan_migration(
+    placement: dict[str, int],
+    activity: dict[str, float],
+    workers: int,
+    margin: float = REBALANCE_MARGIN,
+) -> tuple[str, int] | None:
+    """
+    Returns the table to move and the worker to move it to so that the load of the busiest
+    and idlest workers gets closest, or None if the workers are balanced enough.
+
+    :param placement: Worker of every table
+    :param activity: Recent load of every table, e.g. its number of messages
+    :param workers: Number of workers
+    :param margin: Tolerated gap between the busiest and idlest workers, as a share of the average load
+    """
+    loads = [0.0] * workers
+    for table, worker in placement.items():
+        loads[worker] += activity.get(table, 0)
+    busiest = max(range(workers), key=loads.__getitem__)
+    idlest = min(range(workers), key=loads.__getitem__)
+    gap = loads[busiest] - loads[idlest]
+    if not gap or gap <= margin * sum(loads) / workers:
+        return None
+    # Moving a table with load a changes the gap to |gap - 2a|, which only shrinks if a < gap.
+    candidates = [
+        table
+        for table, worker in placement.items()
+        if worker == busiest and 0 < activity.get(table, 0) < gap
+    ]
+    if not candidates:
+        return None
+    table = min(candidates, key=lambda name: abs(activity[name] - gap / 2))
+    return table, idlest
+
+
+def _run_worker(connection: socket.socket, settings: dict) -> None:
+    """Entry point of a worker process."""
+    asyncio.run(_serve_worker(connection, settings))
+
+
+async def _serve_worker(connection: socket.socket, settings: dict) -> None:
+    """
+    Hosts tables in a worker process, performing the commands read from connection and
+    sending back the events of the tables, already encoded.
+    Replies are buffered by the stream instead of blocking, so that a worker and the
+    scheduler writing to each other at the same time never wait on each other.
+    """
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection(sock=connection)
+    tables: dict[str, Table] = {}
+
+    def sender(table: str) -> Callable[[str | None, dict], None]:
+        def send(recipient: str | None, message: dict) -> None:
+            data = (json.dumps(message) + "\n").encode()
+            writer.write(_frame(("event", table, recipient, data)))
+
+        return send
+
+    def perform(command: tuple) -> None:
+        kind, table = command[0], command[1]
+        if kind in ("message", "export", "close") and table not in tables:
+            return
+        if kind == "message":
+            name, message = command[2], command[3]
+            try:
+                tables[table].handle(name, message)
+            except ValueError as error:
+                sender(table)(name, {"event": "error", "message": str(error)})
+        elif kind == "create":
+            seed = command[2]
+            tables[table] = Table(
+                table,
+                sender(table),
+                random.Random(seed) if seed is not None else None,
+                settings["decks"],
+                settings["turn_timeout"],
+                settings["bet_timeout"],
+                loop,
+            )
+        elif kind == "export":
+            try:
+                data = pickle.dumps(tables[table])
+            except ValueError:
+                writer.write(_frame(("busy", table)))
+                return
+            tables.pop(table).close()
+            writer.write(_frame(("exported", table, data)))
+        elif kind == "import":
+            tables[table] = pickle.loads(command[2])
+            tables[table].resume(sender(table), loop)
+        elif kind == "close":
+            tables.pop(table).close()
+
+    try:
+        while True:
+            command = await _read_frame(reader)
+            if command[0] == "stop":
+                break
+            perform(command)
+            await writer.drain()
+    except asyncio.IncompleteReadError:
+        pass
+    for table in tables.values():
+        table.close()
+    writer.close()
+
+
+class Scheduler:
+    """
+    Places tables on a pool of worker processes and routes the players' messages to the
+    worker owning their table, so the games of different tables run on different cores.
+
+    Every REBALANCE_INTERVAL seconds, the table whose move best evens out the number of
+    messages handled by the busiest and idlest workers is migrated: between two rounds its
+    worker pickles it and the new worker resumes it, messages sent meanwhile being held back
+    and forwarded in order.
+
+    A worker that stops unexpectedly, e.g. killed, takes its tables with it: they are
+    reported to lost and no table is placed on it anymore. Tables that were moving to it stay
+    where they were.
+    """
+
+    def __init__(
+        self,
+        write: Write,
+        workers: int | None = None,
+        decks: int = 6,
+        turn_timeout: float = TURN_TIMEOUT,
+        bet_timeout: float = BET_TIMEOUT,
+        rebalance_interval: float = REBALANCE_INTERVAL,
+        lost: Callable[[str], None] | None = None,
+    ) -> None:
+        """
+        Initializes the scheduler, whose workers run once started.
+
+        :param write: Receives the encoded events of every table
+        :param workers: Number of worker processes, one per core by default
+        :param lost: Called with the name of every table lost with its worker
+        """
+        self.write = write
+        self.lost = lost
+        self.workers = workers or os.cpu_count() or 1
+        self.settings = {
+            "decks": decks,
+            "turn_timeout": turn_timeout,
+            "bet_timeout": bet_timeout,
+        }
+        self.rebalance_interval = rebalance_interval
+        self.placement: dict[str, int] = {}
+        self.activity: dict[str, float] = {}
+        self.migrations = 0
+        # Workers that stopped unexpectedly.
+        self.dead: set[int] = set()
+        self._writers: list[asyncio.StreamWriter] = []
+        self._readers: list[asyncio.Task] = []
+        self._processes: list[multiprocessing.Process] = []
+        # Destination of the tables being moved, and the commands held back meanwhile.
+        self._moves: dict[str, int] = {}
+        self._held: dict[str, list[tuple]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._closing = False
+
+    async def start(self) -> None:
+        """Starts the worker processes."""
+        self._loop = asyncio.get_running_loop()
+        # Workers are spawned rather than forked so that they don't inherit the running loop.
+        context = multiprocessing.get_context("spawn")
+        for worker in range(self.workers):
+            connection, child = socket.socketpair()
+            process = context.Process(
+                target=_run_worker, args=(child, self.settings), daemon=True
+            )
+            process.start()
+            child.close()
+            reader, writer = await asyncio.open_connection(sock=connection)
+            self._writers.append(writer)
+            self._readers.append(asyncio.create_task(self._receive(worker, reader)))
+            self._processes.append(process)
+        self._timer = self._loop.call_later(self.rebalance_interval, self._rebalance)
+
+    async def close(self) -> None:
+        """Stops the workers."""
+        self._closing = True
+        if self._timer is not None:
+            self._timer.cancel()
+        for writer in self._writers:
+            writer.write(_frame(("stop", None)))
+        for process in self._processes:
+            await self._loop.run_in_executor(None, process.join)
+        for task in self._readers:
+            task.cancel()
+        for writer in self._writers:
+            writer.close()
+
+    def create(self, table: str, seed: int | None = None) -> None:
+        """
+        Creates a table on the live worker hosting the fewest tables. Raises ValueError if
+        every worker stopped.
+        """
+        counts = [0] * self.workers
+        for worker in self.placement.values():
+            counts[worker] += 1
+        live = [worker for worker in range(self.workers) if worker not in self.dead]
+        if not live:
+            raise ValueError("No worker is left to host the table")
+        worker = min(live, key=counts.__getitem__)
+        self.placement[table] = worker
+        self._writers[worker].write(_frame(("create", table, seed)))
+
+    def route(self, table: str, name: str, message: dict) -> None:
+        """Forwards a player's message to the worker owning the table."""
+        self.activity[table] = self.activity.get(table, 0) + 1
+        self._send(table, ("message", table, name, message))
+
+    def close_table(self, table: str) -> None:
+        """Closes a table on its worker."""
+        if table not in self.placement:
+            return
+        self._send(table, ("close", table))
+        self.activity.pop(table, None)
+        if table not in self._moves:
+            del self.placement[table]
+
+    def migrate(self, table: str, worker: int) -> None:
+        """Moves a table to another worker once its current round is over."""
+        if table in self._held or self.placement.get(table, worker) == worker:
+            return
+        if worker in self.dead:
+            return
+        self._moves[table] = worker
+        self._held[table] = []
+        self._writers[self.placement[table]].write(_frame(("export", table)))
+
+    def _send(self, table: str, command: tuple) -> None:
+        """
+        Sends a command to the worker of a table, or holds it while the table moves.
+        Commands for a closed table are dropped.
+        """
+        held = self._held.get(table)
+        if held is not None:
+            held.append(command)
+        elif table in self.placement:
+            self._writers[self.placement[table]].write(_frame(command))
+
+    async def _receive(self, worker: int, reader: asyncio.StreamReader) -> None:
+        """Handles what a worker sends until it stops, see _lose if it was not asked to."""
+        try:
+            while True:
+                self._dispatch(await _read_frame(reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if not self._closing:
+                self._lose(worker)
+
+    def _lose(self, worker: int) -> None:
+        """Forgets the tables of a worker that stopped, and reports them to lost."""
+        self.dead.add(worker)
+        # A move to the dead worker becomes a move back to where the table is, which puts
+        # it back on its worker once exported.
+        for table, destination in self._moves.items():
+            if destination == worker:
+                self._moves[table] = self.placement[table]
+        tables = [table for table, owner in self.placement.items() if owner == worker]
+        for table in tables:
+            del self.placement[table]
+            self.activity.pop(table, None)
+            self._moves.pop(table, None)
+            self._held.pop(table, None)
+            if self.lost is not None:
+                self.lost(table)
+
+    def _dispatch(self, reply: tuple) -> None:
+        """Delivers an event of a table, or completes a migration."""
+        kind, table = reply[0], reply[1]
+        if kind == "event":
+            self.write(table, reply[2], reply[3])
+            return
+        # The table was exported, or was busy playing a round and stays where it is.
+        worker = self._moves.pop(table)
+        held = self._held.pop(table)
+        if kind == "exported":
+            self._writers[worker].write(_frame(("import", table, reply[2])))
+            self.placement[table] = worker
+            self.migrations += 1
+        for command in held:
+            self._writers[self.placement[table]].write(_frame(command))
+        if ("close", table) in held:
+            del self.placement[table]
+
+    def _rebalance(self) -> None:
+        """Moves one table off the busiest worker if needed, then decays the activity."""
+        plan = plan_migration(self.placement, self.activity, self.workers)
+        # A dead worker looks idle, migrate refuses to move tables to it.
+        if plan is not None:
+            self.migrate(*plan)
+        self.activity = {
+            table: load / 2 for table, load in self.activity.items() if load >= 1
+        }
+        self._timer = self._loop.call_later(self.rebalance_interval, self._rebalance)
+
+
+class RemoteTable:
+    """Stands for a table hosted by a worker of a Scheduler, see ShardedServer."""
+
+    def __init__(self, name: str, scheduler: Scheduler) -> None:
+        """Initializes the stand-in of the table called name."""
+        self.name = name
+        self.scheduler = scheduler
+
+    def handle(self, name: str, message: dict) -> None:
+        """
+        Forwards a message to the table. Joins are checked here so that invalid ones are
+        refused at once, other invalid actions are answered by an error event.
+        """
+        if self.name not in self.scheduler.placement:
+            raise ValueError(TABLE_LOST["message"])
+        if message.get("action") == "join":
+            check_join(name, message.get("money"))
+        self.scheduler.route(self.name, name, message)
+
+    def close(self) -> None:
+        """Closes the table."""
+        self.scheduler.close_table(self.name)
+
+
+class ShardedServer(Server):
+    """
+    Server whose tables run in a pool of worker processes managed by a Scheduler, so that
+    throughput grows with the number of cores. This process only accepts the connections,
+    decodes the messages and writes the events the workers encoded.
+    """
+
+    def __init__(
+        self,
+        host: str = HOST,
+        port: int = PORT,
+        decks: int = 6,
+        seed: int | None = None,
+        turn_timeout: float = TURN_TIMEOUT,
+        bet_timeout: float = BET_TIMEOUT,
+        workers: int | None = None,
+        rebalance_interval: float = REBALANCE_INTERVAL,
+    ) -> None:
+        """Initializes the server, see Server and Scheduler."""
+        super().__init__(host, port, decks, seed, turn_timeout, bet_timeout)
+        self.scheduler = Scheduler(
+            self._write,
+            workers,
+            decks,
+            turn_timeout,
+            bet_timeout,
+            rebalance_interval,
+            self._lose_table,
+        )
+
+    async def start(self) -> None:
+        """Starts the workers, then listens."""
+        await self.scheduler.start()
+        await super().start()
+
+    async def close(self) -> None:
+        """Stops listening, then stops the workers."""
+        await super().close()
+        await self.scheduler.close()
+
+    def _lose_table(self, name: str) -> None:
+        """Tells the players of a table lost with its worker, then disconnects them."""
+        self._write(name, None, (json.dumps(TABLE_LOST) + "\n").encode())
+        for writer in self.connections.get(name, {}).values():
+            writer.close()
+
+    def _create_table(self, name: str, seed: int | None) -> RemoteTable:
+        """Creates the table on a worker."""
+        self.scheduler.create(name, seed)
+        return RemoteTable(name, self.scheduler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serves Black Jack tables from several worker processes."
+    )
+    parser.add_argument("--host", default=HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=PORT, help="port to listen on")
+    parser.add_argument(
+        "--decks", type=int, default=6, help="number of decks in each shoe"
+    )
+    parser.add_argument(
+        "--turn-timeout", type=float, default=TURN_TIMEOUT, help="seconds per turn"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of worker processes, one per core by default",
+    )
+    arguments = parser.parse_args()
+    server = ShardedServer(
+        arguments.host,
+        arguments.port,
+        arguments.decks,
+        turn_timeout=arguments.turn_timeout,
+        workers=arguments.workers,
+    )
+    print(f"Serving Black Jack tables on {arguments.host}:{arguments.port}")
+    asyncio.run(server.serve_forever())
@@ -0,0 +1,617 @@
+import argparse
+import asyncio
+import json
+import random
+from typing import Callable
+
+from game import BANK_STANDS_ON, BlackJackGame
+from player import Player
+from simulation import derive_seed
+
+# The server only listens on the local host unless told otherwise.
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Connections waiting to be accepted. It has to absorb the players of thousands of tables
+# connecting at once, far above the default of asyncio.start_server.
+BACKLOG = 4096
+
+# Longest line a connection may send, in bytes. A longer one is answered with an error event.
+LINE_LIMIT = 2**16
+
+# Bytes of events a connection may have waiting to be sent. A player reading slower than
+# their table writes is disconnected past it, rather than buffered without bound.
+WRITE_LIMIT = 2**20
+
+# Seconds a player has to act on their turn before standing automatically, and seconds the
+# table waits for the other bets once a first bet is placed before dealing to those who bet.
+TURN_TIMEOUT = 30.0
+BET_TIMEOUT = 15.0
+
+# States of a table.
+BETTING = "betting"
+PLAYING = "playing"
+
+# Sends a message to a player of a table, or to all of them when the name is None.
+Send = Callable[[str | None, dict], None]
+
+
+def check_join(name: str, money: int) -> None:
+    """Raises ValueError unless name and money are valid for a player joining a table."""
+    if not isinstance(name, str) or not name:
+        raise ValueError("Please enter a valid name")
+    # JSON true and false decode to bools, which are ints too.
+    if not isinstance(money, int) or isinstance(money, bool) or money <= 0:
+        raise ValueError("Please enter a positive money amount")
+
+
+class Table:
+    """
+    Represents a table of the server, driving a BlackJackGame from the players' messages.
+    Its methods run synchronously and report everything through send; invalid actions raise
+    ValueError. When a loop is given, the turn and bet timeouts are scheduled on it, so a
+    player who does not act never holds up the other tables.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        send: Send,
+        rng: random.Random | None = None,
+        decks: int = 6,
+        turn_timeout: float = TURN_TIMEOUT,
+        bet_timeout: float = BET_TIMEOUT,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        """Initializes an empty table waiting for bets."""
+        self.name = name
+        self.send = send
+        self.game = BlackJackGame([], rng, decks)
+        self.seats: dict[str, Player] = {}
+        self.state = BETTING
+        self.turn = 0
+        self.leaving: set[str] = set()
+        self.turn_timeout = turn_timeout
+        self.bet_timeout = bet_timeout
+        self.loop = loop
+        self._timer: asyncio.TimerHandle | None = None
+
+    def handle(self, name: str, message: dict) -> None:
+        """Performs the action of a message sent by the player called name."""
+        action = message.get("action")
+        if action == "join":
+            self.join(name, message.get("money"))
+        elif action == "bet":
+            self.bet(name, message.get("amount"))
+        elif action == "hit":
+            self.hit(name)
+        elif action == "stand":
+            self.stand(name)
+        elif action == "leave":
+            self.leave(name)
+        else:
+            raise ValueError(f"Unknown action: {action}")
+
+    def join(self, name: str, money: int) -> None:
+        """Seats a new player, who plays from the next round dealt."""
+        check_join(name, money)
+        if name in self.seats:
+            raise ValueError("Player name already exists")
+        self.seats[name] = Player(name, money)
+        self.send(None, {"event": "joined", "name": name, "money": money})
+
+    def bet(self, name: str, amount: int) -> None:
+        """Places the bet of a player for the next round, dealt once every player has bet."""
+        player = self._player(name)
+        if self.state != BETTING:
+            raise ValueError("A round is in progress")
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0:
+            raise ValueError(f"Invalid bet amount for {name}")
+        first = not any(seat.bet for seat in self.seats.values())
+        player.place_bet(amount)
+        self.send(None, {"event": "bet", "name": name, "amount": amount})
+        if all(seat.bet for seat in self.seats.values()):
+            self._start_round()
+        elif first:
+            self._arm(self.bet_timeout)
+
+    def hit(self, name: str) -> None:
+        """Deals a card to the player whose turn it is."""
+        self._check_turn(name)
+        card = self.game.hit(self.turn)
+        hand = self.game.players[self.turn].hand
+        self.send(
+            None,
+            {
+                "event": "card",
+                "name": name,
+                "card": str(card),
+                "value": hand.calculate_value(),
+            },
+        )
+        if hand.is_busted():
+            self._next_turn()
+        else:
+            self._arm(self.turn_timeout)
+
+    def stand(self, name: str) -> None:
+        """Ends the turn of the player whose turn it is."""
+        self._check_turn(name)
+        self.game.stand(self.turn)
+        self._next_turn()
+
+    def leave(self, name: str) -> None:
+        """
+        Removes a player from the table. A player leaving during a round they play in stands
+        and keeps their seat until the round is settled.
+        """
+        player = self._player(name)
+        self.send(None, {"event": "left", "name": name})
+        if self.state == PLAYING and player in self.game.players:
+            self.leaving.add(name)
+            if self.game.players[self.turn] is player:
+                self.game.stand(self.turn)
+                self._next_turn()
+            return
+        del self.seats[name]
+        if self.state == BETTING and self.seats:
+            if all(seat.bet for seat in self.seats.values()):
+                self._start_round()
+        elif not self.seats:
+            self._cancel()
+
+    def timeout(self) -> None:
+        """Deals to the players who bet, or stands for the player whose turn it is."""
+        self._timer = None
+        if self.state == BETTING:
+            self._start_round()
+        else:
+            name = self.game.players[self.turn].name
+            self.send(None, {"event": "timeout", "name": name})
+            self.game.stand(self.turn)
+            self._next_turn()
+
+    def close(self) -> None:
+        """Cancels the pending timeout."""
+        self._cancel()
+
+    def resume(self, send: Send, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Attaches an unpickled table to send and loop, restarting its bet timeout."""
+        self.send = send
+        self.loop = loop
+        if any(seat.bet for seat in self.seats.values()):
+            self._arm(self.bet_timeout)
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state of the table to pickle, which is how a table moves to another
+        process. Raises ValueError during a round: tables only move between rounds.
+        """
+        if self.state != BETTING:
+            raise ValueError("A round is in progress")
+        state = self.__dict__.copy()
+        del state["send"], state["loop"], state["_timer"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restores a pickled table, detached until resume is called."""
+        self.__dict__.update(state)
+        self.send = None
+        self.loop = None
+        self._timer = None
+
+    def _player(self, name: str) -> Player:
+        """Returns the player called name, raising ValueError if they are not seated."""
+        try:
+            return self.seats[name]
+        except KeyError:
+            raise ValueError(f"{name} is not seated at this table") from None
+
+    def _check_turn(self, name: str) -> None:
+        """Raises ValueError unless it is the turn of the player called name."""
+        if self.state != PLAYING or self.game.players[self.turn].name != name:
+            raise ValueError("Not your turn")
+
+    def _start_round(self) -> None:
+        """Deals a round to the players who bet."""
+        players = [player for player in self.seats.values() if player.bet]
+        if not players:
+            return
+        self._cancel()
+        self.game.players = players
+        self.game.start_round()
+        self.state = PLAYING
+        self.send(
+            None,
+            {
+                "event": "dealt",
+                "round": self.game.round,
+                "hands": {
+                    player.name: {
+                        "cards": [str(card) for card in player.hand.cards],
+                        "value": player.hand.calculate_value(),
+                    }
+                    for player in players
+                },
+                "bank": [str(self.game.bank.hand.cards[0])],
+            },
+        )
+        self.turn = -1
+        self._next_turn()
+
+    def _next_turn(self) -> None:
+        """Gives the turn to the next player, or settles the round after the last one."""
+        players = self.game.players
+        self.turn += 1
+        while self.turn < len(players) and players[self.turn].name in self.leaving:
+            self.game.stand(self.turn)
+            self.turn += 1
+        if self.turn == len(players):
+            self._settle()
+            return
+        self.send(None, {"event": "turn", "name": players[self.turn].name})
+        self._arm(self.turn_timeout)
+
+    def _settle(self) -> None:
+        """Plays the bank's turn and settles the bets."""
+        self._cancel()
+        game = self.game
+        # Like the UI, the bank does not play when every player is busted.
+        if not all(player.hand.is_busted() for player in game.players):
+            game.bank_turn()
+        outcomes = game.determine_winner()
+        self.send(
+            None,
+            {
+                "event": "settled",
+                "round": game.round,
+                "bank": [str(card) for card in game.bank.hand.cards],
+                "bank_value": game.bank.hand.calculate_value(),
+                "results": {
+                    player.name: {"outcome": outcome, "money": player.money}
+                    for player, outcome in zip(game.players, outcomes)
+                },
+            },
+        )
+        self.state = BETTING
+        for name in self.leaving:
+            del self.seats[name]
+        self.leaving.clear()
+
+    def _arm(self, delay: float) -> None:
+        """Schedules timeout after delay seconds, replacing the pending one."""
+        self._cancel()
+        if self.loop is not None:
+            self._timer = self.loop.call_later(delay, self.timeout)
+
+    def _cancel(self) -> None:
+        """Cancels the pending timeout."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+class Server:
+    """
+    Hosts any number of tables in one process, over a TCP protocol of JSON messages, one
+    per line. A connection joins a table with {"action": "join", "table", "name", "money"},
+    then sends bet (with an amount), hit, stand and leave actions, and receives the events of
+    its table. Invalid messages are answered with an error event.
+    """
+
+    def __init__(
+        self,
+        host: str = HOST,
+        port: int = PORT,
+        decks: int = 6,
+        seed: int | None = None,
+        turn_timeout: float = TURN_TIMEOUT,
+        bet_timeout: float = BET_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the server, which listens once started.
+
+        :param port: Port to listen on, 0 to pick a free one (see port once started)
+        :param seed: Seed of the tables' shoes, each table getting its own stream
+        """
+        self.host = host
+        self.port = port
+        self.decks = decks
+        self.seed = seed
+        self.turn_timeout = turn_timeout
+        self.bet_timeout = bet_timeout
+        self.tables: dict[str, Table] = {}
+        self.connections: dict[str, dict[str, asyncio.StreamWriter]] = {}
+        self._tables_created = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Starts listening."""
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port, limit=LINE_LIMIT, backlog=BACKLOG
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Starts listening and serves until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops listening and cancels the timeouts of every table."""
+        for table in self.tables.values():
+            table.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def table(self, name: str) -> Table:
+        """Returns the table called name, creating it if needed."""
+        table = self.tables.get(name)
+        if table is None:
+            seed = None
+            if self.seed is not None:
+                seed = derive_seed(self.seed, self._tables_created)
+            self._tables_created += 1
+            table = self.tables[name] = self._create_table(name, seed)
+            self.connections[name] = {}
+        return table
+
+    def _create_table(self, name: str, seed: int | None) -> Table:
+        """Creates a table, its shoe shuffled from seed when given."""
+        return Table(
+            name,
+            lambda recipient, message: self._deliver(name, recipient, message),
+            random.Random(seed) if seed is not None else None,
+            self.decks,
+            self.turn_timeout,
+            self.bet_timeout,
+            asyncio.get_running_loop(),
+        )
+
+    def _deliver(self, table: str, recipient: str | None, message: dict) -> None:
+        """Writes a message to one player of a table, or all of them."""
+        self._write(table, recipient, (json.dumps(message) + "\n").encode())
+
+    def _write(self, table: str, recipient: str | None, data: bytes) -> None:
+        """
+        Writes an encoded message to one player of a table, or all of them. A player whose
+        connection already holds WRITE_LIMIT bytes not yet sent is disconnected instead, their
+        own connection then leaving the table.
+        """
+        connections = self.connections.get(table)
+        if connections is None:
+            return
+        if recipient is None:
+            writers = list(connections.values())
+        elif recipient in connections:
+            writers = [connections[recipient]]
+        else:
+            return
+        for writer in writers:
+            transport = writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > WRITE_LIMIT:
+                transport.abort()
+            else:
+                writer.write(data)
+
+    def _join(self, message: dict, writer: asyncio.StreamWriter) -> tuple[Table, str]:
+        """Seats the connection at the table of a join message."""
+        table_name = message.get("table")
+        name = message.get("name")
+        if not isinstance(table_name, str) or not table_name:
+            raise ValueError("Please enter a valid table name")
+        check_join(name, message.get("money"))
+        table = self.table(table_name)
+        connections = self.connections[table_name]
+        if name in connections:
+            raise ValueError("Player name already exists")
+        connections[name] = writer
+        try:
+            table.handle(name, message)
+        except ValueError:
+            del connections[name]
+            self._drop_if_empty(table)
+            raise
+        return table, name
+
+    def _leave(self, table: Table, name: str) -> None:
+        """Removes a player and their connection from a table."""
+        try:
+            table.handle(name, {"action": "leave"})
+        except ValueError:
+            # The player was never seated, their join failed.
+            pass
+        self.connections[table.name].pop(name, None)
+        self._drop_if_empty(table)
+
+    def _drop_if_empty(self, table: Table) -> None:
+        """Closes a table once nobody is connected to it."""
+        if not self.connections[table.name]:
+            table.close()
+            del self.tables[table.name]
+            del self.connections[table.name]
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves the messages of one connection."""
+        table: Table | None = None
+        name = None
+        try:
+            while True:
+                try:
+                    message = await _read_message(reader)
+                    if message is None:
+                        break
+                    if table is None:
+                        if message.get("action") != "join":
+                            raise ValueError("Join a table first")
+                        table, name = self._join(message, writer)
+                    elif message.get("action") == "leave":
+                        self._leave(table, name)
+                        table = name = None
+                    else:
+                        table.handle(name, message)
+                except ValueError as error:
+                    reply = {"event": "error", "message": str(error)}
+                    writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if table is not None:
+                self._leave(table, name)
+            writer.close()
+
+
+async def _read_message(reader: asyncio.StreamReader) -> dict | None:
+    """
+    Reads the next message of a connection, None once it is closed. Raises ValueError for
+    an invalid message, a line longer than LINE_LIMIT being skipped whole.
+    """
+    try:
+        line = await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        line = error.partial
+    except asyncio.LimitOverrunError as error:
+        await _skip_line(reader, error.consumed)
+        raise ValueError(f"Messages must be shorter than {LINE_LIMIT} bytes") from None
+    if not line:
+        return None
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Messages must be JSON objects")
+    return message
+
+
+async def _skip_line(reader: asyncio.StreamReader, consumed: int) -> None:
+    """
+    Drops the rest of a line over the limit of the stream, in chunks the stream can hold,
+    consumed bytes being already buffered.
+    """
+    try:
+        while True:
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+    except asyncio.IncompleteReadError:
+        # The connection closed before the end of the line, the next read ends it.
+        pass
+
+
+class Client:
+    """Minimal client of the server, to drive tables locally in tests and load runs."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Initializes the client over an open connection, see connect."""
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = HOST, port: int = PORT) -> "Client":
+        """Connects to a server."""
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def send(self, action: str, **fields) -> None:
+        """Sends an action with its fields."""
+        message = {"action": action, **fields}
+        self.writer.write((json.dumps(message) + "\n").encode())
+        await self.writer.drain()
+
+    async def receive(self) -> dict:
+        """Returns the next event received, raising ConnectionError once disconnected."""
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Disconnected from the server")
+        return json.loads(line)
+
+    async def receive_until(self, event: str) -> dict:
+        """Returns the next event of the given kind, skipping the others."""
+        while True:
+            message = await self.receive()
+            if message["event"] == event:
+                return message
+
+    async def close(self) -> None:
+        """Closes the connection."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            # Reset by the server while events were still on their way: closed all the same.
+            pass
+
+
+async def play_bot(
+    table: str,
+    name: str,
+    rounds: int,
+    money: int = 1000,
+    bet: int = 10,
+    host: str = HOST,
+    port: int = PORT,
+) -> int:
+    """
+    Plays rounds at a table like the bank does (hitting below BANK_STANDS_ON), betting again
+    as soon as a round is settled, and returns the player's money at the end.
+    """
+    client = await Client.connect(host, port)
+    await client.send("join", table=table, name=name, money=money)
+    await client.send("bet", amount=bet)
+    value = 0
+    played = 0
+    try:
+        while played < rounds:
+            message = await client.receive()
+            event = message["event"]
+            if event == "dealt" and name in message["hands"]:
+                value = message["hands"][name]["value"]
+            elif event == "card" and message["name"] == name:
+                value = message["value"]
+            if event in ("turn", "card") and message["name"] == name:
+                if value < BANK_STANDS_ON:
+                    await client.send("hit")
+                elif value <= 21:
+                    await client.send("stand")
+            elif event == "settled" and name in message["results"]:
+                played += 1
+                money = message["results"][name]["money"]
+                if played < rounds:
+                    await client.send("bet", amount=min(bet, money))
+            elif event == "settled":
+                # Missed that round (the bet came after the deal): bet for the next one.
+                await client.send("bet", amount=min(bet, money))
+        await client.send("leave")
+    finally:
+        await client.close()
+    return money
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serves Black Jack tables.")
+    parser.add_argument("--host", default=HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=PORT, help="port to listen on")
+    parser.add_argument(
+        "--decks", type=int, default=6, help="number of decks in each shoe"
+    )
+    parser.add_argument(
+        "--turn-timeout", type=float, default=TURN_TIMEOUT, help="seconds per turn"
+    )
+    arguments = parser.parse_args()
+    server = Server(
+        arguments.host,
+        arguments.port,
+        arguments.decks,
+        turn_timeout=arguments.turn_timeout,
+    )
+    print(f"Serving Black Jack tables on {arguments.host}:{arguments.port}")
+    asyncio.run(server.serve_forever())
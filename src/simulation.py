@@ -0,0 +1,257 @@
+import hashlib
+import random
+import time
+from typing import Callable
+
+from card import Card
+from game import BlackJackGame, WIN, LOSS
+from hand import Hand
+from history import HistoryWriter
+from player import Player
+from stats import Statistics
+from states import HIT, state_index
+
+# A policy decides, for a player's hand and the bank's face-up card, whether to hit.
+# Rule-based policies (see policy.PlayerPolicy) are also accepted and compiled first.
+Policy = Callable[[Hand, Card], bool]
+
+# Rounds played by each task of a parallel simulation. The split into chunks, and so the
+# random streams, only depends on this size and never on the number of workers.
+CHUNK_ROUNDS = 100_000
+
+
+def dealer_policy(hand: Hand, upcard: Card) -> bool:
+    """Hits below 17, exactly like the bank does."""
+    return hand.calculate_value() < 17
+
+
+def stand_policy(hand: Hand, upcard: Card) -> bool:
+    """Never hits."""
+    return False
+
+
+class SimulationResult:
+    """Aggregated outcome of a batch of simulated rounds."""
+
+    def __init__(self, seats: int) -> None:
+        """Initializes an empty result for the given number of seats."""
+        self.seats = seats
+        self.rounds = 0
+        self.hands = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.busts = 0
+        self.bank_busts = 0
+        self.wagered = 0
+        self.net = 0
+        self.elapsed = 0.0
+        # Statistics collected during the run, if any, see simulate.
+        self.stats: Statistics | None = None
+
+    @property
+    def house_edge(self) -> float:
+        """Returns the bank's average gain per unit wagered."""
+        return -self.net / self.wagered if self.wagered else 0.0
+
+    @property
+    def rounds_per_second(self) -> float:
+        """Returns the simulation throughput."""
+        return self.rounds / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other: "SimulationResult") -> None:
+        """
+        Adds the counts of another result, played with the same seats, to this one, and its
+        statistics to the ones of this result when both have some.
+        """
+        if other.seats != self.seats:
+            raise ValueError("Cannot merge results with a different number of seats")
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.busts += other.busts
+        self.bank_busts += other.bank_busts
+        self.wagered += other.wagered
+        self.net += other.net
+        self.elapsed += other.elapsed
+        if self.stats is not None and other.stats is not None:
+            self.stats.merge(other.stats)
+
+    def __str__(self) -> str:
+        """Returns a one line summary of the result."""
+        return (
+            f"{self.rounds} rounds, {self.hands} hands: "
+            f"{self.wins} wins, {self.losses} losses, {self.pushes} pushes "
+            f"(house edge: {self.house_edge:.4%}, {self.rounds_per_second:.0f} rounds/s)"
+        )
+
+
+def derive_seed(seed: int, stream: int) -> int:
+    """Derives the seed of an independent random stream from a base seed and a stream number."""
+    digest = hashlib.sha256(f"{seed}:{stream}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def simulate(
+    rounds: int,
+    players: int = 1,
+    policy: Policy = dealer_policy,
+    bet: int = 1,
+    seed: int | None = None,
+    decks: int = 1,
+    history: HistoryWriter | None = None,
+    stats: Statistics | None = None,
+) -> SimulationResult:
+    """
+    Plays the given number of rounds headlessly and returns the aggregated result.
+
+    :param rounds: Number of rounds to play
+    :param players: Number of seats at the table, every seat follows the same policy
+    :param policy: Decides for each seat whether to hit, see Policy. The decision table of a
+        CompiledPolicy is looked up directly, without calling it
+    :param bet: Amount every seat bets each round
+    :param seed: Seed of the shoe shuffles, the same seed always gives the same result
+    :param decks: Number of decks in the shoe, reshuffled at the cut card
+    :param history: Log receiving the events of every round, see BlackJackGame.history
+    :param stats: Statistics aggregating every round, also set as the result's stats
+    """
+    seats = [Player(name=f"Seat {i + 1}", money=bet * rounds) for i in range(players)]
+    rng = random.Random(seed) if seed is not None else None
+    game = BlackJackGame(seats, rng, decks)
+    game.history = history
+    bank = game.bank
+    result = SimulationResult(players)
+    result.stats = stats
+    # Rule-based policies are compiled, and the table of compiled ones looked up directly.
+    if hasattr(policy, "compile"):
+        policy = policy.compile()
+    actions = getattr(policy, "actions", None)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for player in seats:
+            player.place_bet(bet)
+        game.start_round()
+
+        upcard = bank.hand.cards[0]
+        all_busted = True
+        for index, player in enumerate(seats):
+            hand = player.hand
+            if actions is None:
+                while not hand.is_busted() and policy(hand, upcard):
+                    game.hit(index)
+            else:
+                upcard_value = upcard.hard_value
+                while (
+                    not hand.is_busted()
+                    and actions[
+                        state_index(
+                            hand.calculate_value(), hand.is_soft(), upcard_value
+                        )
+                    ]
+                    == HIT
+                ):
+                    game.hit(index)
+            if hand.is_busted():
+                result.busts += 1
+            else:
+                all_busted = False
+                game.stand(index)
+
+        # Like the UI, the bank does not play when every player is busted.
+        if not all_busted:
+            game.bank_turn()
+            if bank.hand.is_busted():
+                result.bank_busts += 1
+
+        outcomes = game.determine_winner()
+        for outcome in outcomes:
+            if outcome == WIN:
+                result.wins += 1
+            elif outcome == LOSS:
+                result.losses += 1
+            else:
+                result.pushes += 1
+        if stats is not None:
+            stats.record_round(
+                upcard,
+                [player.hand.calculate_value() for player in seats],
+                outcomes,
+                bet,
+                None if all_busted else bank.hand.calculate_value(),
+            )
+    result.elapsed = time.perf_counter() - start
+
+    result.rounds = rounds
+    result.hands = rounds * players
+    result.wagered = result.hands * bet
+    # Net is read back from the players' money so that payouts themselves are validated.
+    result.net = sum(player.money for player in seats) - bet * rounds * players
+    return result
+
+
+def _simulate_chunk(args: tuple) -> SimulationResult:
+    """
+    Runs one chunk of a parallel simulation, unpacking its arguments, the last one telling
+    whether to collect the chunk's statistics.
+    """
+    *arguments, collect = args
+    stats = Statistics(arguments[1]) if collect else None
+    return simulate(*arguments, stats=stats)
+
+
+def simulate_parallel(
+    rounds: int,
+    players: int = 1,
+    policy: Policy = dealer_policy,
+    bet: int = 1,
+    seed: int = 0,
+    decks: int = 1,
+    workers: int | None = None,
+    chunk_rounds: int = CHUNK_ROUNDS,
+    stats: Statistics | None = None,
+) -> SimulationResult:
+    """
+    Plays the given number of rounds on a pool of processes and returns the merged result.
+
+    The rounds are split in chunks of chunk_rounds, each one shuffled with its own stream
+    derived from seed, and the results are merged in chunk order. The same seed therefore
+    gives the same counts whatever the number of workers.
+    The policy is sent to the workers, so it must be picklable (e.g. a module level function).
+
+    :param workers: Number of processes, defaults to the number of CPUs
+    :param stats: Statistics the ones of every chunk are merged into, in chunk order, so its
+        snapshots come as the chunks complete
+    """
+    chunks = []
+    for index, start in enumerate(range(0, rounds, chunk_rounds)):
+        count = min(chunk_rounds, rounds - start)
+        chunks.append(
+            (
+                count,
+                players,
+                policy,
+                bet,
+                derive_seed(seed, index),
+                decks,
+                stats is not None,
+            )
+        )
+
+    result = SimulationResult(players)
+    result.stats = stats
+    start = time.perf_counter()
+    if workers == 1:
+        for partial in map(_simulate_chunk, chunks):
+            result.merge(partial)
+    else:
+        # Imported here, as the process pool machinery is slow to import and only needed here.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(_simulate_chunk, chunks):
+                result.merge(partial)
+    result.elapsed = time.perf_counter() - start
+    return result
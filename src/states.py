@@ -0,0 +1,20 @@
+# Player decisions, in the order of the (stand, hit) pairs returned by ev.EVCalculator.evaluate.
+STAND = 0
+HIT = 1
+
+# Hand states are indexed by (value, soft flag, up card), the up card by its hard value
+# (1 for an ace, 10 for ten-valued cards), see state_index.
+VALUES = 22
+UPCARDS = 10
+STATES = VALUES * 2 * UPCARDS
+
+
+def state_index(value: int, soft: bool, upcard_value: int) -> int:
+    """
+    Returns the table index of a hand state.
+
+    :param value: Value of the player's hand, at most 21
+    :param soft: Whether an ace is counted as 11 in that value
+    :param upcard_value: Hard value of the bank's up card (1 for an ace)
+    """
+    return (value * 2 + soft) * UPCARDS + upcard_value - 1
@@ -0,0 +1,211 @@
+from typing import Callable
+
+from card import Card
+from game import LOSS, WIN
+from states import UPCARDS
+
+# Final totals are counted one by one up to 21, every busted total in this last bucket.
+BUST = 22
+
+# Labels of the bank's up cards, by hard value less one.
+UPCARD_LABELS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10")
+
+
+class Statistics:
+    """
+    Outcome statistics of a simulation, aggregated round by round in a fixed amount of memory
+    whatever the number of rounds: counts per seat, per bank up card and per final total.
+
+    The net result of every seat is tracked through its exact integer sum and sum of squares,
+    rather than a running floating point mean, so that the statistics of parallel chunks merge
+    into exactly the ones of a single run, whatever the order of the merges.
+    """
+
+    def __init__(
+        self,
+        seats: int,
+        every: int = 0,
+        on_snapshot: Callable[[dict], None] | None = None,
+    ) -> None:
+        """
+        Initializes empty statistics.
+
+        :param seats: Number of seats at the table
+        :param every: Number of rounds between two snapshots, 0 for none
+        :param on_snapshot: Called with a snapshot (see snapshot) every time the number of
+            rounds aggregated reaches a multiple of every
+        """
+        if every < 0:
+            raise ValueError("Snapshot interval must be positive")
+        self.seats = seats
+        self.every = every
+        self.on_snapshot = on_snapshot
+        self.rounds = 0
+        self.wins = [0] * seats
+        self.losses = [0] * seats
+        self.pushes = [0] * seats
+        self.net = [0] * seats
+        self.net_squares = [0] * seats
+        # Rounds and hands dealt against each up card, by hard value less one, with the
+        # players' busts, and the rounds where the bank played and its busts.
+        self.upcard_hands = [0] * UPCARDS
+        self.upcard_busts = [0] * UPCARDS
+        self.upcard_bank_rounds = [0] * UPCARDS
+        self.upcard_bank_busts = [0] * UPCARDS
+        # Number of final hands of every total, up to BUST.
+        self.player_totals = [0] * (BUST + 1)
+        self.bank_totals = [0] * (BUST + 1)
+
+    def record_round(
+        self,
+        upcard: Card,
+        values: list[int],
+        outcomes: list[int],
+        bet: int,
+        bank_value: int | None,
+    ) -> None:
+        """
+        Aggregates a settled round.
+
+        :param upcard: The bank's face-up card
+        :param values: Final value of every seat's hand, in seat order
+        :param outcomes: Outcome of every seat, as returned by BlackJackGame.determine_winner
+        :param bet: Amount every seat bet
+        :param bank_value: Final value of the bank's hand, None if the bank did not play
+        """
+        upcard_index = upcard.hard_value - 1
+        player_totals = self.player_totals
+        busts = 0
+        for seat, (value, outcome) in enumerate(zip(values, outcomes)):
+            if outcome == WIN:
+                self.wins[seat] += 1
+            elif outcome == LOSS:
+                self.losses[seat] += 1
+            else:
+                self.pushes[seat] += 1
+            net = outcome * bet
+            self.net[seat] += net
+            self.net_squares[seat] += net * net
+            if value > 21:
+                busts += 1
+                player_totals[BUST] += 1
+            else:
+                player_totals[value] += 1
+        self.upcard_hands[upcard_index] += len(values)
+        self.upcard_busts[upcard_index] += busts
+        if bank_value is not None:
+            self.upcard_bank_rounds[upcard_index] += 1
+            if bank_value > 21:
+                self.upcard_bank_busts[upcard_index] += 1
+            self.bank_totals[min(bank_value, BUST)] += 1
+
+        self.rounds += 1
+        if self.every and self.rounds % self.every == 0:
+            self._emit()
+
+    def merge(self, other: "Statistics") -> None:
+        """Adds the counts of other statistics, for the same seats, to these ones."""
+        if other.seats != self.seats:
+            raise ValueError("Cannot merge statistics with a different number of seats")
+        previous = self.rounds
+        self.rounds += other.rounds
+        for name in (
+            "wins",
+            "losses",
+            "pushes",
+            "net",
+            "net_squares",
+            "upcard_hands",
+            "upcard_busts",
+            "upcard_bank_rounds",
+            "upcard_bank_busts",
+            "player_totals",
+            "bank_totals",
+        ):
+            counts = getattr(self, name)
+            for index, count in enumerate(getattr(other, name)):
+                counts[index] += count
+        if self.every and self.rounds // self.every > previous // self.every:
+            self._emit()
+
+    def _emit(self) -> None:
+        """Sends a snapshot to on_snapshot, if set."""
+        if self.on_snapshot is not None:
+            self.on_snapshot(self.snapshot())
+
+    def mean(self, seat: int) -> float:
+        """Returns the average net result per round of a seat."""
+        return self.net[seat] / self.rounds if self.rounds else 0.0
+
+    def variance(self, seat: int) -> float:
+        """Returns the sample variance of the net result per round of a seat."""
+        n = self.rounds
+        if n < 2:
+            return 0.0
+        total = self.net[seat]
+        return (n * self.net_squares[seat] - total * total) / (n * (n - 1))
+
+    def rates(self, seat: int) -> tuple[float, float, float]:
+        """Returns the win, loss and push rates of a seat."""
+        if not self.rounds:
+            return 0.0, 0.0, 0.0
+        return (
+            self.wins[seat] / self.rounds,
+            self.losses[seat] / self.rounds,
+            self.pushes[seat] / self.rounds,
+        )
+
+    def bust_rate(self, upcard_value: int) -> float:
+        """Returns the rate of player busts against an up card, given by its hard value."""
+        hands = self.upcard_hands[upcard_value - 1]
+        return self.upcard_busts[upcard_value - 1] / hands if hands else 0.0
+
+    def bank_bust_rate(self, upcard_value: int) -> float:
+        """Returns the rate of bank busts with an up card, over the rounds the bank played."""
+        rounds = self.upcard_bank_rounds[upcard_value - 1]
+        return self.upcard_bank_busts[upcard_value - 1] / rounds if rounds else 0.0
+
+    def snapshot(self) -> dict:
+        """Returns the current statistics as plain data, e.g. to dump as JSON."""
+        seats = []
+        for seat in range(self.seats):
+            win, loss, push = self.rates(seat)
+            seats.append(
+                {
+                    "win_rate": win,
+                    "loss_rate": loss,
+                    "push_rate": push,
+                    "mean": self.mean(seat),
+                    "variance": self.variance(seat),
+                }
+            )
+        return {
+            "rounds": self.rounds,
+            "seats": seats,
+            "bust_rate_by_upcard": {
+                label: self.bust_rate(value)
+                for value, label in enumerate(UPCARD_LABELS, 1)
+            },
+            "bank_bust_rate_by_upcard": {
+                label: self.bank_bust_rate(value)
+                for value, label in enumerate(UPCARD_LABELS, 1)
+            },
+            "player_totals": list(self.player_totals),
+            "bank_totals": list(self.bank_totals),
+        }
+
+    def __str__(self) -> str:
+        """Returns a summary of the statistics, one line per seat and one for the busts."""
+        lines = []
+        for seat in range(self.seats):
+            win, loss, push = self.rates(seat)
+            lines.append(
+                f"Seat {seat + 1}: {win:.2%} wins, {loss:.2%} losses, {push:.2%} pushes, "
+                f"net {self.mean(seat):+.4f} ± {self.variance(seat) ** 0.5:.4f} per round"
+            )
+        busts = ", ".join(
+            f"{label}: {self.bust_rate(value):.1%}"
+            for value, label in enumerate(UPCARD_LABELS, 1)
+        )
+        lines.append(f"Player busts by up card: {busts}")
+        return "\n".join(lines)
@@ -0,0 +1,131 @@
+import argparse
+import math
+import mmap
+import struct
+from array import array
+
+from card import Card
+from dealer import DealerOdds, full_composition, remove_card
+from ev import EVCalculator
+from game import BANK_STANDS_ON
+from states import HIT, STAND, STATES, UPCARDS, VALUES, state_index
+
+# File header: magic, format version, number of decks, bank stand total and number of states.
+# It is followed by the stand EVs and hit EVs (float32) and the decisions (uint8) of every state.
+MAGIC = b"BJST"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHH")
+
+
+def representative_cards(value: int, soft: bool) -> tuple[str, ...] | None:
+    """Returns ranks making a typical hand of the given state, or None if it can't be dealt."""
+    if soft:
+        if not 12 <= value <= 21:
+            return None
+        return ("A", "A") if value == 12 else ("A", str(value - 11))
+    if value < 4:
+        return None
+    if value <= 11:
+        return ("2", str(value - 2))
+    if value <= 19:
+        return ("K", str(value - 10))
+    return ("K", "Q") if value == 20 else ("K", "9", "2")
+
+
+def build_table(
+    decks: int, path: str, calculator: EVCalculator | None = None
+) -> "StrategyTable":
+    """
+    Computes the decision and the stand and hit EVs of every hand state for a shoe of the given
+    number of decks, writes them to path and returns the loaded table.
+    Each state is evaluated for a typical hand (e.g. K, 6 for hard 16) dealt from a full shoe.
+    """
+    if calculator is None:
+        calculator = EVCalculator(dealer=DealerOdds(1_000_000))
+    stands = array("f", [math.nan]) * STATES
+    hits = array("f", [math.nan]) * STATES
+    actions = array("B", [HIT]) * STATES
+    shoe = full_composition(decks)
+    for upcard_value in range(1, UPCARDS + 1):
+        upcard = Card("Spades", "A" if upcard_value == 1 else str(upcard_value))
+        for soft in (False, True):
+            for value in range(VALUES):
+                ranks = representative_cards(value, soft)
+                if ranks is None:
+                    continue
+                counts = remove_card(shoe, upcard)
+                for rank in ranks:
+                    counts = remove_card(counts, Card("Hearts", rank))
+                stand, hit = calculator.evaluate(value, soft, upcard, counts)
+                index = state_index(value, soft, upcard_value)
+                stands[index], hits[index] = stand, hit
+                actions[index] = HIT if hit > stand else STAND
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, decks, BANK_STANDS_ON, STATES))
+        file.write(stands.tobytes())
+        file.write(hits.tobytes())
+        file.write(actions.tobytes())
+    return StrategyTable.load(path)
+
+
+class StrategyTable:
+    """
+    Represents a strategy table file, memory-mapped read-only so that every process using the
+    same file shares its pages. Lookups are a single index into the mapped arrays.
+    """
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        """Initializes the table over a mapped file, checking its header."""
+        if len(buffer) < HEADER.size:
+            raise ValueError("Not a strategy table file")
+        magic, version, decks, stands_on, states = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION or states != STATES:
+            raise ValueError("Not a strategy table file")
+        expected = HEADER.size + STATES * 9
+        if len(buffer) != expected:
+            raise ValueError("Truncated strategy table file")
+        self.decks = decks
+        self.bank_stands_on = stands_on
+        self._buffer = buffer
+        self._view = view = memoryview(buffer)
+        offset = HEADER.size
+        self.stand_evs = view[offset : offset + STATES * 4].cast("f")
+        offset += STATES * 4
+        self.hit_evs = view[offset : offset + STATES * 4].cast("f")
+        offset += STATES * 4
+        self.actions = view[offset : offset + STATES]
+
+    @classmethod
+    def load(cls, path: str) -> "StrategyTable":
+        """Maps the strategy table file at path."""
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def action(self, value: int, soft: bool, upcard: Card) -> int:
+        """Returns the decision (STAND or HIT) for a hand state."""
+        return self.actions[state_index(value, soft, upcard.hard_value)]
+
+    def evs(self, value: int, soft: bool, upcard: Card) -> tuple[float, float]:
+        """Returns the stand and hit EVs of a hand state, NaN for states that can't be dealt."""
+        index = state_index(value, soft, upcard.hard_value)
+        return self.stand_evs[index], self.hit_evs[index]
+
+    def close(self) -> None:
+        """Releases the mapping."""
+        self.stand_evs.release()
+        self.hit_evs.release()
+        self.actions.release()
+        self._view.release()
+        self._buffer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds a Black Jack strategy table.")
+    parser.add_argument("path", help="file to write the table to")
+    parser.add_argument(
+        "--decks", type=int, default=6, help="number of decks in the shoe"
+    )
+    arguments = parser.parse_args()
+    table = build_table(arguments.decks, arguments.path)
+    print(f"Strategy table for {table.decks} decks written to {arguments.path}")
@@ -7,24 +7,57 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QHBoxLayout,
     QFormLayout,
-    QListWidget,
+    QListView,
+    QComboBox,
+    QCheckBox,
+    QDoubleSpinBox,
 )
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QCloseEvent
 
+from advisor import Advisor
+from instrumentation import Instrumentation
+from ledger import Ledger
+from ui_advisor import AdviceController
 from ui_handler import BlackJackUIHandlers
+from ui_models import SORT_KEYS, PlayerFilterModel, PlayerListModel
+from ui_widgets import ResultsPanel, TableWidget
+
+# Default delay before the next round is dealt in auto-advance mode, in seconds.
+AUTO_ADVANCE_DELAY = 3.0
 
 
 class BlackJackUI(QMainWindow, BlackJackUIHandlers):
     """Represents the UI for the Black Jack game."""
 
-    def __init__(self) -> None:
-        """Initializes the UI components and the game state."""
+    def __init__(
+        self,
+        instrumentation: Instrumentation | None = None,
+        advisor: Advisor | None = None,
+        ledger: Ledger | None = None,
+    ) -> None:
+        """
+        Initializes the UI components and the game state.
+        When instrumentation is given, the UI slots and the game record their timings in it.
+        The advice shown to the current player comes from advisor, one without a strategy
+        table by default.
+        When ledger is given, players already in it get their balance back, and every bet and
+        settlement is persisted in it.
+        """
         super().__init__()
         self.players = []
         self.current_player_index = -1
+        self.instrumentation = instrumentation
+        self.ledger = ledger
+        self.advice_controller = AdviceController(
+            advisor if advisor is not None else Advisor()
+        )
+        self.advice_controller.advice_ready.connect(self.show_advice)
         self.initUI()
         self.player_init()
         self.start_stop_buttons()
         self.action_buttons()
+        self.results_panel()
         self.reset_button()
 
     def initUI(self) -> None:
@@ -40,6 +73,10 @@ class BlackJackUI(QMainWindow, BlackJackUIHandlers):
         self.info_label = QLabel("Enter player details to start the game:")
         self.layout.addWidget(self.info_label)
 
+        # Seats of the players and of the bank, each re-rendered only when its hand changes
+        self.table_widget = TableWidget()
+        self.layout.addWidget(self.table_widget)
+
     def player_init(self) -> None:
         # Form layout to enter player name and initial money
         self.player_form_layout = QFormLayout()
@@ -56,8 +93,27 @@ class BlackJackUI(QMainWindow, BlackJackUIHandlers):
         self.add_player_button.clicked.connect(self.add_player)
         self.layout.addWidget(self.add_player_button)
 
-        # List to display added players
-        self.player_list = QListWidget()
+        # Filter and sort order of the player list
+        self.player_filter_layout = QHBoxLayout()
+        self.player_filter_input = QLineEdit()
+        self.player_filter_input.setPlaceholderText("Filter players")
+        self.player_sort_input = QComboBox()
+        self.player_sort_input.addItems(["Added", *SORT_KEYS])
+        self.player_filter_layout.addWidget(self.player_filter_input)
+        self.player_filter_layout.addWidget(self.player_sort_input)
+        self.layout.addLayout(self.player_filter_layout)
+
+        # List to display added players, only the rows of players whose money or bet changed
+        # being updated
+        self.player_model = PlayerListModel(self.players)
+        self.player_filter = PlayerFilterModel(self.player_model)
+        self.player_filter_input.textChanged.connect(
+            self.player_filter.setFilterFixedString
+        )
+        self.player_sort_input.currentTextChanged.connect(self.player_filter.sort_by)
+        self.player_list = QListView()
+        self.player_list.setUniformItemSizes(True)
+        self.player_list.setModel(self.player_filter)
         self.layout.addWidget(self.player_list)
 
     def start_stop_buttons(self) -> None:
@@ -87,10 +143,38 @@ class BlackJackUI(QMainWindow, BlackJackUIHandlers):
         self.stand_button.setEnabled(False)  # Initially disabled
         self.action_layout.addWidget(self.hit_button)
         self.action_layout.addWidget(self.stand_button)
+        # Bust probability and recommended action, computed in the background
+        self.advice_label = QLabel()
+        self.action_layout.addWidget(self.advice_label)
         self.layout.addLayout(self.action_layout)
 
+    def results_panel(self) -> None:
+        # Outcome of every seat, shown at the end of each round
+        self.results_panel = ResultsPanel()
+        self.layout.addWidget(self.results_panel)
+
+        # Optional dealing of the next round, with the same bets, after a delay
+        self.auto_advance_layout = QHBoxLayout()
+        self.auto_advance_input = QCheckBox("Deal next round automatically after")
+        self.auto_advance_delay_input = QDoubleSpinBox()
+        self.auto_advance_delay_input.setRange(0.0, 60.0)
+        self.auto_advance_delay_input.setSuffix(" s")
+        self.auto_advance_delay_input.setValue(AUTO_ADVANCE_DELAY)
+        self.auto_advance_layout.addWidget(self.auto_advance_input)
+        self.auto_advance_layout.addWidget(self.auto_advance_delay_input)
+        self.layout.addLayout(self.auto_advance_layout)
+        self.auto_advance_timer = QTimer(self)
+        self.auto_advance_timer.setSingleShot(True)
+        self.auto_advance_timer.timeout.connect(self.auto_advance)
+
     def reset_button(self) -> None:
         # Button to reset the game
         self.reset_button = QPushButton("Reset Game")
         self.reset_button.clicked.connect(self.reset_game)
         self.layout.addWidget(self.reset_button)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Drops the pending advice and waits for the running one before the window goes away."""
+        self.advice_controller.cancel()
+        self.advice_controller.wait()
+        super().closeEvent(event)
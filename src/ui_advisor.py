@@ -0,0 +1,133 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from advisor import Advice, Advisor
+from card import Card
+
+# Time the UI waits for the exact advice before showing the quick one, in milliseconds.
+ADVICE_BUDGET = 50
+
+
+class _AdviceSignals(QObject):
+    """Carries the result of an AdviceTask back to the GUI thread."""
+
+    finished = Signal(int, object)
+
+
+class AdviceTask(QRunnable):
+    """Computes the exact advice for a snapshot of a hand on a pool thread."""
+
+    def __init__(
+        self,
+        advisor: Advisor,
+        generation: int,
+        state: tuple[int, bool, Card, tuple[int, ...]],
+        is_current,
+    ) -> None:
+        """
+        Initializes the task.
+
+        :param generation: Token of the request, sent back with the advice
+        :param state: Value, soft flag, up card and unseen composition of the hand
+        :param is_current: Tells whether generation is still the latest request, so that a
+            task whose state changed before it started does not compute anything
+        """
+        super().__init__()
+        self.advisor = advisor
+        self.generation = generation
+        self.state = state
+        self.is_current = is_current
+        self.signals = _AdviceSignals()
+
+    def run(self) -> None:
+        """
+        Computes the advice unless the request is outdated, and sends it. Nothing is sent when
+        the unseen cards can't finish the hands, late in a shoe, so the quick advice stays.
+        """
+        if not self.is_current(self.generation):
+            return
+        try:
+            advice = self.advisor.exact(*self.state)
+        except ValueError:
+            return
+        self.signals.finished.emit(self.generation, advice)
+
+
+class AdviceController(QObject):
+    """
+    Computes advice off the GUI thread. Each request gets a new generation token: queued tasks
+    of older requests are dropped, and the results of tasks that were already running are
+    ignored when they arrive. When the exact advice is not ready within the budget, the quick
+    advice is shown, then replaced by the exact one if it arrives before the state changes.
+    Late exact results still warm the calculator's cache for the next requests.
+
+    A computation that already started can't be interrupted: cancel and newer requests only
+    outdate its generation token, so its result is ignored, but it keeps the pool thread busy
+    until it ends. wait, e.g. when the window closes, blocks until then.
+    """
+
+    # Emitted with the Advice to show, or None when there is nothing to advise.
+    advice_ready = Signal(object)
+
+    def __init__(self, advisor: Advisor, budget: int = ADVICE_BUDGET) -> None:
+        """Initializes the controller, with a single pool thread as the advisor isn't thread safe."""
+        super().__init__()
+        self.advisor = advisor
+        self.generation = 0
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+        self._state: tuple | None = None
+        self._answered = True
+        self._budget = QTimer(self)
+        self._budget.setSingleShot(True)
+        self._budget.setInterval(budget)
+        self._budget.timeout.connect(self._show_quick)
+
+    def request(
+        self, value: int, soft: bool, upcard: Card, counts: tuple[int, ...]
+    ) -> None:
+        """Asks for the advice of a hand state, replacing any pending request."""
+        self._drop_pending()
+        self._state = (value, soft, upcard, counts)
+        self._answered = False
+        task = AdviceTask(self.advisor, self.generation, self._state, self.is_current)
+        task.signals.finished.connect(self._finished)
+        self.pool.start(task)
+        self._budget.start()
+
+    def cancel(self) -> None:
+        """
+        Drops the pending request, if any, and clears the advice shown. A task already
+        running still finishes, its result being ignored.
+        """
+        self._drop_pending()
+        if self._state is not None:
+            self.advice_ready.emit(None)
+        self._state = None
+        self._answered = True
+
+    def is_current(self, generation: int) -> bool:
+        """Tells whether generation is the latest request (called from the pool thread)."""
+        return generation == self.generation
+
+    def wait(self, timeout: int = -1) -> bool:
+        """Waits for the running task to finish, e.g. before the application exits."""
+        return self.pool.waitForDone(timeout)
+
+    def _drop_pending(self) -> None:
+        """Outdates the tasks of the previous requests."""
+        self.generation += 1
+        self.pool.clear()
+        self._budget.stop()
+
+    def _show_quick(self) -> None:
+        """Shows the quick advice when the exact one is late."""
+        if self._state is not None and not self._answered:
+            self.advice_ready.emit(self.advisor.quick(*self._state))
+
+    def _finished(self, generation: int, advice: Advice) -> None:
+        """Shows the exact advice of the latest request."""
+        if generation != self.generation:
+            return
+        self._budget.stop()
+        self._answered = True
+        self.advice_ready.emit(advice)
@@ -1,7 +1,9 @@
 # ui_handler.py
-from PySide6.QtWidgets import QMessageBox, QListWidgetItem, QLabel, QLineEdit
+from PySide6.QtWidgets import QMessageBox, QLabel, QLineEdit
 from PySide6.QtCore import Slot
-from game import BlackJackGame
+from advisor import Advice, unseen_composition
+from game import BlackJackGame, WIN, LOSS
+from instrumentation import timed
 from player import Player
 
 
@@ -18,13 +20,19 @@ class BlackJackUIHandlers:
                         self, "Duplicate Name", "Player name already exists."
                     )
                 else:
-                    self.players.append(Player(name=player_name, money=player_money))
+                    if self.ledger is not None:
+                        # A returning player gets the balance of their last session back.
+                        player_money = self.ledger.open_account(
+                            player_name, player_money
+                        )
+                    player = Player(name=player_name, money=player_money)
+                    player.ledger = self.ledger
+                    self.player_model.append(player)
                     self.info_label.setText(
                         f"Player {player_name} added with ${player_money}."
                     )
                     self.player_name_input.clear()
                     self.player_money_input.clear()
-                    self.update_player_list()
             else:
                 raise ValueError
         except ValueError:
@@ -35,11 +43,8 @@ class BlackJackUIHandlers:
             )
 
     def update_player_list(self) -> None:
-        """Updates the player list displayed in the UI."""
-        self.player_list.clear()
-        for player in self.players:
-            item = QListWidgetItem(f"{player.name}: ${player.money}")
-            self.player_list.addItem(item)
+        """Updates the rows of the player list whose money or bet changed."""
+        self.player_model.refresh()
 
     @Slot()
     def start_game(self) -> None:
@@ -52,6 +57,8 @@ class BlackJackUIHandlers:
             )
             return
         self.game = BlackJackGame(self.players)
+        self.game.instrumentation = self.instrumentation
+        self.game.ledger = self.ledger
         self.info_label.setText("Game started. Place your bets.")
         self.update_bet_layout()
         self.start_button.setEnabled(True)
@@ -75,72 +82,99 @@ class BlackJackUIHandlers:
         self.layout.addLayout(self.bet_layout)
 
     @Slot()
-    def start_round(self) -> None:
-        """Starts a new round after bets are placed."""
+    def start_round(self, automatic: bool = False) -> None:
+        """
+        Starts a new round after bets are placed.
+        When the round is dealt by auto-advance, an invalid bet stops it and is reported in the
+        results panel rather than in a dialog that would wait for the user.
+        """
         for player in self.players:
             try:
                 bet_amount = int(self.bet_inputs[player.name].text())
                 player.place_bet(bet_amount)
             except ValueError:
-                QMessageBox.warning(
-                    self, "Invalid Bet", f"Invalid bet amount for {player.name}."
-                )
+                message = f"Invalid bet amount for {player.name}."
+                if automatic:
+                    self.auto_advance_timer.stop()
+                    self.results_panel.add_line(f"Auto-advance stopped: {message}")
+                else:
+                    QMessageBox.warning(self, "Invalid Bet", message)
                 return
 
-        # Check if there are enough cards to continue the game
-        if len(self.game.deck.cards) < (2 * (len(self.players) + 1)):
-            QMessageBox.warning(
-                self,
-                "Not Enough Cards",
-                "Not enough cards to continue the game. The game will be reset.",
-            )
-            self.reset_game()
-            return
-
+        self.auto_advance_timer.stop()
+        self.results_panel.clear()
+        self.start_button.setEnabled(False)
         self.game.start_round()
         self.current_player_index = 0
         self.update_info()
         self.update_player_list()
         self.enable_player_actions()
 
+    @Slot()
+    def auto_advance(self) -> None:
+        """Deals the next round once the auto-advance delay is over."""
+        self.start_round(automatic=True)
+
     def enable_player_actions(self) -> None:
         """Enables the hit and stand buttons for the current player."""
         self.hit_button.setEnabled(True)
         self.stand_button.setEnabled(True)
-        self.update_info()
+        self.update_advice()
 
     def disable_player_actions(self) -> None:
         """Disables the hit and stand buttons."""
         self.hit_button.setEnabled(False)
         self.stand_button.setEnabled(False)
+        self.advice_controller.cancel()
+
+    def update_advice(self) -> None:
+        """
+        Asks for the advice of the current player's hand, given the cards they can't see: those
+        left in the shoe and the bank's hole card.
+        """
+        hand = self.game.players[self.current_player_index].hand
+        bank_cards = self.game.bank.hand.cards
+        self.advice_controller.request(
+            hand.calculate_value(),
+            hand.is_soft(),
+            bank_cards[0],
+            unseen_composition(self.game.deck.cards, bank_cards[1:]),
+        )
+
+    def show_advice(self, advice: Advice | None) -> None:
+        """Shows the advice computed for the current player, or clears it."""
+        self.advice_label.setText("" if advice is None else str(advice))
 
     @Slot()
+    @timed("ui_hit")
     def hit(self) -> None:
         """Handles the hit action for the current player."""
         player = self.game.players[self.current_player_index]
-        player.hand.add_card(self.game.deck.deal())
-        self.update_info()
+        self.game.hit(self.current_player_index)
+        self.table_widget.refresh_seat(self.current_player_index)
         if player.hand.is_busted():
             self.disable_player_actions()
-            QMessageBox.information(self, "Bust", f"{player.name} busts!")
-            player.lose_bet()
+            self.info_label.setText(f"{player.name} busts!")
             self.next_player_turn()
+        else:
+            self.update_advice()
 
     @Slot()
+    @timed("ui_stand")
     def stand(self) -> None:
         """Handles the stand action for the current player."""
+        self.game.stand(self.current_player_index)
         self.disable_player_actions()
         self.next_player_turn()
 
     def next_player_turn(self) -> None:
         """Moves to the next player's turn."""
         self.current_player_index += 1
+        self.table_widget.set_current(self.current_player_index)
         if self.current_player_index < len(self.game.players):
             self.enable_player_actions()
-            self.update_info()  # Update info without showing all bank cards
         else:
             self.bank_turn()
-            self.update_info(True)
 
     def bank_turn(self) -> None:
         """Handles the bank's turn."""
@@ -150,52 +184,48 @@ class BlackJackUIHandlers:
             return
 
         self.game.bank_turn()
-        self.update_info(True)  # Show all bank cards after bank's turn
         self.determine_winner()
 
     def determine_winner(self) -> None:
-        """Determines the winner and updates the UI."""
-        self.game.determine_winner()
+        """
+        Settles the bets, shows every seat's outcome in the results panel and, in auto-advance
+        mode, deals the next round after the configured delay.
+        """
+        bank_busted = self.game.bank.hand.is_busted()
+        outcomes = self.game.determine_winner()
         self.update_info(True)  # Show all bank cards
 
         self.update_player_list()  # Update player money in the list
 
-        for player in self.game.players:
-            player_value = player.hand.calculate_value()
-            bank_value = self.game.bank.hand.calculate_value()
-
+        results = []
+        for player, outcome in zip(self.game.players, outcomes):
             if player.hand.is_busted():
-                message = f"{player.name} busts!"
-            elif self.game.bank.hand.is_busted():
-                message = f"{player.name} wins! Bank busts!"
-            elif player_value > bank_value:
-                message = f"{player.name} wins!"
-            elif player_value < bank_value:
-                message = f"{player.name} loses!"
+                results.append(f"{player.name} busts!")
+            elif outcome == WIN and bank_busted:
+                results.append(f"{player.name} wins! Bank busts!")
+            elif outcome == WIN:
+                results.append(f"{player.name} wins!")
+            elif outcome == LOSS:
+                results.append(f"{player.name} loses!")
             else:
-                message = f"{player.name} pushes!"  # when both values are equal
-
-            QMessageBox.information(self, "Result", message)
+                results.append(f"{player.name} pushes!")  # when both values are equal
+        self.results_panel.show_results(results)
 
-        self.reset_game_prompt()
-
-    @Slot()
-    def reset_game_prompt(self) -> None:
-        """Prompts the user to reset the game after a round."""
-        reply = QMessageBox.question(
-            self,
-            "Reset Game",
-            "Do you want to reset the game?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No,
-        )
-        if reply == QMessageBox.Yes:
-            self.reset_game()
+        self.start_button.setEnabled(True)
+        if self.auto_advance_input.isChecked():
+            self.auto_advance_timer.start(
+                round(self.auto_advance_delay_input.value() * 1000)
+            )
 
     @Slot()
     def reset_game(self) -> None:
-        """Resets the game to its initial state."""
-        self.players.clear()
+        """Resets the game to its initial state, committing the ledger's pending transactions."""
+        if self.ledger is not None:
+            self.ledger.commit()
+        self.auto_advance_timer.stop()
+        self.advice_controller.cancel()
+        self.results_panel.clear()
+        self.player_model.clear()
         self.current_player_index = -1
         self.info_label.setText("Enter player details to start the game.")
         self.start_button.setEnabled(False)
@@ -215,33 +245,17 @@ class BlackJackUIHandlers:
             if widget is not None:
                 widget.deleteLater()
         self.bet_inputs.clear()
-        self.update_player_list()
+        self.table_widget.clear()
 
+    @timed("ui_update_info")
     def update_info(self, show_all_bank_cards: bool = False) -> None:
-        """Updates the information label with the current game state."""
-        info_text = "<html><body>"
-        for index, player in enumerate(self.game.players):
-            player_hand = ", ".join(map(str, player.hand.cards))
-            player_value = player.hand.calculate_value()
-            bold_name = f"<b>{player.name}</b>"
-            current_indicator = (
-                "<span style='color:red'> (Current Player)</span>"
-                if index == self.current_player_index
-                else ""
-            )
-            info_text += f"{bold_name}{current_indicator}<br>{player_hand} (Value: {player_value})<br><br>"
-
-        if show_all_bank_cards:
-            bank_hand = ", ".join(map(str, self.game.bank.hand.cards))
-            bank_value = self.game.bank.hand.calculate_value()
-        else:
-            bank_hand = (
-                ", ".join(map(str, self.game.bank.hand.cards[:1])) + ", [Hidden]"
-            )
-            bank_value = self.game.bank.hand.cards[0].value()
-
-        info_text += f"<b>Bank</b><br>{bank_hand} (Value: {bank_value})"
-
-        info_text += "</body></html>"
-
-        self.info_label.setText(info_text)
+        """
+        Updates the table with the current game state.
+        Only the seats whose hand or turn indicator changed are re-rendered.
+        """
+        self.table_widget.refresh(
+            self.game.players,
+            self.game.bank,
+            self.current_player_index,
+            show_all_bank_cards,
+        )
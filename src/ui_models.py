@@ -0,0 +1,135 @@
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+)
+
+from player import Player
+
+# Roles giving the raw player fields, used to sort and filter the roster.
+NAME_ROLE = Qt.UserRole + 1
+MONEY_ROLE = Qt.UserRole + 2
+BET_ROLE = Qt.UserRole + 3
+
+# Sort keys offered by the UI, with their role and order.
+SORT_KEYS = {
+    "Name": (NAME_ROLE, Qt.AscendingOrder),
+    "Money": (MONEY_ROLE, Qt.DescendingOrder),
+    "Bet": (BET_ROLE, Qt.DescendingOrder),
+}
+
+
+class PlayerListModel(QAbstractListModel):
+    """
+    Represents the roster of players as a list model.
+    The model keeps the money and bet it last reported for each player, so that refresh only
+    notifies the views of the rows that changed.
+    """
+
+    def __init__(self, players: list[Player]) -> None:
+        """
+        Initializes the model over players.
+        The list is shared with the caller, but has to be modified through append and clear.
+        """
+        super().__init__()
+        self.players = players
+        self._shown = [self._fields(player) for player in players]
+
+    @staticmethod
+    def _fields(player: Player) -> tuple[int, int]:
+        """Returns the fields of a player that change during the game."""
+        return player.money, player.bet
+
+    def rowCount(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> int:
+        """Returns the number of players (the model has no children)."""
+        return 0 if parent.isValid() else len(self.players)
+
+    def data(
+        self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.DisplayRole
+    ):
+        """Returns the text of a player's row, or one of their fields for the custom roles."""
+        if not index.isValid():
+            return None
+        player = self.players[index.row()]
+        if role == Qt.DisplayRole:
+            text = f"{player.name}: ${player.money}"
+            return f"{text} (bet ${player.bet})" if player.bet else text
+        if role == NAME_ROLE:
+            return player.name
+        if role == MONEY_ROLE:
+            return player.money
+        if role == BET_ROLE:
+            return player.bet
+        return None
+
+    def append(self, player: Player) -> None:
+        """Adds a player at the end of the roster."""
+        row = len(self.players)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.players.append(player)
+        self._shown.append(self._fields(player))
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        """Removes every player."""
+        self.beginResetModel()
+        self.players.clear()
+        self._shown.clear()
+        self.endResetModel()
+
+    def refresh(self) -> None:
+        """
+        Notifies the views of the players whose money or bet changed since the last refresh,
+        one signal per run of consecutive changed rows.
+        """
+        if len(self.players) != len(self._shown):
+            # The list was modified behind the model's back.
+            self.beginResetModel()
+            self._shown = [self._fields(player) for player in self.players]
+            self.endResetModel()
+            return
+        first = None
+        for row, player in enumerate(self.players):
+            fields = self._fields(player)
+            if fields != self._shown[row]:
+                self._shown[row] = fields
+                if first is None:
+                    first = row
+            elif first is not None:
+                self._changed(first, row - 1)
+                first = None
+        if first is not None:
+            self._changed(first, len(self.players) - 1)
+
+    def _changed(self, first: int, last: int) -> None:
+        """Emits dataChanged for the rows from first to last included."""
+        self.dataChanged.emit(
+            self.index(first),
+            self.index(last),
+            [Qt.DisplayRole, MONEY_ROLE, BET_ROLE],
+        )
+
+
+class PlayerFilterModel(QSortFilterProxyModel):
+    """Sorts the roster and filters it on the players' names, keeping both up to date."""
+
+    def __init__(self, model: PlayerListModel) -> None:
+        """Initializes the proxy over model, in the order the players were added."""
+        super().__init__()
+        self.setSourceModel(model)
+        self.setFilterRole(NAME_ROLE)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def sort_by(self, key: str) -> None:
+        """Sorts the roster by one of SORT_KEYS, or in the order of addition for any other key."""
+        if key not in SORT_KEYS:
+            self.sort(-1)
+            return
+        role, order = SORT_KEYS[key]
+        self.setSortRole(role)
+        self.sort(0, order)
@@ -0,0 +1,162 @@
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from card import Card
+from hand import Hand
+from player import Player, Bank
+
+
+class SeatWidget(QLabel):
+    """
+    Displays the hand of one seat.
+    The label is only re-rendered when what it shows changed, and the text of the cards is
+    kept from one render to the next, so that only newly dealt cards are converted.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty seat."""
+        super().__init__()
+        self._state: tuple | None = None
+        self._source: list[Card] | None = None
+        self._cards: list[str] = []
+
+    def _changed(self, owner: Player | Bank, cards: list[Card], flag: bool) -> bool:
+        """
+        Tells whether the seat has to be re-rendered to show the cards of owner with flag
+        (turn indicator or face up bank cards), and records what is shown.
+        """
+        state = self._state
+        if (
+            state is not None
+            and state[0] is owner
+            and state[1] is cards
+            and state[2:] == (len(cards), flag)
+        ):
+            return False
+        self._state = (owner, cards, len(cards), flag)
+        return True
+
+    def _card_labels(self, hand: Hand) -> list[str]:
+        """Returns the text of the cards of hand, converting only the new ones."""
+        if hand.cards is not self._source or len(hand.cards) < len(self._cards):
+            self._source = hand.cards
+            self._cards = []
+        for card in hand.cards[len(self._cards) :]:
+            self._cards.append(str(card))
+        return self._cards
+
+    def show_player(self, player: Player, current: bool) -> None:
+        """Shows a player's hand, highlighting the player whose turn it is."""
+        hand = player.hand
+        if not self._changed(player, hand.cards, current):
+            return
+        current_indicator = (
+            "<span style='color:red'> (Current Player)</span>" if current else ""
+        )
+        cards = ", ".join(self._card_labels(hand))
+        self.setText(
+            f"<b>{player.name}</b>{current_indicator}<br>{cards} "
+            f"(Value: {hand.calculate_value()})"
+        )
+
+    def show_bank(self, bank: Bank, show_all_cards: bool) -> None:
+        """Shows the bank's hand, with only its first card face up unless show_all_cards."""
+        hand = bank.hand
+        if not self._changed(bank, hand.cards, show_all_cards):
+            return
+        labels = self._card_labels(hand)
+        if show_all_cards:
+            cards = ", ".join(labels)
+            value = hand.calculate_value()
+        else:
+            cards = ", ".join(labels[:1]) + ", [Hidden]"
+            value = hand.cards[0].value()
+        self.setText(f"<b>Bank</b><br>{cards} (Value: {value})")
+
+
+class TableWidget(QWidget):
+    """
+    Displays a seat widget per player and one for the bank.
+    Refreshing the table only re-renders the seats that changed, and refresh_seat and
+    set_current touch a single seat or two, whatever the number of players.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the table without seats."""
+        super().__init__()
+        self.layout = QVBoxLayout(self)
+        self.seats: list[SeatWidget] = []
+        self.bank_seat = SeatWidget()
+        self.layout.addWidget(self.bank_seat)
+        self.bank_seat.setVisible(False)
+        self.players: list[Player] = []
+        self.current = -1
+
+    def refresh(
+        self,
+        players: list[Player],
+        bank: Bank,
+        current: int,
+        show_all_bank_cards: bool = False,
+    ) -> None:
+        """Shows every seat of a game, re-rendering those that changed."""
+        self._set_seat_count(len(players))
+        self.players = players
+        self.current = current
+        for index, (seat, player) in enumerate(zip(self.seats, players)):
+            seat.show_player(player, index == current)
+        self.bank_seat.show_bank(bank, show_all_bank_cards)
+        if self.bank_seat.isHidden():
+            self.bank_seat.setVisible(True)
+
+    def refresh_seat(self, index: int) -> None:
+        """Re-renders the seat of the player at index, e.g. after they were dealt a card."""
+        self.seats[index].show_player(self.players[index], index == self.current)
+
+    def set_current(self, current: int) -> None:
+        """Moves the turn indicator to the player at current (past the last seat for none)."""
+        previous, self.current = self.current, current
+        for index in (previous, current):
+            if 0 <= index < len(self.seats):
+                self.refresh_seat(index)
+
+    def clear(self) -> None:
+        """Removes every seat."""
+        self._set_seat_count(0)
+        self.players = []
+        self.current = -1
+        self.bank_seat.setVisible(False)
+
+    def _set_seat_count(self, count: int) -> None:
+        """Adds or removes seat widgets so that there are count of them before the bank."""
+        while len(self.seats) < count:
+            seat = SeatWidget()
+            self.layout.insertWidget(len(self.seats), seat)
+            self.seats.append(seat)
+        while len(self.seats) > count:
+            seat = self.seats.pop()
+            self.layout.removeWidget(seat)
+            seat.deleteLater()
+
+
+class ResultsPanel(QLabel):
+    """Displays the outcome of every seat at the end of a round, without blocking the UI."""
+
+    def __init__(self) -> None:
+        """Initializes the panel, hidden until a round ends."""
+        super().__init__()
+        self.setVisible(False)
+
+    def show_results(self, results: list[str]) -> None:
+        """Shows one line per seat."""
+        self.setText("<b>Round results</b><br>" + "<br>".join(results))
+        self.setVisible(True)
+
+    def add_line(self, line: str) -> None:
+        """Adds a line below the results shown, e.g. why the next round was not dealt."""
+        self.setText(f"{self.text()}<br>{line}")
+        self.setVisible(True)
+
+    def clear(self) -> None:
+        """Hides the results of the last round."""
+        if not self.isHidden():
+            self.setVisible(False)
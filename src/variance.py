@@ -0,0 +1,369 @@
+import random
+import time
+from statistics import NormalDist
+
+from card import CARDS, Card
+from game import BlackJackGame
+from player import Player
+from simulation import Policy, dealer_policy, derive_seed
+
+# Hi-Lo tag of each rank, in the order of RANKS: +1 for 2 to 6, 0 for 7 to 9, -1 for tens
+# and aces. The tags of a full shoe sum to 0, so the tag of any card of a fresh shuffle has
+# a mean of exactly 0, which makes them a control variate of known mean.
+HI_LO = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1)
+
+# Confidence level of the intervals.
+CONFIDENCE = 0.95
+
+
+class RoundShoe:
+    """
+    A shoe freshly shuffled for every round, shared by the games of several configurations,
+    so that they are all dealt the same cards (common random numbers).
+    Cards are drawn at random from the shoe the first time a game reaches them, then kept in
+    order for the other games, so a round only pays for the cards it deals.
+    """
+
+    def __init__(self, decks: int = 1, rng: random.Random | None = None) -> None:
+        """
+        Initializes the shoe.
+
+        :param decks: Number of 52 card decks in the shoe
+        :param rng: Random generator used to draw the cards
+        """
+        if decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        self.rng = rng if rng is not None else random.Random()
+        self._full = list(CARDS) * decks
+        self._pool: list[Card] = []
+        self.order: list[Card] = []
+
+    def new_round(self) -> None:
+        """Puts every card back in the shoe, the next round being dealt a new order."""
+        self._pool = self._full[:]
+        self.order = []
+
+    def card(self, position: int) -> Card:
+        """Returns the card at a position of the round's order, drawing it if needed."""
+        order = self.order
+        pool = self._pool
+        random_ = self.rng.random
+        while position >= len(order):
+            if not pool:
+                raise ValueError("The shoe ran out of cards during a round")
+            index = int(random_() * len(pool))
+            pool[index], pool[-1] = pool[-1], pool[index]
+            order.append(pool.pop())
+        return order[position]
+
+    def __len__(self) -> int:
+        """Returns the number of cards in the shoe."""
+        return len(self._full)
+
+
+class SharedDeck:
+    """
+    The view of a game on a RoundShoe, which the game deals from in place of its own shoe.
+
+    An antithetic view exchanges the first two cards of the first seat with the two cards of
+    the bank, so that the seat gets the hand the bank had and the other way around: a round
+    and its antithetic round have strongly opposed outcomes for that seat. The other cards are
+    dealt in the same order.
+    """
+
+    # The round shoe is reset by its driver, never by the game.
+    needs_shuffle = False
+
+    def __init__(self, shoe: RoundShoe, seats: int = 1) -> None:
+        """
+        Initializes the view at the first card of the shoe.
+
+        :param seats: Number of seats of the game, which start_round deals before the bank
+        """
+        self.shoe = shoe
+        self.position = 0
+        self.antithetic = False
+        self._bank = 2 * seats
+
+    def rewind(self, antithetic: bool = False) -> None:
+        """Goes back to the first card of the round, with the antithetic order or not."""
+        self.position = 0
+        self.antithetic = antithetic
+
+    def shuffle(self) -> None:
+        """Goes back to the first card of the round, see rewind."""
+        self.position = 0
+
+    def begin_round(self) -> None:
+        """Does nothing, the round starts at the position rewind set."""
+
+    def deal(self) -> Card:
+        """Deals the next card of the round."""
+        position = self.position
+        self.position += 1
+        if self.antithetic:
+            if position < 2:
+                position += self._bank
+            elif self._bank <= position < self._bank + 2:
+                position -= self._bank
+        return self.shoe.card(position)
+
+    def __len__(self) -> int:
+        """Returns the number of cards left in the shoe."""
+        return len(self.shoe) - self.position
+
+
+class Estimate:
+    """
+    The mean of independent samples with its confidence interval, from running sums.
+    With control, every sample comes with a control value of mean 0, and the mean is adjusted
+    by the regression of the samples on the controls, which removes the share of their variance
+    the controls explain.
+    """
+
+    def __init__(self, control: bool = False, confidence: float = CONFIDENCE) -> None:
+        """Initializes an empty estimate."""
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be between 0 and 1")
+        self.control = control
+        self.confidence = confidence
+        self.samples = 0
+        self._sum = 0.0
+        self._squares = 0.0
+        self._control_sum = 0.0
+        self._control_squares = 0.0
+        self._products = 0.0
+
+    def add(self, sample: float, control: float = 0.0) -> None:
+        """Adds a sample and its control value."""
+        self.samples += 1
+        self._sum += sample
+        self._squares += sample * sample
+        self._control_sum += control
+        self._control_squares += control * control
+        self._products += sample * control
+
+    def _moments(self) -> tuple[float, float, float, float, float]:
+        """Returns the means of the samples and controls, their variances and covariance."""
+        n = self.samples
+        mean = self._sum / n
+        control_mean = self._control_sum / n
+        if n < 2:
+            return mean, control_mean, 0.0, 0.0, 0.0
+        variance = (self._squares - n * mean * mean) / (n - 1)
+        control_variance = (self._control_squares - n * control_mean**2) / (n - 1)
+        covariance = (self._products - n * mean * control_mean) / (n - 1)
+        return mean, control_mean, max(variance, 0.0), control_variance, covariance
+
+    @property
+    def beta(self) -> float:
+        """Returns the regression coefficient of the samples on the controls."""
+        if not self.control or not self.samples:
+            return 0.0
+        _, _, _, control_variance, covariance = self._moments()
+        return covariance / control_variance if control_variance > 0 else 0.0
+
+    @property
+    def mean(self) -> float:
+        """Returns the estimated mean, adjusted with the controls if enabled."""
+        if not self.samples:
+            return 0.0
+        mean, control_mean, _, _, _ = self._moments()
+        return mean - self.beta * control_mean
+
+    @property
+    def variance(self) -> float:
+        """Returns the variance of one sample, less the share explained by the controls."""
+        if not self.samples:
+            return 0.0
+        _, _, variance, _, covariance = self._moments()
+        return max(variance - self.beta * covariance, 0.0)
+
+    @property
+    def half_width(self) -> float:
+        """Returns the half width of the confidence interval of the mean."""
+        if self.samples < 2:
+            return float("inf")
+        z = NormalDist().inv_cdf((1 + self.confidence) / 2)
+        return z * (self.variance / self.samples) ** 0.5
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        """Returns the confidence interval of the mean."""
+        return self.mean - self.half_width, self.mean + self.half_width
+
+    def __str__(self) -> str:
+        """Returns the mean and its interval, as percentages."""
+        return (
+            f"{self.mean:+.4%} ± {self.half_width:.4%} "
+            f"({self.confidence:.0%} confidence, {self.samples} samples)"
+        )
+
+
+class _Table:
+    """A game of one configuration, dealt from a RoundShoe, playing one round at a time."""
+
+    def __init__(self, policy: Policy, players: int, shoe: RoundShoe) -> None:
+        """Initializes the table, rule-based policies being compiled first."""
+        if hasattr(policy, "compile"):
+            policy = policy.compile()
+        self.policy = policy
+        self.seats = [Player(f"Seat {i + 1}", 10**12) for i in range(players)]
+        self.game = BlackJackGame(self.seats)
+        self.deck = self.game.deck = SharedDeck(shoe, players)
+
+    def play(self, antithetic: bool = False) -> tuple[float, float]:
+        """
+        Plays a round from the first card of the shoe's order and returns the average return
+        of the seats per unit bet, and their average Hi-Lo tag (the tags of their first two
+        cards less the tag of the bank's up card), the control value of the round.
+        """
+        self.deck.rewind(antithetic)
+        game, policy = self.game, self.policy
+        for player in self.seats:
+            player.place_bet(1)
+        game.start_round()
+
+        upcard = game.bank.hand.cards[0]
+        tags = 0
+        all_busted = True
+        for index, player in enumerate(self.seats):
+            hand = player.hand
+            first, second = hand.cards
+            tags += HI_LO[first.rank_index] + HI_LO[second.rank_index]
+            while not hand.is_busted() and policy(hand, upcard):
+                game.hit(index)
+            if not hand.is_busted():
+                all_busted = False
+        if not all_busted:
+            game.bank_turn()
+
+        seats = len(self.seats)
+        control = tags / seats - HI_LO[upcard.rank_index]
+        return sum(game.determine_winner()) / seats, control
+
+
+class Comparison:
+    """The estimated returns of two configurations and of their difference."""
+
+    def __init__(
+        self, first: Estimate, second: Estimate, delta: Estimate, rounds: int
+    ) -> None:
+        """
+        Initializes the comparison.
+
+        :param first: Return per unit bet of the first configuration
+        :param second: Return per unit bet of the second configuration
+        :param delta: Return of the first configuration less the return of the second one
+        :param rounds: Rounds played by each configuration
+        """
+        self.first = first
+        self.second = second
+        self.delta = delta
+        self.rounds = rounds
+        self.elapsed = 0.0
+
+    def __str__(self) -> str:
+        """Returns the three estimates, one per line."""
+        return "\n".join(
+            (f"first:  {self.first}", f"second: {self.second}", f"delta:  {self.delta}")
+        )
+
+
+def _sample(
+    tables: list[_Table], shoes: list[RoundShoe], antithetic: bool
+) -> list[tuple[float, float]]:
+    """
+    Plays one sample with every table: a round, or a round and its antithetic round averaged
+    together with antithetic. Returns the return and control value of every table.
+    """
+    for shoe in shoes:
+        shoe.new_round()
+    samples = []
+    for table in tables:
+        result, control = table.play()
+        if antithetic:
+            other_result, other_control = table.play(antithetic=True)
+            result = (result + other_result) / 2
+            control = (control + other_control) / 2
+        samples.append((result, control))
+    return samples
+
+
+def evaluate(
+    rounds: int,
+    players: int = 1,
+    policy: Policy = dealer_policy,
+    seed: int | None = None,
+    decks: int = 1,
+    antithetic: bool = False,
+    control: bool = False,
+    confidence: float = CONFIDENCE,
+) -> Estimate:
+    """
+    Estimates the return per unit bet of a policy, every round being dealt from a freshly
+    shuffled shoe. The house edge is the opposite of that return.
+
+    :param rounds: Number of rounds to play, in antithetic pairs with antithetic
+    :param antithetic: Whether to play every shoe in both orders of SharedDeck, as one sample
+    :param control: Whether to adjust the estimate with the Hi-Lo control variate
+    """
+    shoe = RoundShoe(decks, random.Random(seed))
+    table = _Table(policy, players, shoe)
+    estimate = Estimate(control, confidence)
+    for _ in range(rounds // 2 if antithetic else rounds):
+        (sample,) = _sample([table], [shoe], antithetic)
+        estimate.add(*sample)
+    return estimate
+
+
+def compare(
+    rounds: int,
+    first: Policy,
+    second: Policy,
+    players: int = 1,
+    seed: int | None = None,
+    decks: int = 1,
+    common: bool = True,
+    antithetic: bool = False,
+    control: bool = False,
+    confidence: float = CONFIDENCE,
+) -> Comparison:
+    """
+    Estimates the returns of two policies and their difference.
+
+    With common random numbers (common), both policies are dealt the same shoe every round,
+    so the noise of the shuffles cancels out of the difference, which then needs far fewer
+    rounds for the same interval than with independent shoes.
+
+    :param rounds: Number of rounds played by each policy, in antithetic pairs with antithetic
+    :param common: Whether both policies are dealt the same shoes, rather than independent ones
+    :param antithetic: Whether to play every shoe in both orders of SharedDeck, as one sample
+    :param control: Whether to adjust the estimates with the Hi-Lo control variate
+    """
+    base = seed if seed is not None else random.randrange(2**32)
+    if common:
+        shoes = [RoundShoe(decks, random.Random(derive_seed(base, 0)))] * 2
+    else:
+        shoes = [
+            RoundShoe(decks, random.Random(derive_seed(base, stream)))
+            for stream in range(2)
+        ]
+    tables = [
+        _Table(policy, players, shoe) for policy, shoe in zip((first, second), shoes)
+    ]
+    estimates = [Estimate(control, confidence) for _ in range(3)]
+
+    start = time.perf_counter()
+    for _ in range(rounds // 2 if antithetic else rounds):
+        (result, control_value), (other, other_control) = _sample(
+            tables, shoes[: 1 if common else 2], antithetic
+        )
+        estimates[0].add(result, control_value)
+        estimates[1].add(other, other_control)
+        # Common shoes share their control value, independent ones combine theirs.
+        delta_control = control_value if common else control_value - other_control
+        estimates[2].add(result - other, delta_control)
+    comparison = Comparison(*estimates, rounds)
+    comparison.elapsed = time.perf_counter() - start
+    return comparison
@@ -0,0 +1,38 @@
+from src.advisor import Advisor, bust_probability, unseen_composition
+from src.card import Card
+from src.dealer import full_composition
+from src.ev import EVCalculator, HIT, STAND
+
+
+def test_bust_probability():
+    counts = full_composition(1)
+    assert bust_probability(20, False, counts) == 48 / 52
+    assert bust_probability(11, False, counts) == 0.0
+    assert bust_probability(16, False, counts) == 32 / 52
+    assert bust_probability(16, True, counts) == 0.0
+
+
+def test_unseen_composition():
+    shoe = [Card("Hearts", "A"), Card("Spades", "K")]
+    counts = unseen_composition(shoe, [Card("Clubs", "Q")])
+    assert counts == (1, 0, 0, 0, 0, 0, 0, 0, 0, 2)
+
+
+def test_exact_matches_calculator():
+    calculator = EVCalculator()
+    advisor = Advisor(calculator=calculator)
+    upcard = Card("Spades", "10")
+    counts = full_composition(1)
+    advice = advisor.exact(16, False, upcard, counts)
+    stand, hit = calculator.evaluate(16, False, upcard, counts)
+    assert (advice.stand_ev, advice.hit_ev) == (stand, hit)
+    assert advice.action == (HIT if hit > stand else STAND)
+    assert advice.exact
+    assert "recommended" in str(advice)
+
+
+def test_quick_without_table():
+    advice = Advisor().quick(20, False, Card("Spades", "10"), full_composition(1))
+    assert advice.action is None
+    assert not advice.exact
+    assert str(advice) == "Bust if you hit: 92%"
@@ -0,0 +1,135 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.batch import (
+    BatchEngine,
+    hand_values,
+    settle,
+    settle_seats,
+    simulate_batch,
+    stand_policy,
+)
+from src import ledger
+from src.game import BlackJackGame, LOSS, PUSH, WIN
+from src.ledger import Ledger
+from src.player import Player
+from src.simulation import simulate
+
+
+def test_hand_values_soft_aces():
+    hard = np.array([11, 12, 7, 21])
+    aces = np.array([True, True, False, False])
+    values, soft = hand_values(hard, aces)
+    assert values.tolist() == [21, 12, 7, 21]
+    assert soft.tolist() == [True, False, False, False]
+
+
+def test_settle_rules():
+    values = np.array([22, 20, 17, 18, 19])
+    busted = values > 21
+    outcomes = settle(values, busted, np.array(18), np.array(False))
+    assert outcomes.tolist() == [LOSS, WIN, LOSS, PUSH, WIN]
+
+    outcomes = settle(values, busted, np.array(25), np.array(True))
+    assert outcomes.tolist() == [LOSS, WIN, WIN, WIN, WIN]
+
+
+def test_settle_seats_matches_game():
+    tables = []
+    for _ in range(2):
+        players = [Player(f"Seat {i + 1}", 1000) for i in range(300)]
+        game = BlackJackGame(players, random.Random(7), decks=50)
+        for i, player in enumerate(players):
+            player.place_bet(i % 7 + 1)
+        game.start_round()
+        for i, player in enumerate(players):
+            while player.hand.calculate_value() < 12 + i % 8:
+                game.hit(i)
+        game.bank_turn()
+        tables.append((players, game))
+
+    (players, game), (batch_players, batch_game) = tables
+    expected = game.determine_winner()
+    values = np.array([player.hand.calculate_value() for player in batch_players])
+    bets = np.array([player.bet for player in batch_players])
+    bank_value = batch_game.bank.hand.calculate_value()
+    outcomes = settle_seats(
+        batch_players, values, values > 21, bets, bank_value, bank_value > 21
+    )
+    assert outcomes.tolist() == expected
+    assert [player.money for player in batch_players] == [
+        player.money for player in players
+    ]
+    assert all(player.bet == 0 for player in batch_players)
+
+
+def test_settle_seats_records_ledgers(tmp_path):
+    books = [Ledger(str(tmp_path / f"ledger{i}.db")) for i in range(2)]
+    players = [Player(f"Seat {i + 1}", 100) for i in range(40)]
+    for i, player in enumerate(players):
+        player.ledger = books[i % 2]
+    # Seats without a ledger are settled all the same.
+    players[-1].ledger = None
+    game = BlackJackGame(players, random.Random(3), decks=8)
+    for i, player in enumerate(players):
+        player.place_bet(i % 5 + 1)
+    game.start_round()
+    values = np.array([player.hand.calculate_value() for player in players])
+    bets = np.array([player.bet for player in players])
+    settle_seats(players, values, values > 21, bets, 18, False)
+
+    for player in players[:-1]:
+        book = player.ledger
+        transactions = book.transactions(player.name)
+        assert len(transactions) == 2
+        assert transactions[0][0] == ledger.BET
+        assert 100 + transactions[-1][1] == player.money == transactions[-1][2]
+        assert book.balance(player.name) == player.money
+    for book in books:
+        book.close()
+
+
+def test_settle_seats_needs_a_player_per_seat():
+    players = [Player("A", 100), Player("B", 100)]
+    values = np.array([18, 20, 15])
+    with pytest.raises(ValueError):
+        settle_seats(players, values, values > 21, np.array([10, 10, 10]), 19, False)
+    assert [player.money for player in players] == [100, 100]
+
+
+def test_engine_round_state():
+    engine = BatchEngine(500, seats=3, seed=1)
+    outcomes, busted, bank_busted = engine.play_round()
+    assert outcomes.shape == (500, 3)
+    bank_values, _ = hand_values(engine.bank_hard, engine.bank_aces)
+    all_busted = busted.all(axis=1)
+    assert (bank_values[~all_busted] >= 17).all()
+    assert (bank_busted == (bank_values > 21)).all()
+
+
+def test_simulate_batch_counts_every_hand():
+    result = simulate_batch(2500, players=2, seed=3, tables=1000)
+    assert result.rounds == 2500
+    assert result.wins + result.losses + result.pushes == 5000
+    assert result.net == result.wins - result.losses
+
+
+def test_simulate_batch_is_reproducible():
+    first = simulate_batch(2000, seed=5, tables=500)
+    second = simulate_batch(2000, seed=5, tables=500)
+    assert (first.wins, first.losses, first.net) == (
+        second.wins,
+        second.losses,
+        second.net,
+    )
+
+
+def test_simulate_batch_matches_object_model():
+    batch = simulate_batch(50000, seed=11)
+    objects = simulate(20000, seed=11)
+    assert abs(batch.house_edge - objects.house_edge) < 0.04
+
+    batch = simulate_batch(50000, policy=stand_policy, seed=11)
+    assert batch.busts == 0
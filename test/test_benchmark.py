@@ -0,0 +1,27 @@
+from src.benchmark import compare, run_benchmarks
+
+
+def _results(**rates):
+    return {
+        "version": 1,
+        "results": {
+            name: {"unit": "calls", "ops_per_second": rate}
+            for name, rate in rates.items()
+        },
+    }
+
+
+def test_run_benchmarks_format():
+    document = run_benchmarks("hand_value_2_cards", repeats=1)
+    assert document["version"] == 1
+    result = document["results"]["hand_value_2_cards"]
+    assert result["unit"] == "calls"
+    assert result["ops_per_second"] >= result["median_ops_per_second"] > 0
+
+
+def test_compare_flags_regressions():
+    rows = compare(_results(a=80, b=95, c=200), _results(a=100, b=100, d=1), 0.1)
+    assert [row["name"] for row in rows] == ["a", "b"]
+    assert rows[0]["regression"] is True
+    assert rows[0]["ratio"] == 0.8
+    assert rows[1]["regression"] is False
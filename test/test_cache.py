@@ -0,0 +1,39 @@
+import pytest
+
+from src.cache import LRUCache, MISSING
+
+
+def test_get_and_put():
+    cache = LRUCache(2)
+    assert cache.get("a") is MISSING
+    cache.put("a", None)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_clear():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
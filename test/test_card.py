@@ -1,4 +1,7 @@
-from src.card import Card, Deck
+import pickle
+import random
+
+from src.card import Card, Deck, Shoe, CARDS
 import pytest
 
 
@@ -50,3 +53,101 @@ def test_deck_deal_all_cards():
     assert len(dealt_cards) == 52  # Ensure 52 cards are dealt
     with pytest.raises(IndexError):
         deck.deal()  # Ensure dealing from empty deck raises error
+
+
+def test_cards_are_interned():
+    assert Card("Hearts", "A") is Card("Hearts", "A")
+    assert Card("Hearts", "A") != Card("Spades", "A")
+    assert len({Card("Clubs", "7"), Card("Clubs", "7")}) == 1
+
+
+def test_card_is_immutable():
+    card = Card("Hearts", "A")
+    with pytest.raises(AttributeError):
+        card.rank = "K"
+    with pytest.raises(AttributeError):
+        card.color = "red"
+
+
+def test_invalid_card():
+    with pytest.raises(ValueError):
+        Card("Hearts", "1")
+
+
+def test_card_pickle_keeps_identity():
+    card = Card("Diamonds", "Q")
+    assert pickle.loads(pickle.dumps(card)) is card
+
+
+def test_card_tables():
+    assert len(CARDS) == 52
+    assert all(CARDS[card.index] is card for card in CARDS)
+    assert Card("Spades", "A").hard_value == 1
+    assert Card("Spades", "K").hard_value == 10
+    assert Card("Spades", "K").rank_index == 11
+
+
+def test_decks_share_cards():
+    first, second = Deck(), Deck()
+    assert set(first.cards) == set(second.cards) == set(CARDS)
+
+
+def test_shoe_initialization():
+    shoe = Shoe(decks=6)
+    assert len(shoe) == 312
+    assert sorted(card.index for card in shoe.cards) == sorted(
+        card.index for card in CARDS * 6
+    )
+
+
+def test_shoe_invalid_settings():
+    with pytest.raises(ValueError):
+        Shoe(decks=0)
+    with pytest.raises(ValueError):
+        Shoe(penetration=1.5)
+
+
+def test_shoe_cut_card():
+    shoe = Shoe(decks=2, penetration=0.5)
+    for _ in range(51):
+        shoe.deal()
+    assert not shoe.needs_shuffle
+    shoe.deal()
+    assert shoe.needs_shuffle
+    assert len(shoe) == 52
+
+
+def test_shoe_shuffle_in_place():
+    shoe = Shoe(rng=random.Random(1))
+    cards = shoe._cards
+    dealt = [shoe.deal() for _ in range(10)]
+    shoe.shuffle()
+    assert shoe._cards is cards
+    assert len(shoe) == 52
+    assert set(dealt) <= set(shoe.cards)
+
+
+def test_shoe_reshuffles_when_empty():
+    shoe = Shoe()
+    for _ in range(52):
+        shoe.deal()
+    assert len(shoe) == 0
+    assert isinstance(shoe.deal(), Card)
+    assert len(shoe) == 51
+
+
+def test_shoe_seeded_order():
+    first = Shoe(decks=2, rng=random.Random(3))
+    second = Shoe(decks=2, rng=random.Random(3))
+    assert first.cards == second.cards
+
+
+def test_shoe_skip_matches_deal():
+    dealt = Shoe(rng=random.Random(5))
+    skipped = Shoe(rng=random.Random(5))
+    for count in (10, 30, 40, 52, 3):
+        for _ in range(count):
+            dealt.deal()
+        skipped.skip(count)
+        assert len(skipped) == len(dealt)
+        assert skipped.cards == dealt.cards
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from src.cli import main
+
+
+def test_simulate_prints_result(capsys):
+    assert main(["simulate", "--rounds", "200", "--players", "2", "--seed", "1"]) == 0
+    assert capsys.readouterr().out.startswith("200 rounds, 400 hands")
+
+
+def test_simulate_history_replays(tmp_path, capsys):
+    log = str(tmp_path / "session.log")
+    main(["simulate", "--rounds", "300", "--seed", "5", "--history", log])
+    capsys.readouterr()
+    assert main(["replay", log, "--money", "300", "--seed", "5"]) == 0
+    assert "Rounds 1 to 300 match the log" in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["10", "s", ""])
+def test_play_round(mock_input, capsys):
+    assert main(["play", "Alice:100", "--seed", "2"]) == 0
+    output = capsys.readouterr().out
+    assert "Alice" in output
+    assert "left." in output
+
+
+def test_invalid_player(capsys):
+    assert main(["play", "Alice"]) == 2
+    assert "NAME:MONEY" in capsys.readouterr().err
+
+
+def test_cli_does_not_import_qt():
+    code = (
+        "import sys; sys.path.insert(0, 'src'); import cli; "
+        "cli.main(['simulate', '--rounds', '10']); "
+        "assert 'PySide6' not in sys.modules and 'numpy' not in sys.modules; "
+        "assert 'strategy' not in sys.modules"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
+
+
+def test_compare_prints_intervals(capsys):
+    assert main(["compare", "basic", "mimic", "--rounds", "200", "--seed", "3"]) == 0
+    output = capsys.readouterr().out
+    assert output.startswith("basic vs mimic")
+    assert "delta:" in output
+
+
+def test_simulate_statistics_and_snapshots(capsys):
+    arguments = [
+        "simulate",
+        "--rounds",
+        "300",
+        "--seed",
+        "2",
+        "--snapshot-every",
+        "100",
+    ]
+    assert main(arguments) == 0
+    captured = capsys.readouterr()
+    assert len(captured.err.splitlines()) == 3
+    assert "Player busts by up card" in captured.out
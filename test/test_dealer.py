@@ -0,0 +1,76 @@
+import pytest
+
+from src.card import Card, Deck
+from src.dealer import (
+    BUST,
+    DealerOdds,
+    composition,
+    full_composition,
+    remove_card,
+)
+
+
+def _counts(**slots):
+    counts = [0] * 10
+    for value, count in slots.items():
+        counts[int(value[1:]) - 1] = count
+    return counts
+
+
+def test_composition():
+    assert composition(Deck().cards) == full_composition(1)
+    assert sum(full_composition(6)) == 312
+    assert remove_card(full_composition(1), Card("Hearts", "K"))[9] == 15
+    with pytest.raises(ValueError):
+        remove_card(_counts(v2=1), Card("Hearts", "K"))
+
+
+def test_distribution_single_path():
+    odds = DealerOdds()
+    result = odds.distribution(Card("Hearts", "10"), _counts(v7=3))
+    assert result == (1.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def test_distribution_two_paths():
+    odds = DealerOdds()
+    result = odds.distribution(Card("Hearts", "10"), _counts(v6=1, v7=1))
+    assert result[0] == pytest.approx(0.5)
+    assert result[BUST] == pytest.approx(0.5)
+
+
+def test_bank_stands_on_soft_17():
+    odds = DealerOdds()
+    assert odds.distribution(Card("Hearts", "A"), _counts(v6=4))[0] == 1.0
+
+
+def test_full_shoe_distribution():
+    odds = DealerOdds()
+    upcard = Card("Hearts", "6")
+    counts = remove_card(full_composition(6), upcard)
+    result = odds.distribution(upcard, counts)
+    assert sum(result) == pytest.approx(1.0)
+    assert result[BUST] == pytest.approx(0.4228, abs=1e-3)
+    assert odds.bust_probability(upcard, counts) == result[BUST]
+
+
+def test_distribution_is_cached():
+    odds = DealerOdds()
+    upcard = Card("Hearts", "5")
+    counts = remove_card(full_composition(1), upcard)
+    first = odds.distribution(upcard, counts)
+    misses = odds.cache.misses
+    assert odds.distribution(upcard, counts) == first
+    assert odds.cache.misses == misses
+    assert odds.cache.hits > 0
+
+
+def test_not_enough_cards():
+    with pytest.raises(ValueError):
+        DealerOdds().distribution(Card("Hearts", "2"), _counts(v2=1))
+
+
+def test_distribution_rejects_oversized_shoes():
+    odds = DealerOdds()
+    odds.distribution(Card("Hearts", "10"), full_composition(15))
+    with pytest.raises(ValueError):
+        odds.distribution(Card("Hearts", "10"), full_composition(16))
@@ -0,0 +1,70 @@
+from src.card import Card
+from src.dealer import full_composition, remove_card
+from src.ev import EVCalculator, HIT, STAND
+from src.hand import Hand
+
+
+def _hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.add_card(Card("Hearts", rank))
+    return hand
+
+
+def _counts(tens=0, sevens=0):
+    return [0, 0, 0, 0, 0, 0, sevens, 0, 0, tens]
+
+
+def test_busted_hand():
+    calculator = EVCalculator()
+    result = calculator.evaluate(22, False, Card("Spades", "2"), full_composition())
+    assert result == (-1.0, -1.0)
+
+
+def test_exact_small_composition():
+    calculator = EVCalculator()
+    stand, hit = calculator.evaluate(20, False, Card("Spades", "K"), _counts(tens=4))
+    assert stand == 0.0
+    assert hit == -1.0
+
+    stand, hit = calculator.evaluate(17, False, Card("Spades", "K"), _counts(sevens=4))
+    assert stand == 0.0
+    assert hit == -1.0
+
+    stand, hit = calculator.evaluate(12, False, Card("Spades", "K"), _counts(sevens=4))
+    assert stand == -1.0
+    assert hit == 1.0
+
+
+def test_basic_strategy_decisions():
+    calculator = EVCalculator()
+    shoe = full_composition(6)
+
+    def action(upcard, *ranks):
+        up = Card("Spades", upcard)
+        counts = shoe
+        for card in (up,) + tuple(Card("Hearts", rank) for rank in ranks):
+            counts = remove_card(counts, card)
+        return calculator.best_action(_hand(*ranks), up, counts)[0]
+
+    assert action("6", "10", "2") == STAND
+    assert action("2", "10", "2") == HIT
+    assert action("10", "10", "6") == HIT
+    assert action("10", "10", "7") == STAND
+    assert action("10", "A", "6") == HIT
+    assert action("6", "5", "6") == HIT
+
+
+def test_stand_on_21_wins_or_pushes():
+    calculator = EVCalculator()
+    stand, _ = calculator.evaluate(21, True, Card("Spades", "9"), full_composition(1))
+    assert 0 < stand <= 1
+
+
+def test_results_are_cached():
+    calculator = EVCalculator()
+    up = Card("Spades", "9")
+    first = calculator.evaluate(14, False, up, full_composition(1))
+    misses = calculator.cache.misses
+    assert calculator.evaluate(14, False, up, full_composition(1)) == first
+    assert calculator.cache.misses == misses
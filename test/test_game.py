@@ -1,3 +1,4 @@
+import random
 from unittest.mock import patch, MagicMock
 from src.card import Card
 from src.player import Player, Bank
@@ -133,3 +134,59 @@ def test_play_round(mock_input):
     assert player1.money in [90, 100, 110]
     assert player2.money in [90, 100, 110]
     assert game.bank.hand.calculate_value() >= 17
+
+
+def test_start_round_reshuffles_at_cut_card():
+    player = Player("Alice", 100)
+    game = BlackJackGame([player], decks=2, penetration=0.5)
+    while not game.deck.needs_shuffle:
+        game.deck.deal()
+    game.start_round()
+    assert len(game.deck) == 104 - 4
+
+
+def test_many_rounds_on_one_shoe():
+    players = [Player(f"Player {i}", 100) for i in range(7)]
+    game = BlackJackGame(players, random.Random(3), decks=1)
+    shoe = game.deck
+    reshuffles = 0
+    for _ in range(1000):
+        before = len(shoe)
+        reshuffled = shoe.needs_shuffle or before < 2 * (len(players) + 1)
+        available = 52 if reshuffled else before
+        reshuffles += reshuffled
+        game.start_round()
+        for index in range(len(players)):
+            game.hit(index)
+        game.bank_turn()
+        game.determine_winner()
+
+        assert game.deck is shoe
+        assert all(len(player.hand.cards) == 3 for player in players)
+        assert len(game.bank.hand.cards) >= 2
+        dealt = 3 * len(players) + len(game.bank.hand.cards)
+        # The shoe is dealt from where the last round stopped. When it runs out, the cards of
+        # the round stay out of the reshuffle, as if it had been dealt from the start.
+        if dealt <= available:
+            assert len(shoe) == available - dealt
+        else:
+            assert len(shoe) == 52 - dealt
+    assert reshuffles > 0
+
+
+def test_no_card_dealt_twice_in_a_round():
+    players = [Player(f"Player {i}", 10**6) for i in range(7)]
+    game = BlackJackGame(players, random.Random(11), decks=1)
+    for _ in range(2000):
+        for player in players:
+            player.place_bet(1)
+        game.start_round()
+        for index, player in enumerate(players):
+            while player.hand.calculate_value() < 17:
+                game.hit(index)
+        game.bank_turn()
+        cards = [card for player in players for card in player.hand.cards]
+        cards += game.bank.hand.cards
+        # A single deck holds every card once.
+        assert len(set(map(id, cards))) == len(cards)
+        game.determine_winner()
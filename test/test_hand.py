@@ -1,4 +1,4 @@
-from src.card import Card
+from src.card import Card, Deck
 from src.hand import Hand
 
 
@@ -66,3 +66,42 @@ def test_hand_str():
 
     hand.add_card(Card("Clubs", "2"))
     assert str(hand) == "A of Hearts, 9 of Spades, 2 of Clubs (value: 22)"  # value: 12
+
+
+def test_is_soft():
+    hand = Hand()
+    hand.add_card(Card("Hearts", "A"))
+    hand.add_card(Card("Spades", "6"))
+    assert hand.is_soft() is True
+    assert hand.calculate_value() == 17
+
+    hand.add_card(Card("Clubs", "9"))
+    assert hand.is_soft() is False
+    assert hand.calculate_value() == 16
+
+
+def test_is_blackjack():
+    hand = Hand()
+    hand.add_card(Card("Hearts", "A"))
+    hand.add_card(Card("Spades", "K"))
+    assert hand.is_blackjack() is True
+
+    hand = Hand()
+    hand.add_card(Card("Hearts", "7"))
+    hand.add_card(Card("Spades", "7"))
+    hand.add_card(Card("Clubs", "7"))
+    assert hand.calculate_value() == 21
+    assert hand.is_blackjack() is False
+
+
+def test_start_hand_resets_value():
+    deck = Deck()
+    hand = Hand()
+    hand.add_card(Card("Hearts", "10"))
+    hand.add_card(Card("Spades", "10"))
+    hand.start_hand(deck)
+    assert len(hand.cards) == 2
+    expected = sum(card.value() for card in hand.cards)
+    if expected == 22:
+        expected = 12
+    assert hand.calculate_value() == expected
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from src import history
+from src.game import BlackJackGame
+from src.history import HistoryReader, HistoryWriter
+from src.player import Player
+from src.simulation import simulate
+
+
+def play_rounds(path, rounds):
+    players = [Player("Alice", 1000), Player("Bob", 1000)]
+    game = BlackJackGame(players, random.Random(3), decks=2)
+    with HistoryWriter(str(path), buffer_size=64) as log:
+        game.history = log
+        for _ in range(rounds):
+            for player in players:
+                player.place_bet(10)
+            game.start_round()
+            game.hit(0)
+            game.stand(1)
+            game.bank_turn()
+            game.determine_winner()
+    return players
+
+
+def test_round_events(tmp_path):
+    path = tmp_path / "history.log"
+    play_rounds(path, 1)
+    with HistoryReader(str(path)) as reader:
+        events = list(reader)
+    types = [event[1] for event in events]
+    assert types[:7] == [history.BET, history.DEAL, history.DEAL] * 2 + [history.DEAL]
+    assert history.HIT in types and history.STAND in types
+    assert types.count(history.SETTLE) == 2
+    assert all(event[0] == 1 for event in events)
+    bet = events[0]
+    assert bet[2] == 0 and bet[5] == 10
+
+
+def test_settlements_match_money(tmp_path):
+    path = tmp_path / "history.log"
+    players = play_rounds(path, 200)
+    with HistoryReader(str(path)) as reader:
+        net = [0, 0]
+        for _, event_type, seat, _, _, amount in reader:
+            if event_type == history.SETTLE:
+                net[seat] += amount
+        assert [1000 + amount for amount in net] == [p.money for p in players]
+        events = reader.as_array()
+        assert len(events) == len(reader)
+        assert events["round"][-1] == 200
+        del events
+
+
+def test_cards_match_hands(tmp_path):
+    path = tmp_path / "history.log"
+    players = play_rounds(path, 1)
+    with HistoryReader(str(path)) as reader:
+        cards = [
+            reader.card(event[3])
+            for event in reader
+            if event[2] == 0 and event[1] in (history.DEAL, history.HIT)
+        ]
+    assert cards == players[0].hand.cards
+
+
+def test_append_and_partial_event(tmp_path):
+    path = tmp_path / "history.log"
+    with HistoryWriter(str(path)) as log:
+        log.record(1, history.STAND, 0)
+    with HistoryWriter(str(path)) as log:
+        log.record(2, history.STAND, 0)
+    with open(path, "ab") as file:
+        file.write(b"\x00" * 5)
+    with HistoryReader(str(path)) as reader:
+        assert len(reader) == 2
+        assert reader.event(1)[0] == 2
+        with pytest.raises(IndexError):
+            reader.event(2)
+
+
+def test_empty_and_invalid(tmp_path):
+    path = tmp_path / "history.log"
+    HistoryWriter(str(path)).close()
+    with HistoryReader(str(path)) as reader:
+        assert list(reader) == []
+        assert len(reader.as_array()) == 0
+    invalid = tmp_path / "invalid.log"
+    invalid.write_bytes(b"nothing")
+    with pytest.raises(ValueError):
+        HistoryReader(str(invalid))
+
+
+def test_simulate_logs_rounds(tmp_path):
+    path = tmp_path / "history.log"
+    with HistoryWriter(str(path)) as log:
+        result = simulate(500, players=2, seed=4, history=log)
+    with HistoryReader(str(path)) as reader:
+        settled = sum(event[5] for event in reader if event[1] == history.SETTLE)
+    assert settled == result.net
+
+
+def test_close_with_live_views(tmp_path):
+    path = tmp_path / "history.log"
+    play_rounds(path, 5)
+    reader = HistoryReader(str(path))
+    events = list(reader)
+    array = reader.as_array()
+    iterator = iter(reader)
+    assert next(iterator) == events[0]
+    reader.close()
+    assert next(iterator) == events[1]
+    assert int(array["amount"][0]) == 10
+    reader.close()
@@ -0,0 +1,64 @@
+import json
+import random
+
+from src.game import BlackJackGame
+from src.instrumentation import Instrumentation, PhaseStats
+from src.player import Player
+
+
+def test_phase_stats_percentiles():
+    stats = PhaseStats()
+    for microseconds in range(1, 101):
+        stats.record(microseconds / 1e6)
+    assert stats.count == 100
+    assert abs(stats.percentile(50) - 50e-6) < 50e-6 * 0.15
+    assert abs(stats.percentile(90) - 90e-6) < 90e-6 * 0.15
+    assert stats.percentile(100) <= stats.max == 100e-6
+
+
+def test_game_records_phases_and_cards():
+    players = [Player("Alice", 1000), Player("Bob", 1000)]
+    game = BlackJackGame(players, random.Random(1), decks=2)
+    game.instrumentation = instrumentation = Instrumentation()
+    for _ in range(10):
+        game.start_round()
+        game.hit(0)
+        game.bank_turn()
+        game.determine_winner()
+
+    snapshot = instrumentation.snapshot()
+    for phase in ("start_round", "bank_turn", "determine_winner"):
+        assert snapshot["phases"][phase]["count"] == 10
+    assert snapshot["cards_dealt"] >= 10 * 7
+
+
+def test_cards_dealt_match_hands():
+    players = [Player("Alice", 1000)]
+    game = BlackJackGame(players, random.Random(2))
+    game.instrumentation = instrumentation = Instrumentation()
+    game.start_round()
+    game.hit(0)
+    game.bank_turn()
+    expected = len(players[0].hand.cards) + len(game.bank.hand.cards)
+    assert instrumentation.cards_dealt == expected
+
+
+def test_disabled_by_default():
+    game = BlackJackGame([Player("Alice", 1000)])
+    assert game.instrumentation is None
+    game.start_round()
+    game.bank_turn()
+    game.determine_winner()
+
+
+def test_dump(tmp_path):
+    instrumentation = Instrumentation()
+    instrumentation.record("phase", 0.001)
+    instrumentation.count_cards(3)
+    path = tmp_path / "timings.json"
+    instrumentation.dump(str(path))
+    snapshot = json.loads(path.read_text())
+    assert snapshot["cards_dealt"] == 3
+    assert snapshot["phases"]["phase"]["count"] == 1
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {"cards_dealt": 0, "phases": {}}
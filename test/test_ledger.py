@@ -0,0 +1,86 @@
+import random
+import sqlite3
+
+import pytest
+
+from src import ledger
+from src.game import BlackJackGame
+from src.ledger import Ledger
+from src.player import Player
+
+
+def _play_rounds(game, rounds):
+    for _ in range(rounds):
+        for player in game.players:
+            player.place_bet(10)
+        game.start_round()
+        for index, player in enumerate(game.players):
+            while player.hand.calculate_value() < 15:
+                game.hit(index)
+        game.bank_turn()
+        game.determine_winner()
+
+
+def test_balances_survive_sessions(tmp_path):
+    path = str(tmp_path / "ledger.db")
+    with Ledger(path) as book:
+        players = [Player(name, book.open_account(name, 500)) for name in ("A", "B")]
+        game = BlackJackGame(players, random.Random(4), decks=6)
+        game.ledger = book
+        for player in players:
+            player.ledger = book
+        _play_rounds(game, 20)
+
+    with Ledger(path) as book:
+        for player in players:
+            assert book.balance(player.name) == player.money
+            assert book.open_account(player.name, 500) == player.money
+        transactions = book.transactions("A")
+    assert len(transactions) == 40
+    assert transactions[0] == (ledger.BET, 10, 500)
+    assert transactions[-1][2] == players[0].money
+    assert 500 + sum(
+        amount for kind, amount, _ in transactions if kind != ledger.BET
+    ) == (players[0].money)
+
+
+def test_commit_groups_transactions(tmp_path):
+    path = str(tmp_path / "ledger.db")
+    book = Ledger(path)
+    assert book.open_account("A", 100) == 100
+    book.record("A", ledger.BET, 10, 100)
+    book.record("A", ledger.LOSS, -10, 90)
+    assert book.balance("A") == 90
+
+    reader = sqlite3.connect(path)
+    assert reader.execute("SELECT COUNT(*) FROM transactions").fetchone() == (0,)
+    book.commit()
+    assert reader.execute("SELECT COUNT(*) FROM transactions").fetchone() == (2,)
+    assert reader.execute("SELECT money FROM players").fetchall() == [(90,)]
+    assert reader.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    reader.close()
+    book.close()
+
+
+def test_unknown_player(tmp_path):
+    with Ledger(str(tmp_path / "ledger.db")) as book:
+        assert book.balance("Nobody") is None
+        assert book.transactions("Nobody") == []
+
+
+def test_bets_are_recorded_once_dealt(tmp_path):
+    with Ledger(str(tmp_path / "ledger.db")) as book:
+        players = [Player(name, book.open_account(name, 100)) for name in ("A", "B")]
+        for player in players:
+            player.ledger = book
+        game = BlackJackGame(players, random.Random(1))
+        # The second bet is refused, so every bet is placed again.
+        players[0].place_bet(10)
+        with pytest.raises(ValueError):
+            players[1].place_bet(500)
+        players[0].place_bet(10)
+        players[1].place_bet(20)
+        game.start_round()
+        book.commit()
+        assert book.transactions("A") == [(ledger.BET, 10, 100)]
+        assert book.transactions("B") == [(ledger.BET, 20, 100)]
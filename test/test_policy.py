@@ -0,0 +1,90 @@
+import pickle
+
+import pytest
+
+from src.batch import BatchEngine, simulate_batch
+from src.card import Card
+from src.hand import Hand
+from src.policy import (
+    BasicStrategy,
+    CompiledPolicy,
+    MimicDealer,
+    NeverBust,
+    PlayerPolicy,
+    compiled,
+)
+from src.simulation import dealer_policy, simulate
+from src.states import HIT, STAND, STATES
+
+
+def make_hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.add_card(Card("Hearts", rank))
+    return hand
+
+
+def test_basic_strategy_chart():
+    policy = BasicStrategy().compile()
+    assert policy.action(16, False, 10) == HIT
+    assert policy.action(16, False, 6) == STAND
+    assert policy.action(12, False, 3) == HIT
+    assert policy.action(12, False, 4) == STAND
+    assert policy.action(18, True, 9) == HIT
+    assert policy.action(18, True, 7) == STAND
+    assert policy.action(11, False, 1) == HIT
+    assert policy.action(17, False, 1) == STAND
+
+
+def test_never_bust_stands_on_hard_twelve():
+    policy = NeverBust().compile()
+    assert policy(make_hand("9", "2"), Card("Spades", "10"))
+    assert not policy(make_hand("10", "2"), Card("Spades", "10"))
+    assert policy(make_hand("A", "5"), Card("Spades", "10"))
+
+
+def test_compiled_policy_matches_dealer_policy():
+    policy = MimicDealer().compile()
+    upcard = Card("Spades", "7")
+    for ranks in [("10", "6"), ("10", "7"), ("A", "5"), ("A", "6"), ("10", "8", "5")]:
+        hand = make_hand(*ranks)
+        assert policy(hand, upcard) == (
+            not hand.is_busted() and dealer_policy(hand, upcard)
+        )
+
+
+def test_simulate_with_compiled_policy_matches_callable():
+    compiled_result = simulate(2000, players=2, policy=compiled("mimic"), seed=3)
+    callable_result = simulate(2000, players=2, policy=dealer_policy, seed=3)
+    assert compiled_result.net == callable_result.net
+    assert compiled_result.busts == callable_result.busts
+
+
+def test_simulate_compiles_rule_policies():
+    result = simulate(500, policy=NeverBust(), seed=1)
+    assert result.busts == 0
+
+
+def test_batch_engine_accepts_policies():
+    result = simulate_batch(2000, policy=NeverBust(), seed=2, tables=500)
+    assert result.busts == 0
+    engine = BatchEngine(100, policy=compiled("basic"), seed=4)
+    outcomes, _, _ = engine.play_round()
+    assert outcomes.shape == (100, 1)
+
+
+def test_compiled_policy_pickles():
+    policy = compiled("basic")
+    policy.batch
+    copy = pickle.loads(pickle.dumps(policy))
+    assert copy.actions == policy.actions
+    assert copy.name == "basic"
+
+
+def test_invalid_policies():
+    with pytest.raises(ValueError):
+        CompiledPolicy(bytes(STATES - 1))
+    with pytest.raises(ValueError):
+        compiled("martingale")
+    with pytest.raises(TypeError):
+        PlayerPolicy()
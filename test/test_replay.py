@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from src.card import CARDS
+from src.game import BlackJackGame
+from src.history import HistoryWriter
+from src.player import Player
+from src.replay import RecordedShoe, Replay
+from src.simulation import simulate
+
+
+@pytest.fixture
+def session(tmp_path):
+    path = str(tmp_path / "session.log")
+    outcomes = []
+    players = [Player("Alice", 500), Player("Bob", 500)]
+    game = BlackJackGame(players, random.Random(11), decks=1)
+    with HistoryWriter(path) as log:
+        game.history = log
+        for _ in range(300):
+            for player in players:
+                player.place_bet(5)
+            game.start_round()
+            for index, player in enumerate(players):
+                while player.hand.calculate_value() < 15:
+                    game.hit(index)
+                if not player.hand.is_busted():
+                    game.stand(index)
+            if not all(player.hand.is_busted() for player in players):
+                game.bank_turn()
+            outcomes.append(game.determine_winner())
+    return path, outcomes, players
+
+
+@pytest.mark.parametrize("seed", [11, None])
+def test_replays_every_round(session, seed):
+    path, outcomes, players = session
+    replay = Replay(path, [500, 500], seed=seed)
+    assert replay.last_round == 300
+    assert [replay.play_round() for _ in range(300)] == outcomes
+    assert [player.money for player in replay.game.players] == [
+        player.money for player in players
+    ]
+
+
+@pytest.mark.parametrize("seed", [11, None])
+def test_seek(session, seed):
+    path, outcomes, _ = session
+    replay = Replay(path, [500, 500], seed=seed)
+    for round_number in (250, 1, 123, 300):
+        assert replay.replay(round_number) == outcomes[round_number - 1]
+    with pytest.raises(ValueError):
+        replay.seek(301)
+
+
+def test_wrong_seed_is_detected(session):
+    path, _, _ = session
+    replay = Replay(path, [500, 500], seed=12)
+    with pytest.raises(ValueError):
+        for _ in range(300):
+            replay.play_round()
+
+
+def test_simulation_replay(tmp_path):
+    path = str(tmp_path / "simulation.log")
+    with HistoryWriter(path) as log:
+        result = simulate(2000, players=3, seed=5, decks=2, history=log)
+    replay = Replay(path, [2000] * 3, seed=5, decks=2)
+    replay.seek(1500)
+    for _ in range(501):
+        replay.play_round()
+    assert sum(player.money for player in replay.game.players) - 6000 == result.net
+
+
+def test_recorded_shoe():
+    shoe = RecordedShoe(list(CARDS[:2]))
+    shoe.shuffle()
+    assert not shoe.needs_shuffle
+    assert shoe.deal().index == 0
+    assert len(shoe) == 1
+    shoe.deal()
+    with pytest.raises(ValueError):
+        shoe.deal()
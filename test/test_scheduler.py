@@ -0,0 +1,112 @@
+import asyncio
+import pickle
+import random
+
+import pytest
+
+from src.scheduler import ShardedServer, plan_migration
+from src.server import PLAYING, Table, play_bot
+
+
+def test_plan_migration():
+    placement = {"a": 0, "b": 0, "c": 0, "d": 1}
+    assert plan_migration(placement, {"a": 10, "b": 10, "c": 10, "d": 10}, 2) == (
+        "a",
+        1,
+    )
+    assert plan_migration(placement, {"a": 5, "b": 5, "c": 0, "d": 10}, 2) is None
+    # Moving the only busy table would just move the imbalance.
+    assert plan_migration({"a": 0, "b": 1}, {"a": 100, "b": 0}, 2) is None
+    assert plan_migration(placement, {}, 2) is None
+
+
+def test_table_pickling():
+    messages = []
+    table = Table("test", lambda recipient, message: None, random.Random(1))
+    table.handle("Alice", {"action": "join", "money": 100})
+    table.handle("Bob", {"action": "join", "money": 100})
+    table.handle("Alice", {"action": "bet", "amount": 10})
+
+    moved = pickle.loads(pickle.dumps(table))
+    moved.resume(lambda recipient, message: messages.append(message))
+    moved.handle("Bob", {"action": "bet", "amount": 10})
+    assert moved.state == PLAYING
+    assert set(messages[1]["hands"]) == {"Alice", "Bob"}
+    with pytest.raises(ValueError):
+        pickle.dumps(moved)
+
+
+async def play_and_migrate(tables, rounds):
+    server = ShardedServer(port=0, seed=3, workers=2, rebalance_interval=60)
+    await server.start()
+    try:
+        bots = asyncio.gather(
+            *(
+                play_bot(f"table {i}", name, rounds, port=server.port)
+                for i in range(tables)
+                for name in ("Alice", "Bob")
+            )
+        )
+        scheduler = server.scheduler
+        while not bots.done():
+            await asyncio.sleep(0.01)
+            for table, worker in list(scheduler.placement.items()):
+                scheduler.migrate(table, 1 - worker)
+        return await bots, scheduler.migrations
+    finally:
+        await server.close()
+
+
+def test_sharded_server_with_migrations():
+    money, migrations = asyncio.run(asyncio.wait_for(play_and_migrate(6, 20), 120))
+    assert len(money) == 12
+    assert all(800 <= amount <= 1200 for amount in money)
+    assert migrations > 0
+
+
+async def lose_a_worker():
+    server = ShardedServer(port=0, seed=5, workers=2, rebalance_interval=60)
+    await server.start()
+    try:
+        scheduler = server.scheduler
+        bots = {
+            (f"table {i}", name): asyncio.ensure_future(
+                play_bot(f"table {i}", name, 10_000, port=server.port)
+            )
+            for i in range(4)
+            for name in ("Alice", "Bob")
+        }
+        while len(scheduler.placement) < 4:
+            await asyncio.sleep(0.01)
+        lost = {table for table, worker in scheduler.placement.items() if worker == 0}
+        scheduler._processes[0].kill()
+
+        # The players of the dead worker's tables are disconnected, the others keep playing.
+        failed = await asyncio.gather(
+            *(bot for (table, _), bot in bots.items() if table in lost),
+            return_exceptions=True,
+        )
+        others = [bot for (table, _), bot in bots.items() if table not in lost]
+        await asyncio.sleep(0.1)
+        playing = not any(bot.done() for bot in others)
+        for bot in others:
+            bot.cancel()
+        await asyncio.gather(*others, return_exceptions=True)
+
+        # New tables only go to the live worker.
+        money = await play_bot("new table", "Carol", 3, port=server.port)
+        scheduler.create("probe")
+        return lost, failed, playing, money, scheduler.placement["probe"]
+    finally:
+        await server.close()
+
+
+def test_sharded_server_loses_a_worker():
+    lost, failed, playing, money, worker = asyncio.run(
+        asyncio.wait_for(lose_a_worker(), 60)
+    )
+    assert lost and len(failed) == 2 * len(lost)
+    assert all(isinstance(error, ConnectionError) for error in failed)
+    assert playing
+    assert 970 <= money <= 1030
+    assert worker == 1
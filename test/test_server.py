@@ -0,0 +1,203 @@
+import asyncio
+import random
+
+import pytest
+
+from src.server import (
+    BETTING,
+    LINE_LIMIT,
+    PLAYING,
+    WRITE_LIMIT,
+    Client,
+    Server,
+    Table,
+    play_bot,
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.messages = []
+
+    def __call__(self, recipient, message):
+        self.messages.append((recipient, message))
+
+    def events(self, kind):
+        return [message for _, message in self.messages if message["event"] == kind]
+
+
+def seated_table():
+    send = Recorder()
+    table = Table("test", send, random.Random(1), decks=1)
+    table.handle("Alice", {"action": "join", "money": 100})
+    table.handle("Bob", {"action": "join", "money": 100})
+    return table, send
+
+
+def test_round():
+    table, send = seated_table()
+    table.handle("Alice", {"action": "bet", "amount": 10})
+    assert table.state == BETTING
+    table.handle("Bob", {"action": "bet", "amount": 20})
+    assert table.state == PLAYING
+    assert set(send.events("dealt")[0]["hands"]) == {"Alice", "Bob"}
+    assert send.events("turn")[-1]["name"] == "Alice"
+    table.handle("Alice", {"action": "stand"})
+    assert send.events("turn")[-1]["name"] == "Bob"
+    table.handle("Bob", {"action": "stand"})
+    assert table.state == BETTING
+    results = send.events("settled")[0]["results"]
+    assert results["Alice"]["money"] == 100 + 10 * results["Alice"]["outcome"]
+    assert results["Bob"]["money"] == 100 + 20 * results["Bob"]["outcome"]
+
+
+def test_invalid_actions():
+    table, _ = seated_table()
+    with pytest.raises(ValueError):
+        table.handle("Alice", {"action": "hit"})
+    with pytest.raises(ValueError):
+        table.handle("Alice", {"action": "bet", "amount": 1000})
+    with pytest.raises(ValueError):
+        table.handle("Alice", {"action": "join", "money": 10})
+    with pytest.raises(ValueError):
+        table.handle("Carol", {"action": "bet", "amount": 10})
+    with pytest.raises(ValueError):
+        table.handle("Alice", {"action": "fold"})
+    with pytest.raises(ValueError):
+        table.handle("Alice", {"action": "bet", "amount": True})
+    with pytest.raises(ValueError):
+        table.handle("Carol", {"action": "join", "money": True})
+    table.handle("Alice", {"action": "bet", "amount": 10})
+    table.handle("Bob", {"action": "bet", "amount": 10})
+    with pytest.raises(ValueError):
+        table.handle("Bob", {"action": "stand"})
+    with pytest.raises(ValueError):
+        table.handle("Bob", {"action": "bet", "amount": 10})
+
+
+def test_hit_until_bust_ends_turn():
+    table, send = seated_table()
+    table.handle("Alice", {"action": "bet", "amount": 10})
+    table.handle("Bob", {"action": "bet", "amount": 10})
+    while send.events("turn")[-1]["name"] == "Alice":
+        table.handle("Alice", {"action": "hit"})
+    assert send.events("card")[-1]["value"] > 21
+
+
+def test_timeouts():
+    table, send = seated_table()
+    table.handle("Alice", {"action": "bet", "amount": 10})
+    table.timeout()
+    assert list(send.events("dealt")[0]["hands"]) == ["Alice"]
+    table.timeout()
+    assert send.events("timeout")[0]["name"] == "Alice"
+    assert table.state == BETTING
+    assert "Bob" not in send.events("settled")[0]["results"]
+
+
+def test_leave_during_round():
+    table, send = seated_table()
+    table.handle("Alice", {"action": "bet", "amount": 10})
+    table.handle("Bob", {"action": "bet", "amount": 10})
+    table.handle("Alice", {"action": "leave"})
+    assert send.events("turn")[-1]["name"] == "Bob"
+    table.handle("Bob", {"action": "stand"})
+    assert list(table.seats) == ["Bob"]
+
+
+async def serve(tables, rounds):
+    server = Server(port=0, seed=2, turn_timeout=0.05, bet_timeout=0.05)
+    await server.start()
+    try:
+        # A player who never acts at their own table must not hold up the others.
+        idle = await Client.connect(port=server.port)
+        await idle.send("join", table="idle", name="Idle", money=100)
+        await idle.send("bet", amount=10)
+        bots = [
+            play_bot(f"table {i}", name, rounds, port=server.port)
+            for i in range(tables)
+            for name in ("Alice", "Bob")
+        ]
+        money = await asyncio.gather(*bots)
+        settled = await idle.receive_until("settled")
+        await idle.close()
+        return money, settled
+    finally:
+        await server.close()
+
+
+def test_server():
+    money, settled = asyncio.run(asyncio.wait_for(serve(20, 3), 60))
+    assert len(money) == 40
+    assert all(970 <= amount <= 1030 for amount in money)
+    assert "Idle" in settled["results"]
+
+
+async def errors():
+    server = Server(port=0)
+    await server.start()
+    try:
+        client = await Client.connect(port=server.port)
+        await client.send("hit")
+        first = await client.receive()
+        client.writer.write(b"not json\n")
+        second = await client.receive()
+        await client.send("join", table="test", name=["Alice"], money=100)
+        third = await client.receive()
+        client.writer.write(
+            b'{"action": "hit", "padding": "' + b"x" * 4 * LINE_LIMIT + b'"}\n'
+        )
+        fourth = await client.receive()
+        await client.send("join", table="test", name="Alice", money=100)
+        joined = await client.receive()
+        await client.close()
+        return first, second, third, fourth, joined
+    finally:
+        await server.close()
+
+
+def test_server_errors():
+    first, second, third, fourth, joined = asyncio.run(asyncio.wait_for(errors(), 10))
+    assert first == {"event": "error", "message": "Join a table first"}
+    assert second["event"] == "error"
+    assert third == {"event": "error", "message": "Please enter a valid name"}
+    assert fourth == {
+        "event": "error",
+        "message": f"Messages must be shorter than {LINE_LIMIT} bytes",
+    }
+    assert joined["event"] == "joined"
+
+
+class Transport:
+    def __init__(self, buffered):
+        self.buffered = buffered
+        self.aborted = False
+
+    def is_closing(self):
+        return self.aborted
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+    def abort(self):
+        self.aborted = True
+
+
+class Writer:
+    def __init__(self, buffered=0):
+        self.transport = Transport(buffered)
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+def test_slow_readers_are_disconnected():
+    server = Server()
+    fast, slow = Writer(), Writer(WRITE_LIMIT + 1)
+    server.connections["test"] = {"Alice": fast, "Bob": slow}
+    server._write("test", None, b"event\n")
+    server._write("test", "Bob", b"event\n")
+    assert fast.written == [b"event\n"]
+    assert slow.written == []
+    assert slow.transport.aborted
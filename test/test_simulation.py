@@ -0,0 +1,76 @@
+import pytest
+
+from src.simulation import (
+    simulate,
+    simulate_parallel,
+    dealer_policy,
+    stand_policy,
+    SimulationResult,
+)
+
+
+def test_simulate_counts_every_hand():
+    result = simulate(500, players=3)
+    assert result.rounds == 500
+    assert result.hands == 1500
+    assert result.wins + result.losses + result.pushes == 1500
+    assert result.wagered == 1500
+
+
+def test_simulate_net_matches_outcomes():
+    result = simulate(1000, players=2, bet=5)
+    assert result.net == 5 * (result.wins - result.losses)
+
+
+def test_simulate_stand_policy_never_busts():
+    result = simulate(500, policy=stand_policy)
+    assert result.busts == 0
+
+
+def test_simulate_house_edge_is_positive():
+    result = simulate(20000, policy=dealer_policy)
+    assert 0 < result.house_edge < 0.2
+
+
+def test_result_merge():
+    first = simulate(100, players=2)
+    second = simulate(200, players=2)
+    first.merge(second)
+    assert first.rounds == 300
+    assert first.hands == 600
+
+
+def test_result_merge_rejects_other_seats():
+    result = SimulationResult(1)
+    with pytest.raises(ValueError):
+        result.merge(SimulationResult(2))
+
+
+def _counts(result):
+    return (
+        result.wins,
+        result.losses,
+        result.pushes,
+        result.busts,
+        result.bank_busts,
+        result.net,
+    )
+
+
+def test_simulate_same_seed_same_result():
+    assert _counts(simulate(300, players=2, seed=7)) == _counts(
+        simulate(300, players=2, seed=7)
+    )
+
+
+def test_simulate_parallel_does_not_depend_on_workers():
+    single = simulate_parallel(1000, players=2, seed=42, workers=1, chunk_rounds=150)
+    pooled = simulate_parallel(1000, players=2, seed=42, workers=3, chunk_rounds=150)
+    assert single.rounds == pooled.rounds == 1000
+    assert _counts(single) == _counts(pooled)
+
+
+def test_simulate_parallel_seeds_change_result():
+    first = simulate_parallel(1000, seed=1, workers=1, chunk_rounds=250)
+    second = simulate_parallel(1000, seed=2, workers=1, chunk_rounds=250)
+    assert _counts(first) != _counts(second)
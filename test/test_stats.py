@@ -0,0 +1,71 @@
+import pytest
+
+from src.card import Card
+from src.game import LOSS, PUSH, WIN
+from src.simulation import simulate, simulate_parallel
+from src.stats import BUST, UPCARD_LABELS, Statistics
+
+
+def test_record_round():
+    stats = Statistics(2)
+    stats.record_round(Card("Spades", "6"), [20, 23], [WIN, LOSS], 5, 26)
+    stats.record_round(Card("Hearts", "A"), [18, 18], [PUSH, LOSS], 5, None)
+    assert stats.rounds == 2
+    assert stats.rates(0) == (0.5, 0.0, 0.5)
+    assert stats.net == [5, -10]
+    assert stats.mean(1) == -5
+    assert stats.variance(0) == pytest.approx(12.5)
+    assert stats.bust_rate(6) == 0.5
+    assert stats.bust_rate(1) == 0.0
+    assert stats.bank_bust_rate(6) == 1.0
+    assert stats.upcard_bank_rounds[0] == 0
+    assert stats.player_totals[18] == 2
+    assert stats.player_totals[BUST] == 1
+    assert stats.bank_totals[BUST] == 1
+
+
+def test_simulate_collects_statistics():
+    stats = Statistics(3)
+    result = simulate(2000, players=3, seed=4, stats=stats)
+    assert result.stats is stats
+    assert stats.rounds == 2000
+    assert sum(stats.wins) == result.wins
+    assert sum(stats.losses) == result.losses
+    assert sum(stats.net) == result.net
+    assert stats.player_totals[BUST] == sum(stats.upcard_busts) == result.busts
+    assert sum(stats.upcard_bank_busts) == result.bank_busts
+    assert sum(stats.player_totals) == result.hands
+
+
+def test_parallel_statistics_merge_exactly():
+    single = Statistics(2)
+    pooled = Statistics(2)
+    simulate_parallel(900, players=2, seed=8, workers=1, chunk_rounds=200, stats=single)
+    simulate_parallel(900, players=2, seed=8, workers=2, chunk_rounds=200, stats=pooled)
+    assert single.snapshot() == pooled.snapshot()
+    assert single.rounds == 900
+
+
+def test_snapshots_are_periodic():
+    snapshots = []
+    stats = Statistics(1, every=100, on_snapshot=snapshots.append)
+    simulate(350, seed=1, stats=stats)
+    assert [snapshot["rounds"] for snapshot in snapshots] == [100, 200, 300]
+    assert list(snapshots[-1]["bust_rate_by_upcard"]) == list(UPCARD_LABELS)
+
+
+def test_merge_snapshots_when_crossing_interval():
+    snapshots = []
+    stats = Statistics(1, every=100, on_snapshot=snapshots.append)
+    partial = Statistics(1)
+    simulate(150, seed=2, stats=partial)
+    stats.merge(partial)
+    stats.merge(partial)
+    assert [snapshot["rounds"] for snapshot in snapshots] == [150, 300]
+
+
+def test_merge_rejects_other_seats():
+    with pytest.raises(ValueError):
+        Statistics(1).merge(Statistics(2))
+    with pytest.raises(ValueError):
+        Statistics(1, every=-1)
@@ -0,0 +1,60 @@
+import math
+
+import pytest
+
+from src.card import Card
+from src.ev import HIT, STAND
+from src.strategy import StrategyTable, build_table, representative_cards, state_index
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("strategy") / "one_deck.bin"
+    build_table(1, str(path)).close()
+    return path
+
+
+def test_state_index_is_dense():
+    indexes = {
+        state_index(value, soft, upcard)
+        for value in range(22)
+        for soft in (False, True)
+        for upcard in range(1, 11)
+    }
+    assert indexes == set(range(440))
+
+
+def test_representative_cards():
+    assert representative_cards(16, False) == ("K", "6")
+    assert representative_cards(12, True) == ("A", "A")
+    assert representative_cards(21, False) == ("K", "9", "2")
+    assert representative_cards(3, False) is None
+    assert representative_cards(11, True) is None
+
+
+def test_load_table(table_path):
+    table = StrategyTable.load(str(table_path))
+    assert table.decks == 1
+    assert table.bank_stands_on == 17
+    assert table.action(16, False, Card("Spades", "10")) == HIT
+    assert table.action(17, False, Card("Spades", "10")) == STAND
+    assert table.action(13, False, Card("Spades", "6")) == STAND
+    assert table.action(18, True, Card("Spades", "10")) == HIT
+    assert table.action(20, False, Card("Spades", "A")) == STAND
+    table.close()
+
+
+def test_table_evs(table_path):
+    table = StrategyTable.load(str(table_path))
+    stand, hit = table.evs(20, False, Card("Spades", "6"))
+    assert stand > 0.5
+    assert hit < stand
+    assert all(math.isnan(ev) for ev in table.evs(2, False, Card("Spades", "6")))
+    table.close()
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "invalid.bin"
+    path.write_bytes(b"not a table at all")
+    with pytest.raises(ValueError):
+        StrategyTable.load(str(path))
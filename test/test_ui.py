@@ -4,6 +4,7 @@ from PySide6.QtCore import Qt
 
 from src.main import BlackJackUI
 from src.game import BlackJackGame
+from src.ledger import BET, Ledger
 
 
 @pytest.fixture
@@ -172,5 +173,69 @@ def test_reset_game(app):
     assert not ui.stand_button.isEnabled()
 
 
+def test_reset_game_commits_ledger(qtbot, tmp_path):
+    book = Ledger(str(tmp_path / "ledger.db"))
+    ui = BlackJackUI(ledger=book)
+    qtbot.addWidget(ui)
+    qtbot.keyClicks(ui.player_name_input, "Eve")
+    qtbot.keyClicks(ui.player_money_input, "2000")
+    qtbot.mouseClick(ui.add_player_button, Qt.LeftButton)
+    qtbot.mouseClick(ui.start_game_button, Qt.LeftButton)
+    qtbot.keyClicks(ui.bet_inputs["Eve"], "100")
+    qtbot.mouseClick(ui.start_button, Qt.LeftButton)
+    assert book.transactions("Eve") == []
+
+    # The round is abandoned, its bet is committed all the same.
+    qtbot.mouseClick(ui.reset_button, Qt.LeftButton)
+    assert book.transactions("Eve") == [(BET, 100, 2000)]
+    book.close()
+
+
+def test_round_results_and_auto_advance(app):
+    ui, qtbot = app
+
+    # Add a player, start game and enable auto-advance
+    qtbot.keyClicks(ui.player_name_input, "Frank")
+    qtbot.keyClicks(ui.player_money_input, "1500")
+    qtbot.mouseClick(ui.add_player_button, Qt.LeftButton)
+    qtbot.mouseClick(ui.start_game_button, Qt.LeftButton)
+    qtbot.keyClicks(ui.bet_inputs["Frank"], "100")
+    ui.auto_advance_input.setChecked(True)
+    ui.auto_advance_delay_input.setValue(0.1)
+    qtbot.mouseClick(ui.start_button, Qt.LeftButton)
+    assert not ui.start_button.isEnabled()
+
+    # Stand, the results are shown and the next round is dealt after the delay
+    qtbot.mouseClick(ui.stand_button, Qt.LeftButton)
+    assert not ui.results_panel.isHidden()
+    assert "Frank" in ui.results_panel.text()
+    assert ui.start_button.isEnabled()
+
+    qtbot.waitUntil(ui.stand_button.isEnabled, timeout=2000)
+    assert ui.results_panel.isHidden()
+    assert ui.game.round == 2
+
+
+def test_auto_advance_stops_on_invalid_bet(app):
+    ui, qtbot = app
+
+    qtbot.keyClicks(ui.player_name_input, "Grace")
+    qtbot.keyClicks(ui.player_money_input, "1500")
+    qtbot.mouseClick(ui.add_player_button, Qt.LeftButton)
+    qtbot.mouseClick(ui.start_game_button, Qt.LeftButton)
+    qtbot.keyClicks(ui.bet_inputs["Grace"], "100")
+    ui.auto_advance_input.setChecked(True)
+    ui.auto_advance_delay_input.setValue(0.1)
+    qtbot.mouseClick(ui.start_button, Qt.LeftButton)
+    qtbot.mouseClick(ui.stand_button, Qt.LeftButton)
+
+    # The next bet can't be covered: auto-advance stops without a blocking dialog.
+    ui.bet_inputs["Grace"].setText("5000")
+    qtbot.waitUntil(lambda: "Auto-advance stopped" in ui.results_panel.text())
+    assert ui.game.round == 1
+    assert ui.start_button.isEnabled()
+    assert not ui.auto_advance_timer.isActive()
+
+
 if __name__ == "__main__":
     pytest.main()
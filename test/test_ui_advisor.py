@@ -0,0 +1,79 @@
+import threading
+
+from src.advisor import Advice, Advisor
+from src.card import Card
+from src.dealer import full_composition
+from src.ui_advisor import AdviceController
+
+
+class SlowAdvisor(Advisor):
+    """Advisor whose exact advice waits until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.computed = []
+
+    def exact(self, value, soft, upcard, counts):
+        self.release.wait(5)
+        self.computed.append(value)
+        return Advice(0.0, exact=True)
+
+
+STATE = (16, False, Card("Spades", "10"), full_composition(1))
+
+
+def test_quick_advice_then_exact(qtbot):
+    advisor = SlowAdvisor()
+    controller = AdviceController(advisor, budget=10)
+    with qtbot.waitSignal(controller.advice_ready) as quick:
+        controller.request(*STATE)
+    assert not quick.args[0].exact
+
+    with qtbot.waitSignal(controller.advice_ready) as exact:
+        advisor.release.set()
+    assert exact.args[0].exact
+    controller.wait()
+
+
+def test_outdated_requests_are_dropped(qtbot):
+    advisor = SlowAdvisor()
+    controller = AdviceController(advisor, budget=10_000)
+    shown = []
+    controller.advice_ready.connect(shown.append)
+    controller.request(*STATE)
+    controller.request(17, *STATE[1:])
+    controller.request(18, *STATE[1:])
+    advisor.release.set()
+    qtbot.waitUntil(lambda: bool(shown), timeout=2000)
+    controller.wait()
+    qtbot.wait(50)
+
+    # The first task may have started, the second never runs, and only the last one is shown.
+    assert 17 not in advisor.computed
+    assert [advice.exact for advice in shown] == [True]
+    assert advisor.computed[-1] == 18
+
+
+def test_cancel_clears_advice(qtbot):
+    advisor = SlowAdvisor()
+    controller = AdviceController(advisor, budget=10_000)
+    controller.request(*STATE)
+    with qtbot.waitSignal(controller.advice_ready) as cleared:
+        controller.cancel()
+    assert cleared.args == [None]
+    advisor.release.set()
+    controller.wait()
+
+
+def test_exhausted_shoe_keeps_quick_advice(qtbot):
+    controller = AdviceController(Advisor(), budget=10)
+    shown = []
+    controller.advice_ready.connect(shown.append)
+    # A single ten is left: the bank can't finish its hand, so there is no exact advice.
+    counts = (0,) * 9 + (1,)
+    controller.request(12, False, Card("Spades", "2"), counts)
+    qtbot.waitUntil(lambda: bool(shown), timeout=2000)
+    controller.wait()
+    qtbot.wait(50)
+    assert [advice.exact for advice in shown] == [False]
@@ -0,0 +1,72 @@
+import pytest
+
+from src.player import Player
+from src.ui_models import MONEY_ROLE, PlayerFilterModel, PlayerListModel
+
+
+@pytest.fixture
+def model(qapp):
+    """Fixture to create a model over five players, recording the rows it reports changed."""
+    players = [Player(name, 100 * (i + 1)) for i, name in enumerate("ABCDE")]
+    model = PlayerListModel(players)
+    changes = []
+    model.dataChanged.connect(
+        lambda first, last, roles: changes.append((first.row(), last.row()))
+    )
+    return model, changes
+
+
+def _rows(model):
+    """Returns the text of the rows of a model, in order."""
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+def test_model_rows(model):
+    model, _ = model
+    assert model.rowCount() == 5
+    assert _rows(model)[0] == "A: $100"
+    assert model.index(4, 0).data(MONEY_ROLE) == 500
+
+    model.players[1].place_bet(20)
+    model.refresh()
+    assert _rows(model)[1] == "B: $200 (bet $20)"
+
+
+def test_refresh_reports_changed_rows(model):
+    model, changes = model
+    model.refresh()
+    assert changes == []
+
+    for row in (1, 2, 4):
+        model.players[row].place_bet(10)
+    model.refresh()
+    assert changes == [(1, 2), (4, 4)]
+
+
+def test_append_and_clear(model):
+    model, changes = model
+    model.append(Player("F", 50))
+    assert model.rowCount() == 6
+    assert _rows(model)[-1] == "F: $50"
+
+    model.clear()
+    assert model.rowCount() == 0
+    assert model.players == []
+
+
+def test_filter_and_sort(model):
+    model, _ = model
+    proxy = PlayerFilterModel(model)
+    proxy.sort_by("Money")
+    assert _rows(proxy)[0] == "E: $500"
+
+    model.players[0].money = 1000
+    model.refresh()
+    assert _rows(proxy)[0] == "A: $1000"
+
+    proxy.setFilterFixedString("b")
+    assert _rows(proxy) == ["B: $200"]
+
+    proxy.setFilterFixedString("")
+    proxy.sort_by("Added")
+    assert _rows(proxy) == _rows(model)
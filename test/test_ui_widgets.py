@@ -0,0 +1,87 @@
+import pytest
+
+from src.card import Card
+from src.hand import Hand
+from src.player import Player, Bank
+from src.ui_widgets import TableWidget
+
+
+@pytest.fixture
+def table(qtbot):
+    """Fixture to create a table with three players and the bank, the first one playing."""
+    widget = TableWidget()
+    qtbot.addWidget(widget)
+    players = [Player(name, 100) for name in ("Alice", "Bob", "Carol")]
+    for player, rank in zip(players, ("2", "3", "4")):
+        player.hand.add_card(Card("Hearts", rank))
+        player.hand.add_card(Card("Spades", "10"))
+    bank = Bank()
+    bank.hand.add_card(Card("Clubs", "9"))
+    bank.hand.add_card(Card("Diamonds", "K"))
+    widget.refresh(players, bank, 0)
+    return widget, players, bank
+
+
+def _count_renders(monkeypatch, seat):
+    """Counts the calls to the setText method of a seat."""
+    renders = []
+    monkeypatch.setattr(seat, "setText", renders.append)
+    return renders
+
+
+def test_refresh_renders_seats(table):
+    widget, players, bank = table
+    assert len(widget.seats) == 3
+    assert "Alice" in widget.seats[0].text()
+    assert "(Current Player)" in widget.seats[0].text()
+    assert "(Current Player)" not in widget.seats[1].text()
+    assert "(Value: 13)" in widget.seats[1].text()
+    assert "[Hidden]" in widget.bank_seat.text()
+    assert "(Value: 9)" in widget.bank_seat.text()
+
+    widget.refresh(players, bank, 3, show_all_bank_cards=True)
+    assert "[Hidden]" not in widget.bank_seat.text()
+    assert "(Value: 19)" in widget.bank_seat.text()
+
+
+def test_refresh_skips_unchanged_seats(table, monkeypatch):
+    widget, players, bank = table
+    renders = [_count_renders(monkeypatch, seat) for seat in widget.seats]
+
+    widget.refresh(players, bank, 0)
+    assert renders == [[], [], []]
+
+    players[1].hand.add_card(Card("Hearts", "5"))
+    widget.refresh_seat(1)
+    assert [len(seat) for seat in renders] == [0, 1, 0]
+    assert "(Value: 18)" in renders[1][0]
+
+
+def test_set_current_renders_two_seats(table, monkeypatch):
+    widget, players, bank = table
+    renders = [_count_renders(monkeypatch, seat) for seat in widget.seats]
+
+    widget.set_current(1)
+    assert [len(seat) for seat in renders] == [1, 1, 0]
+    assert "(Current Player)" not in renders[0][0]
+    assert "(Current Player)" in renders[1][0]
+
+
+def test_new_hand_replaces_cached_cards(table):
+    widget, players, bank = table
+    players[0].hand = Hand()
+    players[0].hand.add_card(Card("Clubs", "A"))
+    players[0].hand.add_card(Card("Clubs", "Q"))
+    widget.refresh_seat(0)
+    assert "(Value: 21)" in widget.seats[0].text()
+    assert "10" not in widget.seats[0].text()
+
+
+def test_seats_follow_players(table):
+    widget, players, bank = table
+    widget.refresh(players[:1], bank, 0)
+    assert len(widget.seats) == 1
+
+    widget.clear()
+    assert widget.seats == []
+    assert widget.bank_seat.isHidden()
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from src.policy import compiled
+from src.simulation import dealer_policy, stand_policy
+from src.variance import Estimate, RoundShoe, SharedDeck, compare, evaluate
+
+
+def test_round_shoe_deals_the_same_order_to_every_view():
+    shoe = RoundShoe(1, random.Random(1))
+    shoe.new_round()
+    first, second = SharedDeck(shoe), SharedDeck(shoe)
+    dealt = [first.deal() for _ in range(10)]
+    assert [second.deal() for _ in range(10)] == dealt
+    first.rewind()
+    assert first.deal() is dealt[0]
+
+
+def test_round_shoe_draws_the_whole_shoe():
+    shoe = RoundShoe(1, random.Random(2))
+    shoe.new_round()
+    deck = SharedDeck(shoe)
+    assert len({deck.deal() for _ in range(52)}) == 52
+    with pytest.raises(ValueError):
+        deck.deal()
+
+
+def test_antithetic_view_exchanges_seat_and_bank_cards():
+    shoe = RoundShoe(1, random.Random(3))
+    shoe.new_round()
+    deck = SharedDeck(shoe, seats=2)
+    dealt = [deck.deal() for _ in range(8)]
+    deck.rewind(antithetic=True)
+    swapped = [deck.deal() for _ in range(8)]
+    assert swapped == dealt[4:6] + dealt[2:4] + dealt[0:2] + dealt[6:]
+
+
+def test_estimate_interval():
+    estimate = Estimate()
+    for sample in (1, -1, 1, -1):
+        estimate.add(sample)
+    assert estimate.mean == 0
+    low, high = estimate.interval
+    assert low == pytest.approx(-estimate.half_width)
+    assert estimate.half_width == pytest.approx(1.96 * (4 / 3 / 4) ** 0.5, rel=1e-3)
+
+
+def test_control_variate_removes_explained_variance():
+    plain, controlled = Estimate(), Estimate(control=True)
+    for control in (-2, -1, 0, 1, 2):
+        plain.add(0.5 + control, control)
+        controlled.add(0.5 + control, control)
+    assert controlled.mean == pytest.approx(0.5)
+    assert controlled.variance == pytest.approx(0)
+    assert plain.variance > 0
+
+
+def test_invalid_confidence():
+    with pytest.raises(ValueError):
+        Estimate(confidence=1)
+
+
+def test_common_shoes_cancel_identical_policies():
+    comparison = compare(500, dealer_policy, dealer_policy, players=2, seed=4)
+    assert comparison.delta.mean == 0
+    assert comparison.delta.half_width == 0
+    assert comparison.first.samples == 500
+
+
+def test_common_shoes_narrow_the_delta_interval():
+    basic, mimic = compiled("basic"), compiled("mimic")
+    common = compare(3000, basic, mimic, seed=5, decks=6)
+    independent = compare(3000, basic, mimic, seed=5, decks=6, common=False)
+    assert common.delta.half_width < independent.delta.half_width
+
+
+def test_antithetic_rounds_narrow_the_interval():
+    plain = evaluate(4000, policy=compiled("basic"), seed=6, decks=6)
+    paired = evaluate(4000, policy=compiled("basic"), seed=6, decks=6, antithetic=True)
+    assert paired.samples == 2000
+    assert paired.half_width < plain.half_width
+
+
+def test_stand_policy_return_matches_its_outcomes():
+    estimate = evaluate(200, players=3, policy=stand_policy, seed=7, control=True)
+    assert estimate.samples == 200
+    assert -1 <= estimate.mean <= 1